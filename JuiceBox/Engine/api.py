@@ -1,6 +1,15 @@
-import asyncio, json, os
+import asyncio, inspect, itertools, json, os, threading, time
+from collections.abc import Awaitable, Callable
+from typing import Any
 from dotenv import load_dotenv
 from Models import Response, Status
+from .utils.protocol import (
+    DEFAULT_MAX_FRAME,
+    PROTOCOL_VERSION,
+    FrameError,
+    encode_frame,
+    read_frame,
+)
 
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
 load_dotenv(dotenv_path=dotenv_path)
@@ -11,6 +20,32 @@ SOCKET_PATH = os.getenv("JUICEBOX_SOCKET", "/opt/juicebox/run/engine.sock")
 # Constante generada dinámicamente con la contraseña de Redis.
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
 
+# Modo del servidor del motor. En modo "threads" cada conexión atiende una única petición.
+SERVER_MODE = os.getenv("JUICEBOX_SERVER_MODE", "asyncio").lower()
+
+# Número de conexiones persistentes por event loop.
+CLIENT_POOL_SIZE = max(1, int(os.getenv("JUICEBOX_CLIENT_POOL_SIZE", "2")))
+
+# Tamaño máximo (bytes) de un mensaje que el cliente propone al motor.
+MAX_FRAME = int(os.getenv("JUICEBOX_MAX_FRAME", str(DEFAULT_MAX_FRAME)))
+
+# Comandos de solo lectura que el pool puede reenviar si la conexión reutilizada estaba cerrada.
+RETRYABLE_COMMANDS: set[tuple[str, str]] = {
+    ("RTB", "__STATUS__"),
+    ("RTB", "__CONFIG__"),
+    ("JS", "__STATUS__"),
+    ("JS", "__CONFIG__"),
+    ("JS", "__CONTAINER_STATUS__"),
+    ("JS", "__PORTS_RANGE__"),
+    ("ENGINE", "__JOB_STATUS__"),
+}
+
+# Estados finales de un trabajo de larga duración del motor.
+JOB_FINISHED_STATES: tuple[str, ...] = ("done", "failed", "cancelled")
+
+# Función que recibe el estado de un trabajo cada vez que avanza.
+ProgressCallback = Callable[[dict], Awaitable[None] | None]
+
 
 class Programs:
     """
@@ -18,10 +53,282 @@ class Programs:
 
     * RTB: Root The Box
     * JS: OWASP Juice Shop
+    * ENGINE: Juice Box Engine
     """
 
     RTB: str = "RTB"
     JS: str = "JS"
+    ENGINE: str = "ENGINE"
+
+
+class JuiceBoxClient:
+    """
+    Conexión persistente con el motor de Juice Box.
+
+    Cada petición lleva un `id` que el motor devuelve en su respuesta, de modo que varias
+    peticiones pueden estar en curso a la vez sobre el mismo socket y sus respuestas
+    pueden llegar en cualquier orden.
+
+    Los mensajes viajan en tramas con cabecera de longitud. Al conectar se negocia con
+    el motor (`ENGINE __HELLO__`) el tamaño máximo de trama.
+
+    Ejemplo:
+        ```python
+        client = JuiceBoxClient()
+        status, config = await asyncio.gather(
+            client.request("JS", "__STATUS__"), client.request("JS", "__CONFIG__")
+        )
+        await client.close()
+        ```
+    """
+
+    def __init__(self, socket_path: str | None = None) -> None:
+        """
+        Inicializa el cliente sin conectarlo. La conexión se abre con la primera petición.
+
+        Args:
+            socket_path (str | None): Ruta del socket del motor. Por defecto SOCKET_PATH.
+        """
+        self.socket_path: str = socket_path or SOCKET_PATH
+        self.__reader: asyncio.StreamReader | None = None
+        self.__writer: asyncio.StreamWriter | None = None
+        self.__reader_task: asyncio.Task | None = None
+        self.__pending: dict[int, asyncio.Future] = {}
+        self.__ids = itertools.count(1)
+        self.max_frame: int = MAX_FRAME
+        self.__write_lock = asyncio.Lock()
+        self.__connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """
+        Indica si la conexión con el motor está abierta.
+        """
+        return (
+            self.__writer is not None
+            and not self.__writer.is_closing()
+            and self.__reader_task is not None
+            and not self.__reader_task.done()
+        )
+
+    async def connect(self) -> None:
+        """
+        Abre la conexión con el motor si no está abierta.
+        """
+        async with self.__connect_lock:
+            if self.connected:
+                return
+            self.__reader, self.__writer = await asyncio.open_unix_connection(
+                path=self.socket_path
+            )
+            await self.__hello()
+            self.__reader_task = asyncio.create_task(self.__read_responses())
+
+    async def __hello(self) -> None:
+        """
+        Negocia con el motor la versión del protocolo y el tamaño máximo de trama.
+
+        Raises:
+            ConnectionError: Si el motor no responde a la negociación.
+        """
+        hello = {
+            "id": 0,
+            "prog": "ENGINE",
+            "command": "__HELLO__",
+            "args": {"version": PROTOCOL_VERSION, "max_frame": MAX_FRAME},
+        }
+        self.__writer.write(encode_frame(json.dumps(hello).encode("utf-8")))
+        await self.__writer.drain()
+        try:
+            raw = await read_frame(self.__reader, MAX_FRAME)
+        except (FrameError, asyncio.IncompleteReadError) as e:
+            raise ConnectionError(f"Protocol negotiation failed: {e}") from e
+        if raw is None:
+            raise ConnectionError("Connection closed by the engine")
+        data: dict = json.loads(raw.decode("utf-8", errors="replace")).get("data") or {}
+        self.max_frame = int(data.get("max_frame") or MAX_FRAME)
+
+    async def close(self) -> None:
+        """
+        Cierra la conexión. Las peticiones en curso terminan con ConnectionError.
+        """
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+        if self.__writer is not None:
+            self.__writer.close()
+            try:
+                await self.__writer.wait_closed()
+            except Exception:
+                pass
+        self.__fail_pending(ConnectionError("Client connection closed"))
+
+    def __fail_pending(self, error: Exception) -> None:
+        """
+        Termina con error todas las peticiones pendientes de respuesta.
+        """
+        pending, self.__pending = self.__pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def __read_responses(self) -> None:
+        """
+        Lee las respuestas del motor y las entrega a la petición con el mismo `id`.
+        """
+        error: Exception = ConnectionError("Connection closed by the engine")
+        try:
+            while True:
+                raw = await read_frame(self.__reader, self.max_frame)
+                if raw is None:
+                    break
+                try:
+                    payload: dict = json.loads(raw.decode("utf-8", errors="replace"))
+                except json.JSONDecodeError:
+                    continue
+                future = self.__pending.pop(payload.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(payload)
+        except asyncio.CancelledError:
+            error = ConnectionError("Client connection closed")
+        except Exception as e:
+            error = ConnectionError(f"Error while reading the line: {e}")
+        finally:
+            self.__fail_pending(error)
+            if self.__writer is not None:
+                self.__writer.close()
+
+    async def request(
+        self,
+        prog: str,
+        command: str,
+        args: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """
+        Envía un comando al motor y espera su respuesta.
+
+        Args:
+            prog (str): Programa destino (RTB | JS | ENGINE).
+            command (str): Comando a enviar.
+            args (dict[str, Any] | None): Argumentos adicionales del comando.
+            timeout (float | None): Tiempo máximo de espera en segundos.
+
+        Returns:
+            Response: Objeto con el estado, mensaje y datos devueltos por el motor.
+
+        Raises:
+            ConnectionError: Si la conexión se cierra antes de recibir la respuesta.
+            TimeoutError: Si se supera el tiempo máximo de espera.
+            FrameError: Si la petición supera el tamaño máximo negociado.
+        """
+        await self.connect()
+        request_id = next(self.__ids)
+        payload: dict[str, Any] = {"id": request_id, "prog": prog, "command": command}
+        if args:
+            payload["args"] = args
+        raw = json.dumps(payload).encode("utf-8")
+        if len(raw) > self.max_frame:
+            raise FrameError(
+                f"Request of {len(raw)} bytes exceeds the maximum of {self.max_frame}"
+            )
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.__pending[request_id] = future
+        try:
+            async with self.__write_lock:
+                self.__writer.write(encode_frame(raw))
+                await self.__writer.drain()
+            json_resp: dict = await asyncio.wait_for(future, timeout=timeout)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise ConnectionError(f"Client connection error: {e}") from e
+        finally:
+            self.__pending.pop(request_id, None)
+        return Response(
+            status=json_resp.get("status", "error"),
+            message=json_resp.get("message", "Something went wrong"),
+            data=json_resp.get("data") or {},
+        )
+
+
+class JuiceBoxClientPool:
+    """
+    Conjunto pequeño de conexiones persistentes con el motor de Juice Box.
+
+    Las peticiones se reparten entre las conexiones por turnos. Cada event loop (p.ej.
+    cada worker de FastAPI o cada hilo de la TUI) tiene su propio pool, ya que las
+    conexiones de asyncio no pueden compartirse entre loops.
+    """
+
+    __pools: dict[asyncio.AbstractEventLoop, "JuiceBoxClientPool"] = {}
+    __pools_lock = threading.Lock()
+
+    def __init__(self, size: int = CLIENT_POOL_SIZE, socket_path: str | None = None) -> None:
+        """
+        Inicializa el pool sin abrir conexiones.
+
+        Args:
+            size (int): Número de conexiones persistentes.
+            socket_path (str | None): Ruta del socket del motor. Por defecto SOCKET_PATH.
+        """
+        self.__clients: list[JuiceBoxClient] = [
+            JuiceBoxClient(socket_path) for _ in range(max(1, size))
+        ]
+        self.__turn = itertools.count()
+
+    @classmethod
+    def current(cls) -> "JuiceBoxClientPool":
+        """
+        Obtiene (o crea) el pool del event loop en ejecución.
+
+        Returns:
+            JuiceBoxClientPool: Pool del loop actual.
+        """
+        loop = asyncio.get_running_loop()
+        with cls.__pools_lock:
+            # Se descartan los pools de loops ya cerrados
+            for closed in [lp for lp in cls.__pools if lp.is_closed()]:
+                del cls.__pools[closed]
+            if loop not in cls.__pools:
+                cls.__pools[loop] = cls()
+            return cls.__pools[loop]
+
+    async def request(
+        self,
+        prog: str,
+        command: str,
+        args: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Response:
+        """
+        Envía un comando por una de las conexiones del pool.
+
+        Si una conexión reutilizada resulta estar cerrada por el motor (p.ej. por
+        inactividad), se reabre y se reintenta una vez, pero solo para los comandos de
+        solo lectura (RETRYABLE_COMMANDS): el motor puede haber recibido ya la petición,
+        y reenviar un comando que modifica recursos lo ejecutaría dos veces.
+
+        Args:
+            prog (str): Programa destino (RTB | JS | ENGINE).
+            command (str): Comando a enviar.
+            args (dict[str, Any] | None): Argumentos adicionales del comando.
+            timeout (float | None): Tiempo máximo de espera en segundos.
+
+        Returns:
+            Response: Objeto con el estado, mensaje y datos devueltos por el motor.
+        """
+        client = self.__clients[next(self.__turn) % len(self.__clients)]
+        reused = client.connected
+        try:
+            return await client.request(prog, command, args, timeout)
+        except ConnectionError:
+            if not reused or (prog, command) not in RETRYABLE_COMMANDS:
+                raise
+            return await client.request(prog, command, args, timeout)
+
+    async def close(self) -> None:
+        """
+        Cierra todas las conexiones del pool.
+        """
+        await asyncio.gather(*(c.close() for c in self.__clients))
 
 
 class JuiceBoxAPI:
@@ -32,7 +339,31 @@ class JuiceBoxAPI:
     @staticmethod
     async def __send_command(prog: str, command: str, args: dict = {}) -> Response:
         """
-        Envía un comando al motor de Juice Box para un programa específico.
+        Envía un comando al motor de Juice Box para un programa específico usando el pool
+        de conexiones persistentes del event loop actual.
+
+        Args:
+            prog (str): Programa destino (RTB | JS).
+            command (str): Comando a enviar.
+            args (dict, opcional): Argumentos adicionales del comando.
+
+        Returns:
+            Response: Objeto con el estado, mensaje y datos devueltos por el motor.
+        """
+        if SERVER_MODE == "threads":
+            return await JuiceBoxAPI.__send_once(prog, command, args)
+        try:
+            return await JuiceBoxClientPool.current().request(prog, command, args)
+        except Exception as e:
+            return Response.error(
+                message=f"Client connection error: {e}",
+                data={},
+            )
+
+    @staticmethod
+    async def __send_once(prog: str, command: str, args: dict = {}) -> Response:
+        """
+        Envía un comando abriendo una conexión de un solo uso (servidor en modo threads).
 
         Args:
             prog (str): Programa destino (RTB | JS).
@@ -57,11 +388,11 @@ class JuiceBoxAPI:
         if args:
             payload["args"] = args
         raw = json.dumps(payload)
-        writer.write(raw.encode("utf-8") + b"\n")
+        writer.write(encode_frame(raw.encode("utf-8")))
         await writer.drain()
 
         try:
-            line = await reader.readline()
+            line = await read_frame(reader, MAX_FRAME) or b""
         except Exception as e:
             return Response.error(f"Error while reading the line: {e}")
         finally:
@@ -185,30 +516,37 @@ class JuiceBoxAPI:
     # RESTART ----------------------------------------------------------
 
     @staticmethod
-    async def __restart_manager(prog: str) -> Response:
+    async def __restart_manager(
+        prog: str, on_progress: ProgressCallback | None = None
+    ) -> Response:
         """
         Reinicia el manager de un programa.
 
         Args:
             prog (str): Programa destino (RTB | JS).
+            on_progress (ProgressCallback | None): Función que recibe el progreso si el
+                                                   reinicio se ejecuta como trabajo.
 
         Returns:
             Response: Resultado de la operación.
         """
-        resp = await JuiceBoxAPI.__send_command(prog, "__RESTART__")
+        resp = await JuiceBoxAPI.__send_and_await(prog, "__RESTART__", on_progress)
         if resp.status == Status.OK:
             return Response.ok(message=f"{prog} has been restarted!")
         return Response.error(message=f"{prog} couldn't be restarted", data={})
 
     @staticmethod
-    async def restart_rtb_status() -> Response:
+    async def restart_rtb_status(on_progress: ProgressCallback | None = None) -> Response:
         """
         Reinicia el manager de RTB.
 
+        Args:
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
+
         Returns:
             Response: Resultado de la operación.
         """
-        return await JuiceBoxAPI.__restart_manager(Programs.RTB)
+        return await JuiceBoxAPI.__restart_manager(Programs.RTB, on_progress)
 
     @staticmethod
     async def restart_js_status() -> Response:
@@ -267,55 +605,110 @@ class JuiceBoxAPI:
     # START ------------------------------------------------------------
 
     @staticmethod
-    async def __start(prog: str) -> Response:
+    async def __start(
+        prog: str, on_progress: ProgressCallback | None = None
+    ) -> Response:
         """
         Inicia el manager de un programa.
 
         Args:
             prog (str): Programa destino (RTB | JS).
+            on_progress (ProgressCallback | None): Función que recibe el progreso si el
+                                                   arranque se ejecuta como trabajo.
 
         Returns:
             Response: Resultado de la operación.
         """
-        return await JuiceBoxAPI.__send_command(prog=prog, command="__START__")
+        return await JuiceBoxAPI.__send_and_await(prog, "__START__", on_progress)
 
     @staticmethod
-    async def start_rtb() -> Response:
+    async def start_rtb(on_progress: ProgressCallback | None = None) -> Response:
         """
         Inicia los contenedores de RTB.
 
+        Args:
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
+
         Returns:
             Response: Resultado de la operación.
         """
-        return await JuiceBoxAPI.__start(Programs.RTB)
+        return await JuiceBoxAPI.__start(Programs.RTB, on_progress)
 
     @staticmethod
-    async def start_js_container() -> Response:
+    async def start_js_container(wait_ready: bool = False) -> Response:
         """
         Inicia un contenedor de JS.
 
+        Args:
+            wait_ready (bool): Si es True, el motor responde cuando el contenedor ya
+                               atiende peticiones HTTP (`data.ready`).
+
         Returns:
             Response: Resultado de la operación.
         """
-        return await JuiceBoxAPI.__start(Programs.JS)
+        if not wait_ready:
+            return await JuiceBoxAPI.__start(Programs.JS)
+        return await JuiceBoxAPI.__send_and_await(
+            Programs.JS, "__START__", args={"wait_ready": True}
+        )
 
     @staticmethod
-    async def start_n_js_containers(n: int) -> list[Response]:
+    async def start_js_batch(
+        n: int, stream: bool = False, on_progress: ProgressCallback | None = None
+    ) -> Response:
         """
-        Inicia n contenedores de OWASP Juice Shop de forma secuencial.
+        Inicia n contenedores de OWASP Juice Shop en paralelo con un único comando
+        (`__START_N__`) y espera el resultado agregado.
 
         Args:
             n (int): Número de contenedores a iniciar.
+            stream (bool): Si es True, el motor publica en Redis el resultado de cada
+                           contenedor en cuanto termina.
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
 
         Returns:
-            list[Response]: Lista con los resultados de cada operación de inicio.
+            Response: Resultado agregado con `requested`, `started` y `containers`.
         """
+        return await JuiceBoxAPI.__send_and_await(
+            Programs.JS,
+            "__START_N__",
+            on_progress,
+            args={"n": n, "stream": stream},
+        )
 
-        __containers: list[Response] = []
-        for _ in range(0, n):
-            __response: Response = await JuiceBoxAPI.__start(Programs.JS)
-            __containers.append(__response)
+    @staticmethod
+    async def start_n_js_containers(
+        n: int, on_progress: ProgressCallback | None = None
+    ) -> list[Response]:
+        """
+        Inicia n contenedores de OWASP Juice Shop en paralelo.
+
+        Args:
+            n (int): Número de contenedores a iniciar.
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
 
+        Returns:
+            list[Response]: Lista con los resultados de cada operación de inicio.
+        """
+        __resp: Response = await JuiceBoxAPI.start_js_batch(n, on_progress=on_progress)
+        __results: list[dict] | None = __resp.data.get("containers")
+        if __results is None:
+            # Error antes de arrancar ningún contenedor
+            return [__resp]
+
+        __containers: list[Response] = [
+            Response(
+                status=Status.OK if result.get("success") else Status.ERROR,
+                message=result.get("message", ""),
+                data=result.get("data") or {},
+            )
+            for result in __results
+        ]
+        # Arranques que no se pudieron intentar por falta de puertos
+        for _ in range(n - len(__containers)):
+            __containers.append(
+                Response.error(message="No available ports", data={"port": None})
+            )
         return __containers
 
     # STOP --------------------------------------------------------------
@@ -368,17 +761,85 @@ class JuiceBoxAPI:
             Programs.JS, "__STOP_CONTAINER__", args={"port": port}
         )
 
+    @staticmethod
+    async def resume_js_container(port: int) -> Response:
+        """
+        Reanuda un contenedor de JS hibernado (pausado por inactividad) dado su puerto.
+
+        Args:
+            port (int): Puerto del contenedor a reanudar.
+
+        Returns:
+            Response: Resultado de la operación.
+        """
+        return await JuiceBoxAPI.__send_command(
+            Programs.JS, "__RESUME__", args={"port": port}
+        )
+
     # MISCELLANEOUS ----------------------------------------------------
 
     @staticmethod
-    async def generate_xml() -> Response:
+    async def generate_xml(
+        on_progress: ProgressCallback | None = None, force: bool = False
+    ) -> Response:
         """
         Genera el archivo XML de misiones para Root The Box usando JuiceBoxEngine.
 
+        Args:
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
+            force (bool): Si es True se ignora la caché de archivos XML del motor.
+
         Returns:
             Response: Resultado de la operación, incluyendo estado y mensaje.
         """
-        return await JuiceBoxAPI.__send_command(Programs.JS, "__GENERATE_XML__")
+        return await JuiceBoxAPI.__send_and_await(
+            Programs.JS,
+            "__GENERATE_XML__",
+            on_progress,
+            args={"force": True} if force else {},
+        )
+
+    @staticmethod
+    async def refresh_country_mapping(url: str | None = None) -> Response:
+        """
+        Descarga en el motor la copia local del mapeo de países de fbctf, de modo que
+        la generación de misiones no necesite acceso a internet.
+
+        Args:
+            url (str | None): URL de descarga alternativa (p.ej. un espejo interno).
+
+        Returns:
+            Response: Resultado con la ruta, el tamaño y el sha256 del archivo.
+        """
+        return await JuiceBoxAPI.__send_command(
+            Programs.JS, "__REFRESH_COUNTRY_MAPPING__", {"url": url} if url else {}
+        )
+
+    @staticmethod
+    async def get_xml_cache() -> Response:
+        """
+        Obtiene las entradas de la caché de archivos missions.xml del motor.
+
+        Returns:
+            Response: Resultado con la ruta de la caché y sus entradas.
+        """
+        return await JuiceBoxAPI.__send_command(Programs.JS, "__XML_CACHE__")
+
+    @staticmethod
+    async def evict_xml_cache(key: str | None = None) -> Response:
+        """
+        Elimina una entrada de la caché de archivos missions.xml o la caché completa.
+
+        Args:
+            key (str | None): Clave de la entrada. Si es None se vacía la caché.
+
+        Returns:
+            Response: Resultado con las claves eliminadas.
+        """
+        args: dict[str, str | bool] = {"evict": True}
+        if key:
+            args["key"] = key
+        return await JuiceBoxAPI.__send_command(Programs.JS, "__XML_CACHE__", args)
 
     @staticmethod
     async def get_js_ports_range() -> Response:
@@ -389,3 +850,108 @@ class JuiceBoxAPI:
             Response: Resultado de la operación con el rango de puertos o error.
         """
         return await JuiceBoxAPI.__send_command(Programs.JS, "__PORTS_RANGE__")
+
+    # JOBS -------------------------------------------------------------
+
+    @staticmethod
+    async def __send_and_await(
+        prog: str,
+        command: str,
+        on_progress: ProgressCallback | None = None,
+        args: dict = {},
+    ) -> Response:
+        """
+        Envía un comando y, si el motor lo acepta como trabajo, espera su resultado.
+
+        Args:
+            prog (str): Programa destino (RTB | JS).
+            command (str): Comando a enviar.
+            on_progress (ProgressCallback | None): Función que recibe el progreso del trabajo.
+            args (dict, opcional): Argumentos adicionales del comando.
+
+        Returns:
+            Response: Resultado final de la operación.
+        """
+        resp = await JuiceBoxAPI.__send_command(prog=prog, command=command, args=args)
+        job_id = resp.data.get("job_id") if resp.status == Status.OK else None
+        if not job_id:
+            return resp
+        return await JuiceBoxAPI.await_job(job_id, on_progress=on_progress)
+
+    @staticmethod
+    async def get_job_status(job_id: str | None = None) -> Response:
+        """
+        Obtiene el estado de un trabajo de larga duración del motor.
+
+        Args:
+            job_id (str | None): Identificador del trabajo. Si es None, se listan todos.
+
+        Returns:
+            Response: Estado del trabajo (o lista de trabajos) o error.
+        """
+        args = {"job_id": job_id} if job_id else {}
+        return await JuiceBoxAPI.__send_command(
+            Programs.ENGINE, "__JOB_STATUS__", args=args
+        )
+
+    @staticmethod
+    async def cancel_job(job_id: str) -> Response:
+        """
+        Solicita la cancelación de un trabajo de larga duración del motor.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+
+        Returns:
+            Response: Resultado de la operación.
+        """
+        return await JuiceBoxAPI.__send_command(
+            Programs.ENGINE, "__JOB_CANCEL__", args={"job_id": job_id}
+        )
+
+    @staticmethod
+    async def await_job(
+        job_id: str,
+        on_progress: ProgressCallback | None = None,
+        interval: float = 1.0,
+        timeout: float | None = None,
+    ) -> Response:
+        """
+        Espera a que termine un trabajo del motor consultando su estado periódicamente.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+            on_progress (ProgressCallback | None): Función (o coroutine) que recibe el estado
+                                                   del trabajo cada vez que cambia su avance.
+            interval (float): Segundos entre consultas. Por defecto 1.0.
+            timeout (float | None): Tiempo máximo de espera en segundos. None para no limitar.
+
+        Returns:
+            Response: Respuesta final del comando ejecutado por el trabajo.
+        """
+        start = time.monotonic()
+        last: tuple[int, str] | None = None
+        while True:
+            resp = await JuiceBoxAPI.get_job_status(job_id)
+            if resp.status != Status.OK:
+                return resp
+            job: dict = resp.data
+            current = (job.get("progress", 0), job.get("stage", ""))
+            if on_progress is not None and current != last:
+                last = current
+                result = on_progress(job)
+                if inspect.isawaitable(result):
+                    await result
+            if job.get("state") in JOB_FINISHED_STATES:
+                final: dict = job.get("result") or {}
+                return Response(
+                    status=final.get("status", Status.ERROR),
+                    message=final.get("message", f"Job {job.get('state')}"),
+                    data=final.get("data") or {},
+                )
+            if timeout is not None and time.monotonic() - start > timeout:
+                return Response.error(
+                    message=f"Job {job_id} did not finish in {timeout} seconds",
+                    data=job,
+                )
+            await asyncio.sleep(interval)
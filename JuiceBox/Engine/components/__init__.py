@@ -3,6 +3,13 @@ from .juiceBoxEngineServer import JuiceBoxEngineServer
 from .juiceShopManager import JuiceShopManager
 from .rootTheBoxManager import RootTheBoxManager
 from .redisManager import RedisManager
+from .commandScheduler import CommandScheduler
+from .jobManager import Job, JobCancelled, JobManager, JobState
+from .containerStateTable import ContainerRecord, ContainerStateTable
+from .portAllocator import PortAllocator
+from .readinessProber import ReadinessProber
+from .expiryScheduler import ExpiryScheduler
+from .idleDetector import IdleDetector
 
 __all__ = [
     "Monitor",
@@ -10,4 +17,15 @@ __all__ = [
     "JuiceShopManager",
     "RootTheBoxManager",
     "RedisManager",
+    "CommandScheduler",
+    "Job",
+    "JobCancelled",
+    "JobManager",
+    "JobState",
+    "ContainerRecord",
+    "ContainerStateTable",
+    "PortAllocator",
+    "ReadinessProber",
+    "ExpiryScheduler",
+    "IdleDetector",
 ]
@@ -0,0 +1,235 @@
+import asyncio
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+# Comandos de solo lectura: nunca esperan detrás de comandos que modifican recursos
+READ_ONLY_COMMANDS: set[tuple[str, str]] = {
+    ("RTB", "__STATUS__"),
+    ("RTB", "__CONFIG__"),
+    ("JS", "__STATUS__"),
+    ("JS", "__CONFIG__"),
+    ("JS", "__CONTAINER_STATUS__"),
+    ("JS", "__PORTS_RANGE__"),
+}
+
+# Prefijo de las variables del .env con los límites de concurrencia por comando.
+# Ejemplo: JUICEBOX_LIMIT_JS_START=4 -> ("JS", "__START__") con 4 ejecuciones simultáneas.
+LIMIT_PREFIX: str = "JUICEBOX_LIMIT_"
+
+
+class ResourceLock:
+    """
+    Candado de lectura/escritura para asyncio.
+
+    - **shared:** Varios comandos pueden mantenerlo a la vez (p.ej. operaciones sobre
+      puertos distintos de la Juice Shop).
+    - **exclusive:** Un único comando lo mantiene (p.ej. detener todos los contenedores).
+
+    Los escritores tienen preferencia para evitar que esperen indefinidamente.
+    """
+
+    def __init__(self) -> None:
+        self.__condition = asyncio.Condition()
+        self.__readers: int = 0
+        self.__writer: bool = False
+        self.__waiting_writers: int = 0
+
+    async def acquire(self, exclusive: bool) -> None:
+        """
+        Adquiere el candado en modo compartido o exclusivo.
+
+        Args:
+            exclusive (bool): True para modo exclusivo, False para compartido.
+        """
+        async with self.__condition:
+            if exclusive:
+                self.__waiting_writers += 1
+                try:
+                    await self.__condition.wait_for(
+                        lambda: not self.__writer and self.__readers == 0
+                    )
+                finally:
+                    self.__waiting_writers -= 1
+                self.__writer = True
+            else:
+                await self.__condition.wait_for(
+                    lambda: not self.__writer and self.__waiting_writers == 0
+                )
+                self.__readers += 1
+
+    async def release(self, exclusive: bool) -> None:
+        """
+        Libera el candado en el modo en que fue adquirido.
+
+        Args:
+            exclusive (bool): True si se adquirió en modo exclusivo.
+        """
+        async with self.__condition:
+            if exclusive:
+                self.__writer = False
+            else:
+                self.__readers -= 1
+            self.__condition.notify_all()
+
+
+class CommandScheduler:
+    """
+    Planificador de comandos del motor que permite ejecutar en paralelo los comandos
+    independientes.
+
+    ## Características
+    - Candados por recurso: puerto de Juice Shop, stack de Root The Box, archivo de
+      configuración y archivo de misiones.
+    - Los comandos de solo lectura no adquieren candados.
+    - Límites de concurrencia por comando configurables en el `.env`.
+    - Los candados se adquieren en orden para evitar interbloqueos.
+    """
+
+    def __init__(self, limits: dict[tuple[str, str], int] | None = None) -> None:
+        """
+        Inicializa el planificador.
+
+        Args:
+            limits (dict[tuple[str, str], int] | None): Límite de ejecuciones simultáneas
+                por (programa, comando).
+        """
+        self.limits: dict[tuple[str, str], int] = limits or {}
+        self.__locks: dict[str, ResourceLock] = {}
+        self.__semaphores: dict[tuple[str, str], asyncio.Semaphore] = {}
+
+    @staticmethod
+    def parse_limits(env: dict[str, str | None]) -> dict[tuple[str, str], int]:
+        """
+        Obtiene los límites de concurrencia por comando de las variables del `.env`.
+
+        Args:
+            env (dict[str, str | None]): Variables del archivo `.env`.
+
+        Returns:
+            dict[tuple[str, str], int]: Límite por (programa, comando).
+        """
+        limits: dict[tuple[str, str], int] = {}
+        for key, value in env.items():
+            if not key.startswith(LIMIT_PREFIX) or not value:
+                continue
+            prog, _, command = key[len(LIMIT_PREFIX) :].partition("_")
+            if not prog or not command or not value.strip().isdigit():
+                continue
+            limits[(prog, f"__{command}__")] = max(1, int(value.strip()))
+        return limits
+
+    def __container_key(self, args: dict[str, Any]) -> str:
+        """
+        Obtiene el recurso de un contenedor de Juice Shop a partir de su puerto o nombre.
+
+        Args:
+            args (dict[str, Any]): Argumentos del comando.
+
+        Returns:
+            str: Nombre del recurso del puerto.
+        """
+        container = args.get("port") or args.get("container") or ""
+        if isinstance(container, str):
+            # "owasp-juice-shop-3000" -> "3000"
+            digits = container[len(container.rstrip("0123456789")) :]
+            container = digits or container
+        return f"js:port:{container}"
+
+    def resources_for(
+        self, prog: str, command: str, args: dict[str, Any]
+    ) -> list[tuple[str, bool]]:
+        """
+        Obtiene los recursos que necesita un comando y el modo de cada uno.
+
+        Args:
+            prog (str): Programa destino (RTB | JS).
+            command (str): Comando recibido.
+            args (dict[str, Any]): Argumentos del comando.
+
+        Returns:
+            list[tuple[str, bool]]: Lista de (recurso, exclusivo).
+        """
+        if (prog, command) in READ_ONLY_COMMANDS:
+            return []
+        match (prog, command):
+            case ("RTB", "__START__" | "__RESTART__"):
+                return [("rtb", True), ("missions", False)]
+            case ("RTB", "__STOP__"):
+                return [("rtb", True)]
+            case ("RTB", "__SET_CONFIG__"):
+                # Cambiar la configuración de RTB también reinicia el manager de JS
+                return [("config", True), ("rtb", True), ("js", True)]
+            case ("JS", "__START__" | "__START_N__"):
+                # El puerto se reserva de forma atómica en el PortAllocator del manager
+                return [("js", False)]
+            case ("JS", "__STOP_CONTAINER__" | "__RESUME__"):
+                return [("js", False), (self.__container_key(args), True)]
+            case ("JS", "__EXPIRE__" | "__HIBERNATE__"):
+                # Expiración o hibernación en lote desde el monitor (no son comandos
+                # de cliente)
+                return [("js", False)] + [
+                    (self.__container_key({"container": name}), True)
+                    for name in dict.fromkeys(args.get("containers", []))
+                ]
+            case ("JS", "__STOP__" | "__RESTART__"):
+                return [("js", True)]
+            case ("JS", "__SET_CONFIG__"):
+                return [("config", True), ("js", True)]
+            case ("JS", "__GENERATE_XML__"):
+                return [("config", True), ("missions", True)]
+            case ("JS", "__REFRESH_COUNTRY_MAPPING__"):
+                return [("config", True)]
+            case ("JS", "__XML_CACHE__"):
+                return [("missions", True)] if args.get("evict") else []
+        return []
+
+    def __lock(self, resource: str) -> ResourceLock:
+        """
+        Obtiene (o crea) el candado de un recurso.
+        """
+        if resource not in self.__locks:
+            self.__locks[resource] = ResourceLock()
+        return self.__locks[resource]
+
+    def __semaphore(self, prog: str, command: str) -> asyncio.Semaphore | None:
+        """
+        Obtiene (o crea) el semáforo de concurrencia de un comando si tiene límite.
+        """
+        limit = self.limits.get((prog, command))
+        if limit is None:
+            return None
+        if (prog, command) not in self.__semaphores:
+            self.__semaphores[(prog, command)] = asyncio.Semaphore(limit)
+        return self.__semaphores[(prog, command)]
+
+    @asynccontextmanager
+    async def reserve(
+        self, prog: str, command: str, args: dict[str, Any] | None = None
+    ) -> AsyncIterator[None]:
+        """
+        Reserva el límite de concurrencia y los recursos de un comando mientras se ejecuta.
+
+        Args:
+            prog (str): Programa destino (RTB | JS).
+            command (str): Comando recibido.
+            args (dict[str, Any] | None): Argumentos del comando.
+        """
+        semaphore = self.__semaphore(prog, command)
+        # Orden fijo de adquisición para evitar interbloqueos
+        resources = sorted(self.resources_for(prog, command, args or {}))
+        acquired: list[tuple[ResourceLock, bool]] = []
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            for resource, exclusive in resources:
+                lock = self.__lock(resource)
+                await lock.acquire(exclusive)
+                acquired.append((lock, exclusive))
+            yield
+        finally:
+            for lock, exclusive in reversed(acquired):
+                await lock.release(exclusive)
+            if semaphore is not None:
+                semaphore.release()
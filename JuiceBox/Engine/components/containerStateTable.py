@@ -0,0 +1,559 @@
+import threading, time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any
+from docker import DockerClient, errors
+
+
+# Estado de un contenedor según la acción de un evento de Docker. Las acciones que no
+# aparecen aquí ("create", "start", "restart", "unpause") se refrescan con un inspect.
+EVENT_STATUS: dict[str, str] = {
+    "die": "exited",
+    "stop": "exited",
+    "pause": "paused",
+}
+
+# Acciones que obligan a refrescar el contenedor (puertos, estado real)
+REFRESH_ACTIONS: set[str] = {"create", "start", "restart", "unpause", "rename"}
+
+# Segundos de espera antes de volver a suscribirse al stream de eventos
+RECONNECT_DELAY: float = 2.0
+
+
+@dataclass
+class ContainerRecord:
+    """
+    Estado conocido de un contenedor de Docker.
+
+    ## Atributos
+      - **name (str):** Nombre del contenedor.
+      - **id (str):** Identificador de Docker.
+      - **status (str):** Estado ('created', 'running', 'exited', 'paused', ...).
+      - **port (int):** Primer puerto publicado en el host o -1 si no tiene.
+      - **created (float):** Momento de creación (epoch).
+      - **labels (dict[str, str]):** Labels del contenedor.
+    """
+
+    name: str
+    id: str = ""
+    status: str = "created"
+    port: int = -1
+    created: float = field(default_factory=time.time)
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_attrs(cls, attrs: dict[str, Any]) -> "ContainerRecord":
+        """
+        Crea un registro a partir de los atributos devueltos por Docker. Acepta tanto el
+        formato de `containers.list(sparse=True)` como el de `containers.get`.
+
+        Args:
+            attrs (dict[str, Any]): Atributos del contenedor.
+
+        Returns:
+            ContainerRecord: Registro del contenedor.
+        """
+        # Nombre: "Names": ["/nombre"] (list) o "Name": "/nombre" (inspect)
+        names = attrs.get("Names") or [attrs.get("Name") or ""]
+        name: str = str(names[0]).lstrip("/")
+
+        # Estado: "State": "running" (list) o "State": {"Status": "running"} (inspect)
+        state = attrs.get("State")
+        status: str = state.get("Status", "") if isinstance(state, dict) else str(state or "")
+
+        # Labels: "Labels" (list) o "Config": {"Labels"} (inspect)
+        labels = attrs.get("Labels")
+        if labels is None:
+            labels = (attrs.get("Config") or {}).get("Labels")
+
+        # Creación: epoch (list) o fecha ISO (inspect)
+        created = attrs.get("Created")
+        if isinstance(created, str):
+            try:
+                created = datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                created = None
+        if not isinstance(created, (int, float)):
+            created = time.time()
+
+        return cls(
+            name=name,
+            id=str(attrs.get("Id", "")),
+            status=status or "created",
+            port=cls.__host_port(attrs),
+            created=float(created),
+            labels=dict(labels or {}),
+        )
+
+    @staticmethod
+    def __host_port(attrs: dict[str, Any]) -> int:
+        """
+        Obtiene el primer puerto publicado en el host.
+        """
+        # Formato list: "Ports": [{"PrivatePort": 3000, "PublicPort": 3001, ...}]
+        ports = attrs.get("Ports")
+        if isinstance(ports, list):
+            for binding in ports:
+                if binding.get("PublicPort"):
+                    return int(binding["PublicPort"])
+            return -1
+        # Formato inspect: {'3000/tcp': [{'HostIp': '0.0.0.0', 'HostPort': '3001'}]}
+        ports = (attrs.get("NetworkSettings") or {}).get("Ports") or {}
+        for bindings in ports.values():
+            if bindings:
+                return int(bindings[0]["HostPort"])
+        return -1
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convierte el registro a un diccionario.
+
+        Returns:
+            dict[str, Any]: Estructura con el estado del contenedor.
+        """
+        return {
+            "container": self.name,
+            "id": self.id,
+            "status": self.status,
+            "port": self.port,
+            "created": self.created,
+            "labels": self.labels,
+        }
+
+
+def list_containers(
+    docker_client: DockerClient, label: str | None = None, names: Iterable[str] = ()
+) -> dict[str, ContainerRecord]:
+    """
+    Obtiene los contenedores con un label y/o con unos nombres exactos. Usa
+    `containers.list(sparse=True)`, cuya respuesta ya incluye estado, puertos y labels,
+    por lo que el coste es una llamada por filtro y no una por contenedor.
+
+    Args:
+        docker_client (DockerClient): Cliente de Docker.
+        label (str | None): Label (clave=valor) de los contenedores.
+        names (Iterable[str]): Nombres exactos de contenedores sin el label.
+
+    Returns:
+        dict[str, ContainerRecord]: Registros por nombre de contenedor.
+    """
+    label_key, _, label_value = (label or "").partition("=")
+    tracked: list[str] = sorted(set(names))
+    containers = []
+    if label:
+        containers += docker_client.containers.list(
+            all=True, sparse=True, filters={"label": label}
+        )
+    if tracked:
+        # El filtro por nombre busca subcadenas, se comprueba el nombre exacto después
+        containers += docker_client.containers.list(
+            all=True, sparse=True, filters={"name": tracked}
+        )
+    records: dict[str, ContainerRecord] = {}
+    for container in containers:
+        record = ContainerRecord.from_attrs(container.attrs)
+        if record.name in tracked or (
+            label and record.labels.get(label_key) == label_value
+        ):
+            records[record.name] = record
+    return records
+
+
+class ContainerStateTable:
+    """
+    Tabla en memoria con el estado de los contenedores de Juice Box.
+
+    ## Características
+    - Se inicializa con una única llamada `containers.list` filtrada por label (y otra
+      por nombre si se siguen contenedores sin el label, como los de Root The Box).
+    - Se mantiene al día con el stream de eventos de Docker, sin consultas periódicas.
+    - Las consultas por nombre o puerto son O(1) y no tocan Docker.
+    - Permite registrar funciones que se llaman en cada cambio de estado.
+    - Si el stream de eventos se corta, la tabla deja de estar lista, se vuelve a
+      inicializar y se suscribe de nuevo.
+    """
+
+    def __init__(
+        self,
+        docker_client: DockerClient,
+        label: str = "program=JS",
+        names: Callable[[str], bool] | None = None,
+    ) -> None:
+        """
+        Inicializa la tabla sin conectarla a Docker.
+
+        Args:
+            docker_client (DockerClient): Cliente de Docker.
+            label (str): Label (clave=valor) de los contenedores que se siguen.
+            names (Callable[[str], bool] | None): Función que indica si se sigue un
+                contenedor por su nombre aunque no tenga el label.
+        """
+        self.__docker_client: DockerClient = docker_client
+        self.label: str = label
+        self.__label_key, _, self.__label_value = label.partition("=")
+        self.__names: Callable[[str], bool] = names or (lambda _: False)
+        self.__tracked: set[str] = set()
+        self.__records: dict[str, ContainerRecord] = {}
+        self.__ports: dict[int, str] = {}
+        # Momento de entrega de los contenedores del pool (no se guarda en Docker)
+        self.__handouts: dict[str, float] = {}
+        self.__listeners: list[Callable[[str, ContainerRecord | None], None]] = []
+        self.__lock = threading.RLock()
+        self.__ready = threading.Event()
+        self.__running: bool = False
+        self.__stream = None
+        self.__thread: threading.Thread | None = None
+
+    # ─── Consultas ──────────────────────────────────────────────────────────────
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indica si la tabla está inicializada y recibiendo eventos.
+        """
+        return self.__ready.is_set()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """
+        Espera a que la tabla esté lista.
+
+        Args:
+            timeout (float | None): Tiempo máximo de espera en segundos.
+
+        Returns:
+            bool: True si la tabla está lista.
+        """
+        return self.__ready.wait(timeout)
+
+    def get(self, name: str) -> ContainerRecord | None:
+        """
+        Obtiene el registro de un contenedor por su nombre.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            ContainerRecord | None: Registro o None si no existe.
+        """
+        with self.__lock:
+            return self.__records.get(name)
+
+    def by_port(self, port: int) -> ContainerRecord | None:
+        """
+        Obtiene el registro del contenedor que publica un puerto.
+
+        Args:
+            port (int): Puerto del host.
+
+        Returns:
+            ContainerRecord | None: Registro o None si ningún contenedor lo usa.
+        """
+        with self.__lock:
+            name = self.__ports.get(port)
+            return self.__records.get(name) if name else None
+
+    def records(self) -> list[ContainerRecord]:
+        """
+        Obtiene todos los registros de la tabla.
+
+        Returns:
+            list[ContainerRecord]: Registros de los contenedores.
+        """
+        with self.__lock:
+            return list(self.__records.values())
+
+    def used_ports(self) -> list[int]:
+        """
+        Obtiene los puertos del host publicados por los contenedores de la tabla.
+
+        Returns:
+            list[int]: Puertos ordenados.
+        """
+        with self.__lock:
+            return sorted(self.__ports)
+
+    def handed_out_at(self, name: str) -> float | None:
+        """
+        Obtiene el momento en que se entregó un contenedor del pool.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            float | None: Momento de la entrega (epoch) o None si no se ha entregado.
+        """
+        with self.__lock:
+            return self.__handouts.get(name)
+
+    def handouts(self) -> dict[str, float]:
+        """
+        Obtiene los momentos de entrega de los contenedores del pool.
+
+        Returns:
+            dict[str, float]: Nombre del contenedor -> momento de la entrega (epoch).
+        """
+        with self.__lock:
+            return dict(self.__handouts)
+
+    # ─── Escrituras ─────────────────────────────────────────────────────────────
+
+    def add_listener(self, listener: Callable[[str, ContainerRecord | None], None]) -> None:
+        """
+        Registra una función que se llama con (nombre, registro) en cada cambio. El
+        registro es None cuando el contenedor se elimina.
+
+        Args:
+            listener (Callable[[str, ContainerRecord | None], None]): Función a registrar.
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def remove_listener(
+        self, listener: Callable[[str, ContainerRecord | None], None]
+    ) -> None:
+        """
+        Elimina una función registrada con `add_listener`.
+
+        Args:
+            listener (Callable[[str, ContainerRecord | None], None]): Función registrada.
+        """
+        with self.__lock:
+            if listener in self.__listeners:
+                self.__listeners.remove(listener)
+
+    def mark_handed_out(self, name: str) -> None:
+        """
+        Registra que un contenedor del pool se ha entregado a un usuario. Su tiempo de
+        vida empieza a contar desde ese momento; se avisa a las funciones registradas
+        para que programen su vencimiento.
+
+        Args:
+            name (str): Nombre del contenedor.
+        """
+        with self.__lock:
+            self.__handouts[name] = time.time()
+            record = self.__records.get(name)
+        if record is not None:
+            self.__notify(name, record)
+
+    def restore_handouts(self, handouts: dict[str, float]) -> None:
+        """
+        Recupera los momentos de entrega guardados antes de reiniciar el motor. Se
+        ignoran los contenedores que ya no están en la tabla.
+
+        Args:
+            handouts (dict[str, float]): Nombre del contenedor -> momento de la entrega.
+        """
+        restored: list[ContainerRecord] = []
+        with self.__lock:
+            for name, handed_out_at in handouts.items():
+                if name in self.__records:
+                    self.__handouts[name] = float(handed_out_at)
+                    restored.append(self.__records[name])
+        for record in restored:
+            self.__notify(record.name, record)
+
+    def __notify(self, name: str, record: ContainerRecord | None) -> None:
+        """
+        Llama a las funciones registradas con un cambio de estado.
+        """
+        for listener in list(self.__listeners):
+            try:
+                listener(name, record)
+            except Exception:
+                pass
+
+    def track_names(self, names: Iterable[str]) -> None:
+        """
+        Sigue además los contenedores con estos nombres aunque no tengan el label.
+
+        Args:
+            names (Iterable[str]): Nombres exactos de los contenedores.
+        """
+        with self.__lock:
+            self.__tracked = set(names)
+
+    def upsert(self, record: ContainerRecord) -> None:
+        """
+        Inserta o actualiza el registro de un contenedor.
+
+        Args:
+            record (ContainerRecord): Registro del contenedor.
+        """
+        with self.__lock:
+            previous = self.__records.get(record.name)
+            if previous is not None and self.__ports.get(previous.port) == record.name:
+                self.__ports.pop(previous.port, None)
+            self.__records[record.name] = record
+            if record.port > 0:
+                self.__ports[record.port] = record.name
+            changed = previous is None or previous.status != record.status
+        if changed:
+            self.__notify(record.name, record)
+
+    def set_status(self, name: str, status: str) -> None:
+        """
+        Cambia el estado de un contenedor de la tabla.
+
+        Args:
+            name (str): Nombre del contenedor.
+            status (str): Nuevo estado.
+        """
+        with self.__lock:
+            record = self.__records.get(name)
+            if record is None or record.status == status:
+                return
+            record.status = status
+        self.__notify(name, record)
+
+    def remove(self, name: str, container_id: str | None = None) -> None:
+        """
+        Elimina un contenedor de la tabla.
+
+        Args:
+            name (str): Nombre del contenedor.
+            container_id (str | None): Si se indica, solo se elimina el registro cuando
+                corresponde a ese contenedor (un evento atrasado no borra a otro
+                contenedor creado después con el mismo nombre).
+        """
+        with self.__lock:
+            record = self.__records.get(name)
+            if record is None:
+                return
+            if container_id and record.id and record.id != container_id:
+                return
+            self.__records.pop(name, None)
+            self.__handouts.pop(name, None)
+            if self.__ports.get(record.port) == name:
+                self.__ports.pop(record.port, None)
+        self.__notify(name, None)
+
+    def refresh(self, container_id: str) -> ContainerRecord | None:
+        """
+        Vuelve a leer un contenedor de Docker y actualiza su registro.
+
+        Args:
+            container_id (str): Identificador o nombre del contenedor.
+
+        Returns:
+            ContainerRecord | None: Registro actualizado o None si ya no existe.
+        """
+        try:
+            container = self.__docker_client.containers.get(container_id)
+        except errors.NotFound:
+            return None
+        record = ContainerRecord.from_attrs(container.attrs)
+        if self.__is_tracked(record.name, record.labels):
+            self.upsert(record)
+            return record
+        return None
+
+    # ─── Sincronización con Docker ──────────────────────────────────────────────
+
+    def __is_tracked(self, name: str, labels: dict[str, str]) -> bool:
+        """
+        Indica si un contenedor se sigue en la tabla por su label o por su nombre.
+        """
+        return (
+            labels.get(self.__label_key) == self.__label_value
+            or name in self.__tracked
+            or self.__names(name)
+        )
+
+    def seed(self) -> None:
+        """
+        Carga el estado de todos los contenedores con el label en una sola llamada (más
+        otra para los nombres seguidos sin label). También sirve como reconciliación:
+        los contenedores que ya no existen se eliminan de la tabla.
+        """
+        started = time.time()
+        with self.__lock:
+            tracked = sorted(self.__tracked)
+        records = list_containers(self.__docker_client, self.label, tracked)
+        with self.__lock:
+            # Se conservan los registros creados mientras se listaba
+            for name, record in self.__records.items():
+                if name not in records and record.created >= started:
+                    records[name] = record
+            removed = [name for name in self.__records if name not in records]
+            self.__records = records
+            self.__handouts = {
+                n: t for n, t in self.__handouts.items() if n in records
+            }
+            self.__ports = {r.port: r.name for r in records.values() if r.port > 0}
+        for name in removed:
+            self.__notify(name, None)
+        for record in records.values():
+            self.__notify(record.name, record)
+
+    def start(self) -> None:
+        """
+        Inicializa la tabla y arranca el hilo que sigue los eventos de Docker.
+        """
+        if self.__running:
+            return
+        self.__running = True
+        self.__thread = threading.Thread(
+            target=self.__watch_events, name="juicebox-container-events", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el seguimiento de eventos de Docker.
+        """
+        self.__running = False
+        self.__ready.clear()
+        if self.__stream is not None:
+            try:
+                self.__stream.close()
+            except Exception:
+                pass
+
+    def __watch_events(self) -> None:
+        """
+        Hilo que inicializa la tabla y aplica los eventos de Docker. Si el stream se
+        corta, vuelve a inicializar la tabla y a suscribirse.
+        """
+        while self.__running:
+            try:
+                since = int(time.time())
+                self.__stream = self.__docker_client.events(
+                    decode=True, since=since, filters={"type": "container"}
+                )
+                # Se inicializa después de suscribirse para no perder eventos
+                self.seed()
+                self.__ready.set()
+                for event in self.__stream:
+                    self.__apply(event)
+            except Exception:
+                pass
+            finally:
+                self.__ready.clear()
+            if self.__running:
+                time.sleep(RECONNECT_DELAY)
+
+    def __apply(self, event: dict[str, Any]) -> None:
+        """
+        Aplica un evento de Docker a la tabla.
+
+        Args:
+            event (dict[str, Any]): Evento decodificado del stream.
+        """
+        actor: dict[str, Any] = event.get("Actor") or {}
+        attributes: dict[str, str] = actor.get("Attributes") or {}
+        name: str = attributes.get("name", "")
+        # "exec_start: sh" -> "exec_start"; "health_status: healthy" -> "health_status"
+        action: str = str(event.get("Action") or event.get("status") or "").split(":")[0]
+        if not name or not self.__is_tracked(name, attributes):
+            return
+        if action == "destroy":
+            self.remove(name, actor.get("ID"))
+        elif action in EVENT_STATUS:
+            self.set_status(name, EVENT_STATUS[action])
+        elif action in REFRESH_ACTIONS:
+            if action == "rename":
+                # El nombre anterior llega en "oldName" como "/nombre"
+                self.remove(attributes.get("oldName", "").lstrip("/"))
+            self.refresh(actor.get("ID") or name)
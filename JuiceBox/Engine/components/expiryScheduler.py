@@ -0,0 +1,185 @@
+import heapq, itertools, threading, time
+from collections.abc import Callable
+
+
+# Los vencimientos que caen dentro de esta ventana (segundos) se disparan en el mismo lote
+BATCH_WINDOW: float = 1.0
+
+# Entradas obsoletas permitidas en el montículo antes de compactarlo
+COMPACT_SLACK: int = 64
+
+
+class ExpiryScheduler:
+    """
+    Planificador de vencimientos de los contenedores.
+
+    ## Características
+    - Guarda los vencimientos en un montículo (min-heap) ordenado por fecha.
+    - Un hilo en segundo plano duerme hasta el siguiente vencimiento; no recorre los
+      contenedores en cada vuelta, por lo que el coste depende del número de
+      vencimientos y no del número de contenedores.
+    - Los vencimientos cercanos (dentro de `batch_window`) se entregan juntos en una
+      sola llamada a `on_expire`.
+    - Reprogramar o cancelar es O(log n): las entradas antiguas se descartan al salir
+      del montículo.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[list[str]], None],
+        batch_window: float = BATCH_WINDOW,
+    ) -> None:
+        """
+        Inicializa el planificador sin arrancar su hilo.
+
+        Args:
+            on_expire (Callable[[list[str]], None]): Función que recibe los nombres de
+                los contenedores vencidos. Se llama desde el hilo del planificador.
+            batch_window (float): Segundos de margen para agrupar vencimientos.
+        """
+        self.batch_window: float = batch_window
+        self.__on_expire = on_expire
+        self.__cond = threading.Condition()
+        self.__seq = itertools.count()
+        # Montículo de (vencimiento, token, nombre)
+        self.__heap: list[tuple[float, int, str]] = []
+        # Vencimiento vigente de cada contenedor: nombre -> (vencimiento, token)
+        self.__deadlines: dict[str, tuple[float, int]] = {}
+        self.__running: bool = False
+        self.__thread: threading.Thread | None = None
+
+    # ─── Consultas ──────────────────────────────────────────────────────────────
+
+    def deadline(self, name: str) -> float | None:
+        """
+        Obtiene el vencimiento programado de un contenedor.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            float | None: Momento (epoch) o None si no tiene vencimiento.
+        """
+        with self.__cond:
+            entry = self.__deadlines.get(name)
+            return entry[0] if entry is not None else None
+
+    def pending(self) -> int:
+        """
+        Obtiene el número de vencimientos programados.
+
+        Returns:
+            int: Vencimientos pendientes.
+        """
+        with self.__cond:
+            return len(self.__deadlines)
+
+    # ─── Programación ───────────────────────────────────────────────────────────
+
+    def schedule(self, name: str, deadline: float) -> None:
+        """
+        Programa (o reprograma) el vencimiento de un contenedor.
+
+        Args:
+            name (str): Nombre del contenedor.
+            deadline (float): Momento (epoch) en que vence.
+        """
+        with self.__cond:
+            current = self.__deadlines.get(name)
+            if current is not None and current[0] == deadline:
+                return
+            token = next(self.__seq)
+            self.__deadlines[name] = (deadline, token)
+            heapq.heappush(self.__heap, (deadline, token, name))
+            self.__compact()
+            # Solo hace falta despertar al hilo si cambia el siguiente vencimiento
+            if self.__heap[0][1] == token:
+                self.__cond.notify()
+
+    def cancel(self, name: str) -> None:
+        """
+        Cancela el vencimiento de un contenedor (p.ej. se ha eliminado).
+
+        Args:
+            name (str): Nombre del contenedor.
+        """
+        with self.__cond:
+            if self.__deadlines.pop(name, None) is not None:
+                self.__compact()
+
+    def start(self) -> None:
+        """
+        Arranca el hilo del planificador.
+        """
+        with self.__cond:
+            if self.__running:
+                return
+            self.__running = True
+            self.__thread = threading.Thread(
+                target=self.__run, name="juicebox-expiry", daemon=True
+            )
+            self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el hilo del planificador. Los vencimientos programados se conservan.
+        """
+        with self.__cond:
+            self.__running = False
+            thread = self.__thread
+            self.__thread = None
+            self.__cond.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def __compact(self) -> None:
+        """
+        Rehace el montículo sin las entradas obsoletas cuando hay demasiadas. Se llama
+        con el candado adquirido.
+        """
+        if len(self.__heap) <= 2 * len(self.__deadlines) + COMPACT_SLACK:
+            return
+        self.__heap = [
+            (deadline, token, name)
+            for name, (deadline, token) in self.__deadlines.items()
+        ]
+        heapq.heapify(self.__heap)
+
+    def __due(self, now: float) -> list[str]:
+        """
+        Saca del montículo los contenedores vencidos (o que vencen dentro de
+        `batch_window`). Se llama con el candado adquirido.
+
+        Args:
+            now (float): Momento actual (epoch).
+
+        Returns:
+            list[str]: Nombres de los contenedores vencidos.
+        """
+        batch: list[str] = []
+        while self.__heap and self.__heap[0][0] <= now + self.batch_window:
+            deadline, token, name = heapq.heappop(self.__heap)
+            if self.__deadlines.get(name) != (deadline, token):
+                continue  # Reprogramado o cancelado
+            del self.__deadlines[name]
+            batch.append(name)
+        return batch
+
+    def __run(self) -> None:
+        """
+        Hilo que espera al siguiente vencimiento y entrega los lotes vencidos.
+        """
+        while True:
+            with self.__cond:
+                if not self.__running:
+                    return
+                now = time.time()
+                batch = self.__due(now)
+                if not batch:
+                    timeout = self.__heap[0][0] - now if self.__heap else None
+                    self.__cond.wait(timeout)
+                    continue
+            try:
+                self.__on_expire(batch)
+            except Exception:
+                pass
@@ -0,0 +1,404 @@
+import threading, time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from docker import DockerClient
+from .containerStateTable import ContainerStateTable, ContainerRecord
+
+
+# Consultas de estadísticas a Docker en curso como máximo
+SAMPLE_WORKERS: int = 4
+
+# Bytes de red (rx + tx) entre dos muestras a partir de los que hay actividad
+NET_ACTIVITY_BYTES: int = 4096
+
+# Fracción de un núcleo de CPU entre dos muestras a partir de la que hay actividad
+CPU_ACTIVITY_RATIO: float = 0.05
+
+
+@dataclass
+class IdleSample:
+    """
+    Última muestra de actividad de un contenedor.
+
+    ## Atributos
+      - **net_bytes (int):** Bytes de red recibidos y enviados (acumulados).
+      - **cpu_usage (int):** Uso de CPU acumulado (nanosegundos).
+      - **sampled_at (float):** Momento de la muestra (monotonic).
+      - **last_active (float):** Última vez que se vio actividad (epoch).
+      - **cpu_rate (float):** Núcleos de CPU usados entre las dos últimas muestras.
+      - **warned (bool):** Si ya se avisó de que se va a reclamar.
+      - **paused (bool):** Si el contenedor está hibernado (pausado).
+    """
+
+    net_bytes: int
+    cpu_usage: int
+    sampled_at: float
+    last_active: float
+    cpu_rate: float = 0.0
+    warned: bool = False
+    paused: bool = False
+
+
+class IdleDetector:
+    """
+    Detector de instancias de Juice Shop inactivas.
+
+    ## Características
+    - Toma muestras de red y CPU de cada instancia entregada con una única consulta
+      de estadísticas a Docker (`stream=False`, sin esperar a la segunda lectura).
+    - Las consultas se limitan a `rate` por segundo y a `SAMPLE_WORKERS` a la vez para
+      no saturar dockerd con cientos de contenedores.
+    - Avisa `grace` segundos antes de reclamar una instancia y entrega en un único lote
+      las que llevan más de `idle_timeout` segundos inactivas.
+    - Antes de reclamarlas, entrega en otro lote las que llevan más de
+      `hibernate_after` segundos inactivas para pausarlas. Las instancias pausadas no
+      se muestrean y su inactividad se reinicia al reanudarse.
+    - Las instancias del pool que aún no se han entregado no se muestrean.
+    """
+
+    def __init__(
+        self,
+        docker_client: DockerClient,
+        state_table: ContainerStateTable,
+        on_warn: Callable[[str, float], None],
+        on_idle: Callable[[list[str]], None],
+        on_hibernate: Callable[[dict[str, float]], None] | None = None,
+        on_error: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Inicializa el detector desactivado y sin arrancar su hilo.
+
+        Args:
+            docker_client (DockerClient): Cliente de Docker.
+            state_table (ContainerStateTable): Tabla de estado de los contenedores.
+            on_warn (Callable[[str, float], None]): Recibe el nombre del contenedor y
+                los segundos que quedan para reclamarlo.
+            on_idle (Callable[[list[str]], None]): Recibe los nombres de los
+                contenedores que se deben reclamar.
+            on_hibernate (Callable[[dict[str, float]], None] | None): Recibe los
+                contenedores que se deben pausar y los núcleos de CPU que usaban.
+            on_error (Callable[[str], None] | None): Recibe el mensaje de los errores
+                de una vuelta de muestreo (p.ej. `Monitor.error`).
+        """
+        self.__docker_client = docker_client
+        self.__state_table = state_table
+        self.__on_warn = on_warn
+        self.__on_idle = on_idle
+        self.__on_hibernate = on_hibernate
+        self.__on_error = on_error
+        # Política (segundos); 0 desactiva la reclamación o la hibernación
+        self.idle_timeout: float = 0.0
+        self.grace: float = 0.0
+        self.hibernate_after: float = 0.0
+        self.interval: float = 60.0
+        self.rate: float = 10.0
+        self.__samples: dict[str, IdleSample] = {}
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__wake = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__listening: bool = False
+        self.__next_slot: float = 0.0
+        # Las versiones antiguas del SDK de Docker no aceptan `one_shot`
+        self.__one_shot: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Si el detector reclama o hiberna instancias inactivas.
+        """
+        return self.idle_timeout > 0 or self.hibernate_after > 0
+
+    def configure(
+        self,
+        idle_timeout: float,
+        grace: float,
+        interval: float,
+        rate: float,
+        hibernate_after: float = 0.0,
+    ) -> None:
+        """
+        Cambia la política del detector.
+
+        Args:
+            idle_timeout (float): Segundos de inactividad para reclamar (0 desactiva).
+            grace (float): Segundos de aviso antes de reclamar.
+            interval (float): Segundos entre dos muestras del mismo contenedor.
+            rate (float): Consultas de estadísticas por segundo como máximo.
+            hibernate_after (float): Segundos de inactividad para pausar (0 desactiva).
+        """
+        self.idle_timeout = max(0.0, idle_timeout)
+        self.grace = min(max(0.0, grace), self.idle_timeout)
+        self.hibernate_after = (
+            max(0.0, hibernate_after) if self.__on_hibernate is not None else 0.0
+        )
+        self.interval = max(1.0, interval)
+        self.rate = max(0.1, rate)
+        self.__wake.set()
+
+    def idle_for(self, name: str) -> float | None:
+        """
+        Obtiene los segundos que lleva inactivo un contenedor.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            float | None: Segundos sin actividad o None si aún no se ha muestreado.
+        """
+        with self.__lock:
+            sample = self.__samples.get(name)
+        return time.time() - sample.last_active if sample is not None else None
+
+    def start(self) -> None:
+        """
+        Arranca el hilo del detector.
+        """
+        if self.__thread is not None:
+            return
+        if not self.__listening:
+            self.__state_table.add_listener(self.__on_state_change)
+            self.__listening = True
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, name="juicebox-idle", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Detiene el hilo del detector.
+        """
+        self.__stop.set()
+        self.__wake.set()
+        thread, self.__thread = self.__thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def __on_state_change(self, name: str, record: ContainerRecord | None) -> None:
+        """
+        Sigue las pausas y reanudaciones de la tabla de estado. Reanudar una instancia
+        cuenta como actividad.
+
+        Args:
+            name (str): Nombre del contenedor.
+            record (ContainerRecord | None): Nuevo estado o None si se eliminó.
+        """
+        if record is None or record.status not in ("running", "paused"):
+            return
+        with self.__lock:
+            sample = self.__samples.get(name)
+            if sample is None:
+                return
+            if record.status == "paused":
+                sample.paused = True
+            elif sample.paused:
+                sample.paused = False
+                sample.last_active = time.time()
+                sample.warned = False
+
+    def __candidates(self) -> list[tuple[str, bool]]:
+        """
+        Obtiene las instancias de Juice Shop en marcha o pausadas que ya se han
+        entregado.
+
+        Returns:
+            list[tuple[str, bool]]: (nombre del contenedor, si está pausado).
+        """
+        names: list[tuple[str, bool]] = []
+        for record in self.__state_table.records():
+            if record.labels.get("program") != "JS" or record.status not in (
+                "running",
+                "paused",
+            ):
+                continue
+            if (
+                record.labels.get("pool") == "warm"
+                and self.__state_table.handed_out_at(record.name) is None
+            ):
+                continue
+            names.append((record.name, record.status == "paused"))
+        return names
+
+    def __throttle(self) -> bool:
+        """
+        Espera al siguiente hueco libre según `rate`.
+
+        Returns:
+            bool: False si se ha detenido el detector mientras esperaba.
+        """
+        now = time.monotonic()
+        self.__next_slot = max(self.__next_slot, now)
+        delay = self.__next_slot - now
+        self.__next_slot += 1.0 / self.rate
+        return not (delay > 0 and self.__stop.wait(delay))
+
+    def __read_stats(self, name: str) -> tuple[int, int] | None:
+        """
+        Lee los contadores de red y CPU de un contenedor.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            tuple[int, int] | None: (bytes de red, uso de CPU) o None si falla.
+        """
+        api = self.__docker_client.api
+        try:
+            if self.__one_shot:
+                try:
+                    stats = api.stats(name, stream=False, one_shot=True)
+                except TypeError:
+                    self.__one_shot = False
+                    stats = api.stats(name, stream=False)
+            else:
+                stats = api.stats(name, stream=False)
+        except Exception:
+            return None
+        networks: dict = stats.get("networks") or {}
+        net_bytes = sum(
+            net.get("rx_bytes", 0) + net.get("tx_bytes", 0) for net in networks.values()
+        )
+        cpu_usage = (
+            (stats.get("cpu_stats") or {}).get("cpu_usage", {}).get("total_usage", 0)
+        )
+        return net_bytes, cpu_usage
+
+    def __update(self, name: str, counters: tuple[int, int]) -> float:
+        """
+        Guarda una muestra y decide si hubo actividad desde la anterior.
+
+        Args:
+            name (str): Nombre del contenedor.
+            counters (tuple[int, int]): (bytes de red, uso de CPU).
+
+        Returns:
+            float: Segundos que lleva inactivo el contenedor.
+        """
+        net_bytes, cpu_usage = counters
+        now, mono = time.time(), time.monotonic()
+        with self.__lock:
+            sample = self.__samples.get(name)
+            if sample is None:
+                # Primera muestra: cuenta como actividad (p.ej. tras reiniciar el motor)
+                self.__samples[name] = IdleSample(net_bytes, cpu_usage, mono, now)
+                return 0.0
+            net_delta = net_bytes - sample.net_bytes
+            cpu_delta = cpu_usage - sample.cpu_usage
+            elapsed = max(mono - sample.sampled_at, 1e-3)
+            active = (
+                # Contadores reiniciados (el contenedor se reinició)
+                net_delta < 0
+                or cpu_delta < 0
+                or net_delta >= NET_ACTIVITY_BYTES
+                or cpu_delta / (elapsed * 1e9) >= CPU_ACTIVITY_RATIO
+            )
+            sample.net_bytes, sample.cpu_usage, sample.sampled_at = (
+                net_bytes,
+                cpu_usage,
+                mono,
+            )
+            sample.cpu_rate = max(cpu_delta, 0) / (elapsed * 1e9)
+            if active:
+                sample.last_active = now
+                sample.warned = False
+            return now - sample.last_active
+
+    def __paused_idle_for(self, name: str) -> float:
+        """
+        Obtiene la inactividad de una instancia pausada sin consultar a Docker.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            float: Segundos que lleva inactivo el contenedor.
+        """
+        now, mono = time.time(), time.monotonic()
+        with self.__lock:
+            sample = self.__samples.get(name)
+            if sample is None:
+                # Pausada antes de arrancar el detector (p.ej. tras reiniciar el motor)
+                sample = IdleSample(0, 0, mono, now, paused=True)
+                self.__samples[name] = sample
+            sample.paused = True
+            return now - sample.last_active
+
+    def __round(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Muestrea una vez todas las instancias entregadas, avisa de las que están a
+        punto de reclamarse y entrega en lotes las que se deben pausar y las que se
+        deben reclamar.
+
+        Args:
+            executor (ThreadPoolExecutor): Executor con `SAMPLE_WORKERS` hilos.
+        """
+        candidates = self.__candidates()
+        with self.__lock:
+            for name in set(self.__samples) - {name for name, _ in candidates}:
+                del self.__samples[name]
+        futures = {}
+        idle_times: dict[str, float] = {}
+        for name, paused in candidates:
+            if paused:
+                # Una instancia pausada no puede tener actividad
+                idle_times[name] = self.__paused_idle_for(name)
+                continue
+            if not self.__throttle():
+                return
+            futures[name] = executor.submit(self.__read_stats, name)
+        for name, future in futures.items():
+            counters = future.result()
+            if counters is None:
+                continue  # Se eliminó o Docker no respondió: se reintenta en la siguiente
+            idle_times[name] = self.__update(name, counters)
+
+        idle: list[str] = []
+        hibernate: dict[str, float] = {}
+        for name, idle_for in idle_times.items():
+            if self.idle_timeout > 0 and idle_for >= self.idle_timeout:
+                idle.append(name)
+                continue
+            with self.__lock:
+                sample = self.__samples[name]
+                if self.idle_timeout > 0 and idle_for >= self.idle_timeout - self.grace:
+                    warn, sample.warned = not sample.warned, True
+                else:
+                    warn = False
+                if (
+                    self.hibernate_after > 0
+                    and idle_for >= self.hibernate_after
+                    and not sample.paused
+                ):
+                    hibernate[name] = sample.cpu_rate
+            if warn:
+                self.__on_warn(name, self.idle_timeout - idle_for)
+        if hibernate:
+            self.__on_hibernate(hibernate)
+        if idle:
+            with self.__lock:
+                for name in idle:
+                    self.__samples.pop(name, None)
+            self.__on_idle(idle)
+
+    def __run(self) -> None:
+        """
+        Hilo que muestrea las instancias cada `interval` segundos.
+        """
+        with ThreadPoolExecutor(
+            max_workers=SAMPLE_WORKERS, thread_name_prefix="juicebox-idle-stats"
+        ) as executor:
+            while not self.__stop.is_set():
+                started = time.monotonic()
+                self.__wake.clear()
+                if self.enabled:
+                    try:
+                        self.__round(executor)
+                    except Exception as e:
+                        if self.__on_error is not None:
+                            self.__on_error(f"Idle detector error: {e}")
+                    delay = self.interval - (time.monotonic() - started)
+                else:
+                    delay = None  # Espera a que se configure
+                self.__wake.wait(delay)
@@ -0,0 +1,271 @@
+import threading, time, uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from .redisManager import RedisManager
+from Models import ManagerResult, RedisPayload, Response, Status
+
+
+class JobState:
+    """
+    Constantes de estado de un trabajo.
+
+    - **PENDING (str):** En cola, esperando recursos.
+    - **RUNNING (str):** En ejecución.
+    - **DONE (str):** Finalizado con éxito.
+    - **FAILED (str):** Finalizado con error.
+    - **CANCELLED (str):** Cancelado por el cliente.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """
+    Excepción que se lanza al reportar progreso de un trabajo cuya cancelación
+    fue solicitada.
+    """
+
+    pass
+
+
+@dataclass
+class Job:
+    """
+    Trabajo de larga duración del motor.
+
+    ## Atributos
+      - **id (str):** Identificador del trabajo.
+      - **prog (str):** Programa destino (RTB | JS).
+      - **command (str):** Comando ejecutado.
+      - **state (str):** Estado del trabajo (JobState).
+      - **progress (int):** Porcentaje de avance (0-100).
+      - **stage (str):** Descripción de la etapa actual.
+      - **result (dict[str, Any], None):** Respuesta final del comando.
+      - **cancel_requested (bool):** Si el cliente solicitó la cancelación.
+      - **created (float):** Momento de creación.
+      - **updated (float):** Momento de la última actualización.
+    """
+
+    id: str
+    prog: str
+    command: str
+    state: str = JobState.PENDING
+    progress: int = 0
+    stage: str = "Queued"
+    result: dict[str, Any] | None = None
+    cancel_requested: bool = False
+    created: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convierte el trabajo a un diccionario.
+
+        Returns:
+            dict[str, Any]: Estructura con el estado del trabajo.
+        """
+        return {
+            "job_id": self.id,
+            "prog": self.prog,
+            "command": self.command,
+            "state": self.state,
+            "progress": self.progress,
+            "stage": self.stage,
+            "result": self.result,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created)),
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.updated)),
+        }
+
+
+class JobManager:
+    """
+    Registro de trabajos de larga duración del motor.
+
+    ## Operaciones
+    - **create:** Registra un trabajo nuevo y devuelve su identificador.
+    - **reporter:** Devuelve la función de progreso que reciben los managers.
+    - **start / finish:** Marcan el inicio y el fin de un trabajo.
+    - **get / cancel:** Consultan o cancelan un trabajo.
+
+    Cada cambio de estado o progreso se publica en el canal ADMIN de Redis.
+    """
+
+    def __init__(self, redis_manager: RedisManager, max_finished: int = 100) -> None:
+        """
+        Inicializa el registro de trabajos.
+
+        Args:
+            redis_manager (RedisManager): Manager de Redis para publicar eventos.
+            max_finished (int): Número de trabajos terminados que se conservan.
+        """
+        self.__redis = redis_manager
+        self.__max_finished = max_finished
+        self.__jobs: OrderedDict[str, Job] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __publish(self, job: Job) -> None:
+        """
+        Publica el estado de un trabajo en el canal ADMIN de Redis.
+        """
+        self.__redis.publish_to_admin(
+            RedisPayload.from_dict(
+                {
+                    "container": "juicebox-engine",
+                    "status": job.state,
+                    "event": "job",
+                    "data": job.to_dict(),
+                }
+            )
+        )
+
+    def __prune(self) -> None:
+        """
+        Elimina los trabajos terminados más antiguos cuando se supera el máximo.
+        """
+        finished = [j.id for j in self.__jobs.values() if j.state in JobState.FINISHED]
+        for job_id in finished[: max(0, len(finished) - self.__max_finished)]:
+            self.__jobs.pop(job_id, None)
+
+    def create(self, prog: str, command: str) -> Job:
+        """
+        Registra un trabajo nuevo en estado PENDING.
+
+        Args:
+            prog (str): Programa destino (RTB | JS).
+            command (str): Comando a ejecutar.
+
+        Returns:
+            Job: Trabajo registrado.
+        """
+        job = Job(id=uuid.uuid4().hex, prog=prog, command=command)
+        with self.__lock:
+            self.__jobs[job.id] = job
+            self.__prune()
+        self.__publish(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Obtiene un trabajo por su identificador.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+
+        Returns:
+            Job | None: Trabajo o None si no existe.
+        """
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """
+        Obtiene todos los trabajos registrados.
+
+        Returns:
+            list[Job]: Trabajos registrados, del más antiguo al más reciente.
+        """
+        with self.__lock:
+            return list(self.__jobs.values())
+
+    def update(self, job: Job, progress: int, stage: str) -> None:
+        """
+        Actualiza el progreso de un trabajo y lo publica.
+
+        Args:
+            job (Job): Trabajo a actualizar.
+            progress (int): Porcentaje de avance (0-100).
+            stage (str): Descripción de la etapa actual.
+
+        Raises:
+            JobCancelled: Si se solicitó la cancelación del trabajo.
+        """
+        if job.cancel_requested:
+            raise JobCancelled(f"Job {job.id} was cancelled")
+        job.progress = max(job.progress, min(100, int(progress)))
+        job.stage = stage
+        job.updated = time.time()
+        self.__publish(job)
+
+    def reporter(self, job: Job) -> Callable[[int, str], None]:
+        """
+        Devuelve la función de progreso para un trabajo.
+
+        Args:
+            job (Job): Trabajo.
+
+        Returns:
+            Callable[[int, str], None]: Función (progreso, etapa).
+        """
+        return lambda progress, stage: self.update(job, progress, stage)
+
+    def start(self, job: Job) -> None:
+        """
+        Marca un trabajo como RUNNING.
+
+        Args:
+            job (Job): Trabajo a iniciar.
+
+        Raises:
+            JobCancelled: Si se canceló antes de iniciar.
+        """
+        if job.cancel_requested:
+            raise JobCancelled(f"Job {job.id} was cancelled")
+        job.state = JobState.RUNNING
+        job.stage = "Running"
+        job.updated = time.time()
+        self.__publish(job)
+
+    def finish(self, job: Job, response: Response) -> None:
+        """
+        Marca un trabajo como terminado y guarda su respuesta.
+
+        Args:
+            job (Job): Trabajo a terminar.
+            response (Response): Respuesta final del comando.
+        """
+        if job.cancel_requested:
+            job.state = JobState.CANCELLED
+            job.stage = "Cancelled"
+        elif response.status == Status.OK:
+            job.state = JobState.DONE
+            job.progress = 100
+            job.stage = "Finished"
+        else:
+            job.state = JobState.FAILED
+            job.stage = "Failed"
+        job.result = response.to_dict()
+        job.updated = time.time()
+        with self.__lock:
+            self.__prune()
+        self.__publish(job)
+
+    def cancel(self, job_id: str) -> ManagerResult:
+        """
+        Solicita la cancelación de un trabajo. La cancelación es cooperativa y surte
+        efecto en el siguiente reporte de progreso.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return ManagerResult.failure(message="Job not found", error=job_id)
+        if job.state in JobState.FINISHED:
+            return ManagerResult.failure(
+                message="Job already finished", error=job.state, data=job.to_dict()
+            )
+        job.cancel_requested = True
+        job.updated = time.time()
+        self.__publish(job)
+        return ManagerResult.ok(message="Job cancellation requested", data=job.to_dict())
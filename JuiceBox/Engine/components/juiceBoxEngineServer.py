@@ -1,11 +1,28 @@
-import os, socket, threading, json, atexit
+import os, io, socket, tarfile, threading, time, json, atexit, asyncio
 from queue import Queue
 from threading import Thread
-from .juiceShopManager import JuiceShopManager
+from concurrent.futures import ThreadPoolExecutor
+from .juiceShopManager import JuiceShopManager, READY_TIMEOUT
 from .rootTheBoxManager import RootTheBoxManager
 from .redisManager import RedisManager
-from ..utils import RTBConfig, JuiceShopConfig
+from ..utils import (
+    RTBConfig,
+    JuiceShopConfig,
+    ConnectionInfo,
+    FrameError,
+    DEFAULT_MAX_FRAME,
+    PROTOCOL_VERSION,
+    is_frame_start,
+    negotiate_max_frame,
+    read_frame,
+    recv_frame,
+    recv_line,
+)
 from .monitor import Monitor
+from .commandScheduler import CommandScheduler, READ_ONLY_COMMANDS
+from .jobManager import JobManager, JobCancelled
+from .containerStateTable import ContainerStateTable
+from .readinessProber import ReadinessProber
 from Models import (
     Response,
     Status,
@@ -34,16 +51,42 @@ COMMANDS = {
         "__CONFIG__",
         "__STATUS__",
         "__START__",
+        "__START_N__",
         "__STOP_CONTAINER__",
+        "__RESUME__",
         "__CONTAINER_STATUS__",
         "__STATUS__",
         "__STOP__",
         "__SET_CONFIG__",
         "__GENERATE_XML__",
+        "__XML_CACHE__",
+        "__REFRESH_COUNTRY_MAPPING__",
         "__PORTS_RANGE__",
     ],
+    "ENGINE": [
+        "__HELLO__",
+        "__JOB_STATUS__",
+        "__JOB_CANCEL__",
+    ],
+}
+
+# Comandos de larga duración que se ejecutan como trabajos y devuelven un job_id
+JOB_COMMANDS: set[tuple[str, str]] = {
+    ("JS", "__GENERATE_XML__"),
+    ("JS", "__START_N__"),
+    ("RTB", "__START__"),
+    ("RTB", "__RESTART__"),
 }
 
+# Modos de servidor soportados
+SERVER_MODES = ("asyncio", "threads")
+
+# Tiempo máximo (segundos) que se espera a que un cliente envíe su mensaje
+CLIENT_TIMEOUT: float = 10.0
+
+# Tiempo máximo de inactividad (segundos) de una conexión persistente (peticiones con `id`)
+CLIENT_IDLE_TIMEOUT: float = 300.0
+
 
 class JuiceBoxEngineServer:
     """
@@ -60,7 +103,7 @@ class JuiceBoxEngineServer:
         redis_manager: RedisManager,
     ) -> None:
         """
-        Inicializa el servidor, elimina cualquier socket viejo y comienza el hilo worker.
+        Inicializa el servidor, elimina cualquier socket viejo y prepara el executor de trabajo.
 
         :param: monitor (Monitor): Monitor
         :param: js_manager (str): Instancia de JuiceShopManager
@@ -68,9 +111,26 @@ class JuiceBoxEngineServer:
         :param: docker_client (DockerClient): Cliente de Docker
         :param: redis_manager (RedisManager): Manager de Redis
         """
+        __env: dict[str, str | None] = dotenv_values()
         # Obtiene la ruta del socket
         self.socket_path: str = (
-            dotenv_values().get("JUICEBOX_SOCKET") or "/opt/juicebox/run/engine.sock"
+            __env.get("JUICEBOX_SOCKET") or "/opt/juicebox/run/engine.sock"
+        )
+        # Modo del servidor (asyncio | threads)
+        self.server_mode: str = (__env.get("JUICEBOX_SERVER_MODE") or "asyncio").lower()
+        if self.server_mode not in SERVER_MODES:
+            self.server_mode = "asyncio"
+        # Número máximo de hilos para el trabajo bloqueante de Docker
+        self.max_workers: int = int(__env.get("JUICEBOX_MAX_WORKERS") or 8)
+        # Número de hilos reservados para los comandos de solo lectura
+        self.read_workers: int = max(1, int(__env.get("JUICEBOX_READ_WORKERS") or 2))
+        # Tamaño máximo (bytes) de un mensaje del protocolo
+        self.max_frame: int = int(__env.get("JUICEBOX_MAX_FRAME") or DEFAULT_MAX_FRAME)
+        # Modo persistente: los contenedores sobreviven a los reinicios del motor
+        self.persistent: bool = (__env.get("JUICEBOX_PERSISTENT") or "").lower() in (
+            "1",
+            "true",
+            "yes",
         )
         # Obtiene la carpeta que contiene el socket
         socket_dir = os.path.dirname(self.socket_path)
@@ -96,11 +156,34 @@ class JuiceBoxEngineServer:
         self.rtb_manager: RootTheBoxManager = rtb_manager
         self.js_manager: JuiceShopManager = js_manager
         self.redis_manager: RedisManager = redis_manager
+        # Tabla de estado de los contenedores compartida por las instancias del manager
+        self.state_table: ContainerStateTable | None = getattr(
+            js_manager, "state_table", None
+        )
+        # Comprobador HTTP compartido por las instancias del manager
+        self.prober: ReadinessProber | None = getattr(js_manager, "prober", None)
         self.__manager_lock = threading.Lock()
 
-        # Cola para recibir y procesar comandos de los clientes
+        # Registro de trabajos de larga duración
+        self.job_manager: JobManager = JobManager(redis_manager)
+
+        # Cola para recibir y procesar comandos de los clientes (modo threads)
         self.command_queue = Queue()
-        Thread(target=self.__worker, daemon=True).start()
+
+        # Executor acotado para el trabajo bloqueante de Docker (modo asyncio)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="juicebox-worker"
+        )
+        # Executor propio de los comandos de solo lectura, para que no esperen detrás
+        # de trabajos o comandos que modifican recursos cuando el anterior está lleno
+        self.__read_executor = ThreadPoolExecutor(
+            max_workers=self.read_workers, thread_name_prefix="juicebox-reader"
+        )
+        # Planificador con candados por recurso y límites por comando (modo asyncio)
+        self.__scheduler = CommandScheduler(CommandScheduler.parse_limits(__env))
+        self.__job_tasks: set[asyncio.Task] = set()
+        # Loop del servidor asyncio (para enviarle trabajo desde otros hilos)
+        self.__loop: asyncio.AbstractEventLoop | None = None
 
         # Limpieza al cierre del socket
         self._cleaned_up = False
@@ -112,8 +195,11 @@ class JuiceBoxEngineServer:
         """
         while True:
             try:
-                conn, raw_data = self.command_queue.get()
-                self.__process_request(conn, raw_data)
+                conn, raw_data, job, info = self.command_queue.get()
+                if job is not None:
+                    self.__run_job(job, raw_data)
+                else:
+                    self.__process_request(conn, raw_data, info)
             except Exception as e:
                 self.monitor.error(f"Worker failed: {e}")
             finally:
@@ -127,7 +213,15 @@ class JuiceBoxEngineServer:
             conn: Socket del cliente
         """
         try:
-            data = conn.recv(1024).decode().strip()
+            # El primer byte indica si el cliente usa tramas o JSON por líneas
+            first = conn.recv(1)
+            info = ConnectionInfo(framed=is_frame_start(first), max_frame=self.max_frame)
+            raw = (
+                recv_frame(conn, info.max_frame, prefix=first)
+                if info.framed
+                else recv_line(conn, info.max_frame, prefix=first)
+            )
+            data = raw.decode("utf-8", errors="replace").strip()
             if not data:
                 self.monitor.warning("Empty message received from client, ignoring.")
                 conn.close()
@@ -135,28 +229,66 @@ class JuiceBoxEngineServer:
 
             self.monitor.info(f"Data received: {data}")
             self.monitor.command_received(conn, data, conn.getpeername())
-            self.command_queue.put((conn, data))
+            prog, command, _, request_id = self.__peek_command(data)
+            if (prog, command) in JOB_COMMANDS:
+                # Se responde con el job_id y el trabajo se encola
+                job = self.job_manager.create(prog, command)
+                conn.sendall(self.__encode(info, self.__job_accepted(job.id, request_id)))
+                conn.close()
+                self.command_queue.put((None, data, job, info))
+                return
+            if prog == "ENGINE":
+                # Las consultas de trabajos no esperan en la cola detrás de los trabajos
+                self.__process_request(conn, data, info)
+                return
+            self.command_queue.put((conn, data, None, info))
         except socket.timeout:
             self.monitor.warning("Timeout: client couldn't send data.")
             conn.close()
+        except FrameError as e:
+            self.monitor.warning(f"Invalid message received from client: {e}")
+            try:
+                conn.sendall(self.__encode(info, Response.error(message=str(e)).to_json()))
+            except OSError:
+                pass
+            conn.close()
+        except ConnectionError as e:
+            self.monitor.warning(f"Client disconnected in the middle of a message: {e}")
+            conn.close()
         except Exception as e:
             self.monitor.client_error(e)
             conn.close()
 
-    def __process_request(self, conn, data) -> None:
+    def __execute_request(self, data: str, peer: str) -> str:
         """
-        Procesa un mensaje recibido, lo despacha y envía la respuesta.
+        Despacha un mensaje recibido y devuelve la respuesta serializada.
 
         Args:
-            conn: Conexión del cliente.
-            data: Cadena JSON con el comando.
+            data (str): Cadena JSON con el comando.
+            peer (str): Dirección del cliente.
+
+        Returns:
+            str: Respuesta serializada en formato JSON.
+        """
+        return self.__reply(data, self.__dispatch_request(data, peer))
+
+    def __dispatch_request(self, data: str, peer: str) -> Response:
+        """
+        Despacha un mensaje recibido y registra su resultado.
+
+        Args:
+            data (str): Cadena JSON con el comando.
+            peer (str): Dirección del cliente.
+
+        Returns:
+            Response: Respuesta del comando.
         """
         try:
             # Se parsea para obtener prog y command y loggearlos
             payload = json.loads(data)
             prog = payload.get("prog", "UNKNOWN")
             command = payload.get("command", "UNKNOWN")
-            self.monitor.command_received(prog, command, conn.getpeername())
+            self.monitor.command_received(prog, command, peer)
 
             response = self.dispatch_command(data)
             if response.status != Status.OK:
@@ -167,41 +299,436 @@ class JuiceBoxEngineServer:
                 self.monitor.info(
                     f"Command {command} for program {prog} processed successfully."
                 )
-            response = response.to_json()
-            conn.sendall(response.encode())
-            self.monitor.info(
-                f"Response sent to command: {command}. Response data: {response}"
+            return response
+        except Exception as e:
+            self.monitor.error(f"Error when processing request: {e}")
+            return Response.error(str(e))
+
+    def __reply(self, data: str, response: Response) -> str:
+        """
+        Serializa la respuesta de un mensaje con su `id` y la registra.
+
+        Args:
+            data (str): Cadena JSON con el comando.
+            response (Response): Respuesta del comando.
+
+        Returns:
+            str: Respuesta serializada en formato JSON.
+        """
+        _, command, _, request_id = self.__peek_command(data)
+        serialized: str = self.__serialize(response, request_id)
+        self.monitor.info(
+            f"Response sent to command: {command}. Response data: {serialized}"
+        )
+        return serialized
+
+    def __encode(self, info: ConnectionInfo, response: str) -> bytes:
+        """
+        Codifica una respuesta según el protocolo de la conexión. Las respuestas
+        enmarcadas que superan el tamaño negociado se sustituyen por un error.
+
+        Args:
+            info (ConnectionInfo): Protocolo de la conexión.
+            response (str): Respuesta serializada en formato JSON.
+
+        Returns:
+            bytes: Respuesta lista para enviar.
+        """
+        if not info.framed:
+            # Protocolo antiguo: el modo threads no termina la respuesta en salto de línea
+            return response.encode()
+        if len(response.encode()) > info.max_frame:
+            self.monitor.warning(
+                f"Response of {len(response.encode())} bytes exceeds the negotiated maximum"
             )
+            response = self.__serialize(
+                Response.error(
+                    message=f"Response exceeds the maximum frame size of {info.max_frame} bytes"
+                ),
+                self.__peek_command(response)[3],
+            )
+        return info.encode(response)
+
+    def __serialize(self, response: Response, request_id: str | int | None) -> str:
+        """
+        Serializa una respuesta añadiendo el `id` de la petición si el cliente lo envió.
+
+        Args:
+            response (Response): Respuesta del comando.
+            request_id (str | int | None): Identificador de la petición.
+
+        Returns:
+            str: Respuesta serializada en formato JSON.
+        """
+        if request_id is None:
+            return response.to_json()
+        return json.dumps({"id": request_id, **response.to_dict()})
+
+    def __process_request(self, conn, data, info: ConnectionInfo) -> None:
+        """
+        Procesa un mensaje recibido, lo despacha y envía la respuesta.
+
+        Args:
+            conn: Conexión del cliente.
+            data: Cadena JSON con el comando.
+            info (ConnectionInfo): Protocolo de la conexión.
+        """
+        try:
+            response = self.__execute_request(data, conn.getpeername())
+            conn.sendall(self.__encode(info, response))
         except (BrokenPipeError, ConnectionResetError) as e:
             self.monitor.warning(f"Client disconnected before get answer: {e}")
         except Exception as e:
             self.monitor.error(f"Error when processing request: {e}")
-            error_json = Response.error(str(e)).to_json()
+        finally:
+            conn.close()
+
+    def __job_accepted(
+        self, job_id: str, request_id: str | int | None = None
+    ) -> str:
+        """
+        Respuesta serializada que se envía al aceptar un trabajo.
+
+        Args:
+            job_id (str): Identificador del trabajo.
+            request_id (str | int | None): Identificador de la petición.
+
+        Returns:
+            str: Respuesta serializada en formato JSON.
+        """
+        return self.__serialize(
+            Response.ok(
+                message="Job accepted", data={"job_id": job_id, "state": "pending"}
+            ),
+            request_id,
+        )
+
+    def __run_job(self, job, data: str) -> None:
+        """
+        Ejecuta un trabajo de larga duración y guarda su resultado.
+
+        Args:
+            job (Job): Trabajo registrado.
+            data (str): Cadena JSON con el comando.
+        """
+        try:
+            self.job_manager.start(job)
+            response = self.dispatch_command(
+                data, progress=self.job_manager.reporter(job)
+            )
+        except JobCancelled as e:
+            response = Response.error(message=str(e))
+        except Exception as e:
+            response = Response.error(message=str(e))
+        self.job_manager.finish(job, response)
+        self.monitor.info(
+            f"Job {job.id} ({job.prog} {job.command}) finished -> {job.state}"
+        )
+
+    async def __run_job_async(self, job, data: str) -> None:
+        """
+        Reserva los recursos de un trabajo y lo ejecuta en el executor acotado.
+
+        Args:
+            job (Job): Trabajo registrado.
+            data (str): Cadena JSON con el comando.
+        """
+        loop = asyncio.get_running_loop()
+        prog, command, args, _ = self.__peek_command(data)
+        try:
+            async with self.__scheduler.reserve(prog, command, args):
+                await loop.run_in_executor(self.__executor, self.__run_job, job, data)
+        except Exception as e:
+            self.monitor.error(f"Job {job.id} failed: {e}")
+
+    def __peek_command(
+        self, data: str
+    ) -> tuple[str, str, dict[str, Any], str | int | None]:
+        """
+        Obtiene el programa, el comando, los argumentos y el `id` de un mensaje sin
+        validarlo.
+
+        Args:
+            data (str): Cadena JSON con el comando.
+
+        Returns:
+            tuple[str, str, dict[str, Any], str | int | None]: Programa, comando,
+                argumentos e identificador de la petición.
+        """
+        try:
+            payload = json.loads(data)
+            args = payload.get("args") or {}
+            request_id = payload.get("id")
+            return (
+                str(payload.get("prog", "")),
+                str(payload.get("command", "")),
+                args if isinstance(args, dict) else {},
+                request_id if isinstance(request_id, (str, int)) else None,
+            )
+        except (json.JSONDecodeError, AttributeError):
+            return ("", "", {}, None)
+
+    async def __handle_stream(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Atiende una conexión en modo asyncio.
+
+        El primer byte indica el protocolo: tramas con cabecera de longitud (`JB`) o el
+        protocolo antiguo de JSON delimitado por saltos de línea (`{`).
+
+        Las peticiones sin `id` se atienden en orden, una tras otra. Las peticiones con
+        `id` se atienden en paralelo y su respuesta, que lleva el mismo `id`, se escribe
+        en cuanto termina, por lo que un mismo cliente puede tener varias peticiones en
+        curso sobre una única conexión persistente.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de lectura del cliente.
+            writer (asyncio.StreamWriter): Flujo de escritura del cliente.
+        """
+        peer = writer.get_extra_info("peername") or ""
+        write_lock = asyncio.Lock()
+        in_flight: set[asyncio.Task] = set()
+        timeout: float = CLIENT_TIMEOUT
+        info = ConnectionInfo(max_frame=self.max_frame)
+        try:
             try:
-                conn.sendall(error_json.encode())
+                first = await asyncio.wait_for(reader.read(1), timeout=CLIENT_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.monitor.warning("Timeout: client couldn't send data.")
+                return
+            info.framed = is_frame_start(first)
+            while True:
+                try:
+                    # Sin límite de espera mientras haya peticiones en curso
+                    raw = await asyncio.wait_for(
+                        self.__read_message(reader, info, first),
+                        timeout=None if in_flight else timeout,
+                    )
+                except asyncio.TimeoutError:
+                    if timeout == CLIENT_TIMEOUT:
+                        self.monitor.warning("Timeout: client couldn't send data.")
+                    break
+                first = b""
+                if not raw:
+                    break  # El cliente cerró la conexión
+
+                data = raw.decode("utf-8", errors="replace").strip()
+                if not data:
+                    self.monitor.warning("Empty message received from client, ignoring.")
+                    continue
+                self.monitor.info(f"Data received: {data}")
+
+                prog, command, args, request_id = self.__peek_command(data)
+                if (prog, command) == ("ENGINE", "__HELLO__"):
+                    # La negociación se atiende en orden antes que el resto de peticiones
+                    await self.__handle_line(data, peer, writer, write_lock, info)
+                    info.max_frame = negotiate_max_frame(
+                        args.get("max_frame"), self.max_frame
+                    )
+                    continue
+                if request_id is None:
+                    await self.__handle_line(data, peer, writer, write_lock, info)
+                    continue
+                # Conexión persistente: se atiende en paralelo y se amplía la inactividad
+                timeout = CLIENT_IDLE_TIMEOUT
+                task = asyncio.create_task(
+                    self.__handle_line(data, peer, writer, write_lock, info)
+                )
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+        except FrameError as e:
+            self.monitor.warning(f"Invalid message received from client: {e}")
+            await self.__write(
+                writer,
+                write_lock,
+                info.encode(Response.error(message=str(e)).to_json()),
+            )
+        except asyncio.IncompleteReadError:
+            self.monitor.warning("Client disconnected in the middle of a message.")
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self.monitor.warning(f"Client disconnected before get answer: {e}")
+        except Exception as e:
+            self.monitor.client_error(e)
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            writer.close()
+            try:
+                await writer.wait_closed()
             except Exception:
                 pass
-        finally:
-            conn.close()
 
-    def __rtb_start(self, manager: RootTheBoxManager) -> Response:
+    async def __read_message(
+        self, reader: asyncio.StreamReader, info: ConnectionInfo, prefix: bytes
+    ) -> bytes:
+        """
+        Lee el siguiente mensaje de una conexión asyncio según su protocolo.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo de lectura del cliente.
+            info (ConnectionInfo): Protocolo de la conexión.
+            prefix (bytes): Bytes ya leídos del mensaje.
+
+        Returns:
+            bytes: Mensaje recibido, o vacío si el cliente cerró la conexión.
+
+        Raises:
+            FrameError: Si el mensaje no es válido o supera el máximo.
+        """
+        if info.framed:
+            return await read_frame(reader, info.max_frame, prefix=prefix) or b""
+        try:
+            line = await reader.readline()
+        except ValueError as e:
+            # El StreamReader lanza ValueError si la línea supera su límite
+            raise FrameError(f"Message exceeds the maximum of {info.max_frame} bytes") from e
+        if not line and not prefix:
+            return b""
+        return prefix + line
+
+    async def __write(
+        self, writer: asyncio.StreamWriter, write_lock: asyncio.Lock, payload: bytes
+    ) -> None:
+        """
+        Escribe un mensaje completo en una conexión asyncio sin mezclarlo con otros.
+
+        Args:
+            writer (asyncio.StreamWriter): Flujo de escritura del cliente.
+            write_lock (asyncio.Lock): Candado que evita mezclar respuestas en el flujo.
+            payload (bytes): Mensaje codificado.
+        """
+        try:
+            async with write_lock:
+                writer.write(payload)
+                await writer.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self.monitor.warning(f"Client disconnected before get answer: {e}")
+
+    async def __handle_line(
+        self,
+        data: str,
+        peer: str,
+        writer: asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+        info: ConnectionInfo,
+    ) -> None:
+        """
+        Atiende una petición de una conexión asyncio. Reserva los recursos del comando
+        en el planificador, lo despacha en el executor acotado y escribe su respuesta.
+
+        Args:
+            data (str): Cadena JSON con el comando.
+            peer (str): Dirección del cliente.
+            writer (asyncio.StreamWriter): Flujo de escritura del cliente.
+            write_lock (asyncio.Lock): Candado que evita mezclar respuestas en el flujo.
+            info (ConnectionInfo): Protocolo de la conexión.
+        """
+        loop = asyncio.get_running_loop()
+        prog, command, args, request_id = self.__peek_command(data)
+        if (prog, command) in JOB_COMMANDS:
+            # Se responde con el job_id y el trabajo continúa en segundo plano
+            job = self.job_manager.create(prog, command)
+            task = asyncio.create_task(self.__run_job_async(job, data))
+            self.__job_tasks.add(task)
+            task.add_done_callback(self.__job_tasks.discard)
+            response: str = self.__job_accepted(job.id, request_id)
+        elif (prog, command) == ("JS", "__START__") and args.get("wait_ready"):
+            response = await self.__js_start_async(data, peer, args)
+        else:
+            executor = (
+                self.__read_executor
+                if (prog, command) in READ_ONLY_COMMANDS
+                else self.__executor
+            )
+            # Se reservan los recursos del comando antes de ocupar un hilo
+            async with self.__scheduler.reserve(prog, command, args):
+                response = await loop.run_in_executor(
+                    executor, self.__execute_request, data, peer
+                )
+        payload = self.__encode(info, response)
+        await self.__write(writer, write_lock, payload if info.framed else payload + b"\n")
+
+    async def __js_start_async(
+        self, data: str, peer: str, args: dict[str, Any]
+    ) -> str:
+        """
+        Atiende un `__START__` con `wait_ready` (modo asyncio). El contenedor se crea en
+        el executor y, con el hilo y el cupo de `__START__` ya libres, se espera en el
+        event loop a que responda por HTTP.
+
+        Args:
+            data (str): Cadena JSON con el comando.
+            peer (str): Dirección del cliente.
+            args (dict[str, Any]): Argumentos del comando.
+
+        Returns:
+            str: Respuesta serializada en formato JSON.
+        """
+        loop = asyncio.get_running_loop()
+        payload: dict = json.loads(data)
+        payload["args"] = {**args, "wait_ready": False}
+        async with self.__scheduler.reserve("JS", "__START__", args):
+            response: Response = await loop.run_in_executor(
+                self.__executor, self.__dispatch_request, json.dumps(payload), peer
+            )
+        return self.__reply(data, await self.__js_await_ready(response))
+
+    async def __js_await_ready(self, response: Response) -> Response:
+        """
+        Espera a que el contenedor de una respuesta de `__START__` responda por HTTP.
+
+        Args:
+            response (Response): Respuesta del arranque.
+
+        Returns:
+            Response: La misma respuesta con `ready` a True, o un error si el
+            contenedor no responde a tiempo (el contenedor sigue arrancando).
+        """
+        __data: dict = response.data or {}
+        __name: str | None = __data.get("container")
+        if response.status != Status.OK or not __name:
+            return response
+        with self.__manager_lock:
+            __manager = self.js_manager
+        if await __manager.wait_ready_async(__name, READY_TIMEOUT):
+            return Response.ok(message=response.message, data={**__data, "ready": True})
+        self.monitor.error(
+            message=f"Juice Shop container is not serving HTTP after {READY_TIMEOUT} seconds -> {__name}"
+        )
+        return Response.error(
+            message="Error when trying to start Juice Shop container.",
+            data={**__data, "ready": False},
+        )
+
+    def __rtb_start(
+        self,
+        manager: RootTheBoxManager,
+        progress: Callable[[int, str], None] | None = None,
+    ) -> Response:
         """
         Inicia los contenedores gestionados por Root The Box.
 
         Args:
             manager (RootTheBoxManager): Instancia del manejador de Root The Box
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso.
 
         Returns:
             Response: Respuesta de la operación
         """
+        __report = progress or (lambda *_: None)
         self.__init_manager(manager)  # Se asegura de que la config esté cargada
-        __res: ManagerResult = manager.start()
+        __report(10, "Starting Root The Box containers")
+        __xml: bytes | None = self.js_manager.missions_xml()
+        __res: ManagerResult = manager.start(
+            snapshot_key=manager.missions_key(__xml) if __xml is not None else None
+        )
         __message: str = __res.message
         if __res.success:
             self.monitor.info(
                 message=f"Root The Box Manager containers have been started -> {__res.data}"
             )
-            load_result = self.__load_rtb_missions()
+            load_result = self.__seed_rtb_missions(manager, __res, __xml, progress)
             if not load_result.success:
                 self.monitor.warning(f"Could not load missions: {load_result.error}")
             return Response.ok(__message)
@@ -214,17 +741,21 @@ class JuiceBoxEngineServer:
             message="Error when trying to start Root The Box Manager containers."
         )
 
-    def __rtb_restart(self) -> Response:
+    def __rtb_restart(
+        self, progress: Callable[[int, str], None] | None = None
+    ) -> Response:
         """
         Reinicia la instancia del manager de Root The Box.
 
         Args:
-            manager (RootTheBoxManager): Instancia del manejador de Root The Box
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso.
 
         Returns:
             Response: Respuesta de la operación
         """
+        __report = progress or (lambda *_: None)
         try:
+            __report(5, "Stopping Root The Box containers")
             self.rtb_manager.cleanup()
             # Crea una nueva instancia y carga la configuración
             new_manager: RootTheBoxManager = RootTheBoxManager(
@@ -240,10 +771,18 @@ class JuiceBoxEngineServer:
                 return Response.error(
                     message=f"Error restarting Root The Box Manager: {__res.error}"
                 )
-            __res = new_manager.start()
+            __report(10, "Starting Root The Box containers")
+            __xml: bytes | None = self.js_manager.missions_xml()
+            __res = new_manager.start(
+                snapshot_key=(
+                    new_manager.missions_key(__xml) if __xml is not None else None
+                )
+            )
             if __res.success:
                 self.monitor.info(f"RTB restarted -> {__res.data}")
-                load_result = self.__load_rtb_missions()
+                load_result = self.__seed_rtb_missions(
+                    new_manager, __res, __xml, progress
+                )
                 if not load_result.success:
                     self.monitor.warning(
                         f"Could not load missions after restart: {load_result.error}"
@@ -421,14 +960,45 @@ class JuiceBoxEngineServer:
         except Exception as e:
             return ManagerResult.failure("Error clearing RTB DB files", error=str(e))
 
-    def __load_rtb_missions(self) -> ManagerResult:
+    @staticmethod
+    def __tar_file(name: str, content: bytes) -> bytes:
+        """
+        Empaqueta un archivo en memoria en un tar para `put_archive`.
+
+        Args:
+            name (str): Nombre del archivo dentro del tar.
+            content (bytes): Contenido del archivo.
+
+        Returns:
+            bytes: Archivo tar.
+        """
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(content))
+        return buffer.getvalue()
+
+    def __load_rtb_missions(
+        self,
+        progress: Callable[[int, str], None] | None = None,
+        xml: bytes | None = None,
+    ) -> ManagerResult:
         """
         Ejecuta rootthebox.py dentro del contenedor para cargar misiones desde el XML generado por JuiceShop.
+        El XML se copia desde memoria al contenedor con `put_archive`.
+
+        Args:
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso.
+            xml (bytes | None): Contenido de missions.xml. Si no se indica, se usa el
+                último generado.
         """
+        __report = progress or (lambda *_: None)
         container_name: str = self.rtb_manager.get_containers()[0]
-        missions_path: str = (
-            "/opt/rtb/missions/missions.xml"  # Ruta con las misiones dentro del contenedor de RTB
-        )
+        missions_dir: str = "/tmp"  # Directorio de las misiones dentro del contenedor de RTB
+        missions_path: str = f"{missions_dir}/missions.xml"
 
         try:
             if self.docker_client is not None:
@@ -442,6 +1012,7 @@ class JuiceBoxEngineServer:
                 )
 
             # Se limpia RTB:
+            __report(40, "Clearing Root The Box database files")
             __res = self.__clear_rtb_db_files()
 
             # Si hay un error durante el borrado:
@@ -449,6 +1020,7 @@ class JuiceBoxEngineServer:
                 return __res
 
             # Se resetea RTB
+            __report(55, "Resetting Root The Box database")
             cmd = ["python3", "/opt/rtb/rootthebox.py", "--reset-delete"]
             exec_result = container.exec_run(cmd, stdout=True, stderr=True)
             exit_code = exec_result.exit_code
@@ -467,7 +1039,25 @@ class JuiceBoxEngineServer:
                     "Failed to create rootthebox.cfg file", error=res.error
                 )
 
+            # Se copian las misiones al contenedor
+            __report(70, "Copying missions into Root The Box")
+            if xml is None:
+                xml = self.js_manager.missions_xml()
+            if xml is None:
+                self.monitor.error("Failed to load RTB missions -> missions.xml not found")
+                return ManagerResult.failure(
+                    "Failed to load missions", error="missions.xml not found"
+                )
+            if not container.put_archive(
+                missions_dir, self.__tar_file(os.path.basename(missions_path), xml)
+            ):
+                self.monitor.error("Failed to copy missions.xml into RTB container")
+                return ManagerResult.failure(
+                    "Failed to load missions", error="missions.xml couldn't be copied"
+                )
+
             # Se cargan las misiones
+            __report(75, "Importing missions")
             cmd = ["python3", "/opt/rtb/rootthebox.py", f"--xml={missions_path}"]
             exec_result = container.exec_run(cmd, stdout=True, stderr=True)
             exit_code = exec_result.exit_code
@@ -484,17 +1074,54 @@ class JuiceBoxEngineServer:
                 "Error executing command inside RTB container", error=str(e)
             )
 
-    def __js_start_container(self, manager: JuiceShopManager) -> Response:
+    def __seed_rtb_missions(
+        self,
+        manager: RootTheBoxManager,
+        started: ManagerResult,
+        xml: bytes | None,
+        progress: Callable[[int, str], None] | None = None,
+    ) -> ManagerResult:
+        """
+        Deja Root The Box con las misiones cargadas tras arrancarlo. Si el arranque ha
+        usado la copia de la base de datos sembrada no hace nada; si no, importa las
+        misiones y guarda la copia para los siguientes arranques.
+
+        Args:
+            manager (RootTheBoxManager): Instancia del manejador de Root The Box.
+            started (ManagerResult): Resultado de `manager.start`.
+            xml (bytes | None): Contenido de missions.xml.
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        if (started.data or {}).get("snapshot"):
+            self.monitor.info("RTB missions restored from DB snapshot")
+            return ManagerResult.ok("Missions restored from DB snapshot")
+        __res: ManagerResult = self.__load_rtb_missions(progress, xml=xml)
+        if __res.success and xml is not None:
+            __snapshot = manager.save_db_snapshot(manager.missions_key(xml))
+            if not __snapshot.success:
+                self.monitor.warning(
+                    f"Could not save RTB DB snapshot: {__snapshot.error}"
+                )
+        return __res
+
+    def __js_start_container(
+        self, manager: JuiceShopManager, args: dict[str, Any]
+    ) -> Response:
         """
         Inicia un nuevo contenedor de Juice Shop.
 
         Args:
             manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (dict[str, Any]): `wait_ready` (opcional, responde cuando el contenedor
+                ya atiende peticiones HTTP)
 
         Returns:
             Response: Respuesta de la operación
         """
-        __res: ManagerResult = manager.start()
+        __res: ManagerResult = manager.start(wait_ready=bool(args.get("wait_ready")))
         if __res.success:
             self.monitor.info(message=f"Juice Shop container started -> {__res.data}")
             return Response.ok(message=__res.message, data=__res.data or {})
@@ -506,6 +1133,29 @@ class JuiceBoxEngineServer:
             data=__res.data or {},
         )
 
+    def __on_js_ready(self, container: str, port: int, elapsed: float) -> None:
+        """
+        Publica en Redis que un contenedor de Juice Shop ya responde por HTTP.
+
+        Args:
+            container (str): Nombre del contenedor
+            port (int): Puerto publicado en el host
+            elapsed (float): Segundos que tardó en responder desde que se empezó a comprobar
+        """
+        self.monitor.info(
+            message=f"Juice Shop container is serving HTTP -> {container} ({elapsed:.1f}s)"
+        )
+        __payload: RedisPayload = RedisPayload.from_dict(
+            {
+                "container": container,
+                "status": "ready",
+                "event": "ready",
+                "data": {"port": port, "elapsed": round(elapsed, 2)},
+            }
+        )
+        self.redis_manager.publish_to_admin(__payload)
+        self.redis_manager.publish_to_client(__payload)
+
     def __js_restart(self) -> Response:
         """
         Reinicia la instancia del manager de la Juice Shop.
@@ -519,12 +1169,16 @@ class JuiceBoxEngineServer:
                 self.monitor.info(f"Juice Shop Manager cleaned up -> {result.data}")
                 # Crea una nueva instancia y carga la configuración
                 new_manager: JuiceShopManager = JuiceShopManager(
-                    JuiceShopConfig(), docker_client=self.docker_client
+                    JuiceShopConfig(),
+                    docker_client=self.docker_client,
+                    state_table=self.state_table,
+                    prober=self.prober,
                 )
                 __res: ManagerResult = self.__init_manager(
                     new_manager
                 )  # Se asegura de que la configuración esté cargada
                 if __res.success:
+                    new_manager.refill_pool()
                     return Response.ok("OWASP Juice Shop Manager restarted")
             else:
                 self.monitor.error(
@@ -537,9 +1191,13 @@ class JuiceBoxEngineServer:
 
         # Crea una nueva instancia y carga la configuración
         new_manager = JuiceShopManager(
-            JuiceShopConfig(), docker_client=self.docker_client
+            JuiceShopConfig(),
+            docker_client=self.docker_client,
+            state_table=self.state_table,
+            prober=self.prober,
         )
         self.__init_manager(new_manager)  # Se asegura de que la config esté cargada
+        new_manager.refill_pool()
         return Response.ok("Juice Shop Manager restarted")
 
     def __js_set_config(self, manager: JuiceShopManager, config: Any) -> Response:
@@ -577,6 +1235,64 @@ class JuiceBoxEngineServer:
         )
         return Response.error(message=__resp.error or __resp.message, data={})
 
+    def __js_start_n(
+        self,
+        manager: JuiceShopManager,
+        args: dict[str, Any],
+        progress: Callable[[int, str], None] | None = None,
+    ) -> Response:
+        """
+        Inicia n contenedores de Juice Shop en paralelo.
+
+        Args:
+            manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (dict[str, Any]): `n` (número de contenedores) y `stream` (opcional,
+                publica en Redis el resultado de cada contenedor en cuanto termina)
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso
+
+        Returns:
+            Response: Respuesta de la operación
+        """
+        __report = progress or (lambda *_: None)
+        n = args.get("n")
+        if not isinstance(n, int) or isinstance(n, bool) or n < 1:
+            return Response.error("'n' must be a positive integer")
+        stream: bool = bool(args.get("stream", False))
+        finished: list[int] = [0]
+        lock = threading.Lock()
+
+        def __on_started(result: ManagerResult) -> None:
+            with lock:
+                finished[0] += 1
+                done = finished[0]
+            if stream:
+                __data: dict = result.data or {}
+                self.redis_manager.publish_to_admin(
+                    RedisPayload.from_dict(
+                        {
+                            "container": __data.get("container") or "",
+                            "status": __data.get("status") or "error",
+                            "event": "start_n",
+                            "data": result.to_dict(),
+                        }
+                    )
+                )
+            try:
+                __report((100 * done) // n, f"Started {done}/{n} containers")
+            except JobCancelled:
+                # Los contenedores ya lanzados terminan igualmente de crearse
+                pass
+
+        __report(0, f"Starting {n} Juice Shop containers")
+        __res: ManagerResult = manager.start_n(n, on_started=__on_started)
+        if __res.success:
+            self.monitor.info(message=f"Juice Shop containers started -> {__res.data}")
+            return Response.ok(message=__res.message, data=__res.data or {})
+        self.monitor.error(
+            message=f"Juice Shop containers couldn't be started -> {__res.error}"
+        )
+        return Response.error(message=__res.message, data=__res.data or {})
+
     def __js_stop_container(self, manager: JuiceShopManager, args: Any) -> Response:
         """
         Detiene un contenedor específico de Juice Shop.
@@ -607,6 +1323,154 @@ class JuiceBoxEngineServer:
                 data=__res.data or {},
             )
 
+    def __expire_js_containers(self, names: list[str]) -> ManagerResult:
+        """
+        Detiene los contenedores de Juice Shop vencidos. Lo llama el monitor desde su
+        hilo, sin conectarse al socket del motor. En modo asyncio se reservan los
+        puertos en el planificador de comandos y el trabajo se hace en el executor
+        acotado; en modo threads (o antes de arrancar el loop) se hace en el propio hilo.
+
+        Args:
+            names (list[str]): Nombres de los contenedores vencidos.
+
+        Returns:
+            ManagerResult: Resultado del manager (`data.containers` por contenedor).
+        """
+        loop = self.__loop
+        if loop is not None and loop.is_running():
+            return asyncio.run_coroutine_threadsafe(
+                self.__expire_js_async(names), loop
+            ).result()
+        return self.__js_expire(names)
+
+    async def __expire_js_async(self, names: list[str]) -> ManagerResult:
+        """
+        Expira un lote de contenedores respetando los candados de sus puertos.
+
+        Args:
+            names (list[str]): Nombres de los contenedores vencidos.
+
+        Returns:
+            ManagerResult: Resultado del manager.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.__scheduler.reserve("JS", "__EXPIRE__", {"containers": names}):
+            return await loop.run_in_executor(self.__executor, self.__js_expire, names)
+
+    def __js_expire(self, names: list[str]) -> ManagerResult:
+        """
+        Detiene en lote los contenedores vencidos con el manager actual de Juice Shop.
+
+        Args:
+            names (list[str]): Nombres de los contenedores vencidos.
+
+        Returns:
+            ManagerResult: Resultado del manager.
+        """
+        # Lee el manager dentro del lock para asegurar coherencia.
+        with self.__manager_lock:
+            __manager: JuiceShopManager = self.js_manager
+        __res: ManagerResult = __manager.stop_containers(names)
+        if __res.success:
+            self.monitor.info(
+                message=f"Expired Juice Shop containers have been stopped -> {__res.data}"
+            )
+        else:
+            self.monitor.error(
+                message=f"Expired Juice Shop containers couldn't be stopped -> {__res.error}"
+            )
+        return __res
+
+    def __hibernate_js_containers(self, cpu_rates: dict[str, float]) -> ManagerResult:
+        """
+        Pausa las instancias de Juice Shop inactivas. Lo llama el monitor desde su hilo,
+        igual que `__expire_js_containers`.
+
+        Args:
+            cpu_rates (dict[str, float]): Núcleos de CPU que usaba cada contenedor.
+
+        Returns:
+            ManagerResult: Resultado del manager (`data.containers` por contenedor).
+        """
+        loop = self.__loop
+        if loop is not None and loop.is_running():
+            return asyncio.run_coroutine_threadsafe(
+                self.__hibernate_js_async(cpu_rates), loop
+            ).result()
+        return self.__js_hibernate(cpu_rates)
+
+    async def __hibernate_js_async(self, cpu_rates: dict[str, float]) -> ManagerResult:
+        """
+        Pausa un lote de instancias respetando los candados de sus puertos.
+
+        Args:
+            cpu_rates (dict[str, float]): Núcleos de CPU que usaba cada contenedor.
+
+        Returns:
+            ManagerResult: Resultado del manager.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.__scheduler.reserve(
+            "JS", "__HIBERNATE__", {"containers": list(cpu_rates)}
+        ):
+            return await loop.run_in_executor(
+                self.__executor, self.__js_hibernate, cpu_rates
+            )
+
+    def __js_hibernate(self, cpu_rates: dict[str, float]) -> ManagerResult:
+        """
+        Pausa en lote las instancias inactivas con el manager actual de Juice Shop.
+
+        Args:
+            cpu_rates (dict[str, float]): Núcleos de CPU que usaba cada contenedor.
+
+        Returns:
+            ManagerResult: Resultado del manager.
+        """
+        # Lee el manager dentro del lock para asegurar coherencia.
+        with self.__manager_lock:
+            __manager: JuiceShopManager = self.js_manager
+        __res: ManagerResult = __manager.hibernate(list(cpu_rates), cpu_rates)
+        if __res.success:
+            self.monitor.info(
+                message=f"Idle Juice Shop containers have been hibernated -> {__res.data}"
+            )
+        else:
+            self.monitor.error(
+                message=f"Idle Juice Shop containers couldn't be hibernated -> {__res.error}"
+            )
+        return __res
+
+    def __js_resume_container(self, manager: JuiceShopManager, args: Any) -> Response:
+        """
+        Reanuda un contenedor hibernado de Juice Shop (p.ej. al acceder el alumno).
+
+        Args:
+            manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (Any): Argumentos adicionales (puerto: int | nombre: str)
+
+        Returns:
+            Response: Respuesta de la operación
+        """
+        container: str | int = args.get("port") or args.get("container")
+        if not container:
+            return Response.error("Missing 'port' or 'container' in args")
+
+        __res: ManagerResult = manager.resume(container)
+        if __res.success:
+            if __res.data.get("resumed"):
+                self.monitor.info(
+                    message=f"Juice Shop container has been resumed -> {__res.data}"
+                )
+            return Response.ok(message=__res.message, data=__res.data or {})
+        self.monitor.error(
+            message=f"Juice Shop container couldn't be resumed -> {__res.error}"
+        )
+        return Response.error(
+            message="Error when trying to resume Juice Shop container.",
+            data=__res.data or {},
+        )
+
     def __js_stop(self, manager: JuiceShopManager) -> Response:
         """
         Detiene todos los contenedores gestionados por Juice Shop.
@@ -706,7 +1570,7 @@ class JuiceBoxEngineServer:
             )
             return Response.ok(
                 message="Juice Shop Manager ports range retrieved",
-                data={"ports_range": __res},
+                data={"ports_range": __res, "used_ports": manager.used_ports()},
             )
         else:
             self.monitor.error(
@@ -716,30 +1580,88 @@ class JuiceBoxEngineServer:
                 message="Error when trying to retrieve Juice Shop Manager ports range."
             )
 
-    def __js_generate_xml(self, manager: JuiceShopManager) -> Response:
+    def __js_generate_xml(
+        self,
+        manager: JuiceShopManager,
+        args: dict[str, Any],
+        progress: Callable[[int, str], None] | None = None,
+    ) -> Response:
         """
         Genera el archivo XML de configuración para Root The Box basado en la configuración actual de Juice Shop.
 
         Args:
             manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (dict[str, Any]): `force` (opcional, ignora la caché de archivos XML)
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso.
 
         Returns:
             Response: Respuesta de la operación
         """
-        __res: ManagerResult = manager.generate_rtb_config()
+        __res: ManagerResult = manager.generate_rtb_config(
+            progress=progress, force=bool(args.get("force"))
+        )
         if __res.success:
             self.monitor.info(
                 message=f"Juice Shop Manager generated XML file for RTB -> {__res.data}"
             )
-            return Response.ok(message=__res.message)
+            return Response.ok(message=__res.message, data=__res.data or {})
         else:
             self.monitor.error(
-                message=f"Juice Shop Manager couldn't generate XML file for RTB -> {__res.error}"
+                message=f"Juice Shop Manager couldn't generate XML file for RTB -> {__res.error} {__res.data or {}}"
             )
             return Response.error(
-                message="Error when trying to generate Root The Box XML file."
+                message="Error when trying to generate Root The Box XML file.",
+                data=__res.data or {},
             )
 
+    def __js_xml_cache(self, manager: JuiceShopManager, args: dict[str, Any]) -> Response:
+        """
+        Consulta o vacía la caché de archivos missions.xml.
+
+        Args:
+            manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (dict[str, Any]): `evict` (opcional, elimina entradas) y `key`
+                (opcional, entrada a eliminar; sin ella se vacía la caché)
+
+        Returns:
+            Response: Respuesta de la operación
+        """
+        if args.get("evict"):
+            key = args.get("key")
+            __res: ManagerResult = manager.evict_xml_cache(
+                str(key) if key else None
+            )
+        else:
+            __res = manager.xml_cache()
+        if __res.success:
+            self.monitor.info(message=f"Juice Shop missions cache -> {__res.message}")
+            return Response.ok(message=__res.message, data=__res.data or {})
+        self.monitor.error(
+            message=f"Juice Shop missions cache error -> {__res.error}"
+        )
+        return Response.error(message=__res.message, data=__res.data or {})
+
+    def __js_refresh_country_mapping(
+        self, manager: JuiceShopManager, args: dict[str, Any]
+    ) -> Response:
+        """
+        Descarga la copia local del mapeo de países de fbctf usada al generar misiones.
+
+        Args:
+            manager (JuiceShopManager): Instancia del manejador de Juice Shop
+            args (dict[str, Any]): `url` (opcional, URL de descarga alternativa)
+
+        Returns:
+            Response: Respuesta de la operación
+        """
+        url = args.get("url")
+        __res: ManagerResult = manager.refresh_country_mapping(str(url) if url else None)
+        if __res.success:
+            self.monitor.info(message=f"Country mapping refreshed -> {__res.data}")
+            return Response.ok(message=__res.message, data=__res.data or {})
+        self.monitor.error(message=f"Country mapping couldn't be refreshed -> {__res.error}")
+        return Response.error(message=__res.message, data={"error": __res.error})
+
     def __js_status(self, manager: JuiceShopManager) -> Response:
         """
         Obtiene el estado actual de los contenedores gestionados por la OWASP Juice Shop.
@@ -793,6 +1715,7 @@ class JuiceBoxEngineServer:
             manager (RootTheBoxManager | JuiceShopManager):  Instancia del manager correspondiente.
         """
         name: str = "JuiceShop"
+        manager.persistent = self.persistent
         with self.__manager_lock:
             if isinstance(manager, RootTheBoxManager):
                 self.rtb_manager = manager
@@ -803,6 +1726,8 @@ class JuiceBoxEngineServer:
             # Carga la configuración si no está cargada
             if manager.config.loaded:
                 self.monitor.info(f"{name} config already loaded")
+                if isinstance(manager, JuiceShopManager):
+                    self.__apply_idle_policy(manager)
                 return ManagerResult(
                     success=True,
                     message=f"{name} config already loaded",
@@ -816,11 +1741,29 @@ class JuiceBoxEngineServer:
                 )
             else:
                 self.monitor.info(f"{name} config loaded successfully")
+                if isinstance(manager, JuiceShopManager):
+                    self.__apply_idle_policy(manager)
                 return ManagerResult(
                     success=True,
                     message=f"{name} config loaded successfully",
                 )
 
+    def __apply_idle_policy(self, manager: JuiceShopManager) -> None:
+        """
+        Pasa al monitor la política de hibernación y reclamación de instancias
+        inactivas del manager.
+
+        Args:
+            manager (JuiceShopManager): Instancia del manejador de Juice Shop.
+        """
+        self.monitor.set_idle_policy(
+            idle_timeout=manager.idle_timeout,
+            grace=manager.idle_grace,
+            sample_interval=manager.idle_sample_interval,
+            sample_rate=manager.idle_sample_rate,
+            hibernate_after=manager.hibernate_after,
+        )
+
     def start(self) -> None:
         """
         Arranca el motor y acepta conexiones entrantes indefinidamente.
@@ -834,6 +1777,27 @@ class JuiceBoxEngineServer:
         self.monitor.set_containers(
             rtb=self.rtb_manager.get_containers(), js=self.js_manager.get_containers()
         )
+        if self.prober is not None:
+            # Se publica cuándo cada instancia empieza a responder por HTTP
+            self.prober.add_listener(self.__on_js_ready)
+        if self.state_table is not None:
+            # Se inicializa la tabla de estado y se sigue con los eventos de Docker
+            self.state_table.start()
+            if not self.state_table.wait_ready(timeout=10):
+                self.monitor.warning(
+                    "Container state table not ready, statuses will be read from Docker"
+                )
+        if self.persistent:
+            # Se recuperan los contenedores que siguieron en marcha
+            __adopted: ManagerResult = self.js_manager.adopt()
+            if __adopted.success:
+                self.monitor.info(f"Containers adopted -> {__adopted.data}")
+            else:
+                self.monitor.error(
+                    f"Containers couldn't be adopted -> {__adopted.error}"
+                )
+        # Arranca en segundo plano las instancias precalentadas de Juice Shop
+        self.js_manager.refill_pool()
         # Publica el arranque del motor
         self.redis_manager.publish_to_admin(
             RedisPayload.from_dict(
@@ -843,14 +1807,44 @@ class JuiceBoxEngineServer:
                 }
             )
         )
+        # Los contenedores vencidos se detienen en el propio proceso (sin pasar por el socket)
+        self.monitor.set_expire_handler(self.__expire_js_containers)
+        self.monitor.set_hibernate_handler(self.__hibernate_js_containers)
         self.monitor.start_container_monitoring()  # Arranca la monitorización de contenedores
+        if self.server_mode == "threads":
+            self.__serve_threads()
+        else:
+            asyncio.run(self.__serve_async())
+
+    def __serve_threads(self) -> None:
+        """
+        Acepta conexiones con un hilo por cliente y un único worker que procesa la cola.
+        """
+        Thread(target=self.__worker, daemon=True).start()
         while True:
             conn, _ = self.server_socket.accept()
-            conn.settimeout(10)
+            conn.settimeout(CLIENT_TIMEOUT)
             threading.Thread(
                 target=self.__handle_client, args=(conn,), daemon=True
             ).start()
 
+    async def __serve_async(self) -> None:
+        """
+        Acepta conexiones con asyncio sobre el socket de Unix ya enlazado.
+        El trabajo bloqueante se envía al executor acotado.
+        """
+        self.__loop = asyncio.get_running_loop()
+        self.server_socket.setblocking(False)
+        server = await asyncio.start_unix_server(
+            self.__handle_stream, sock=self.server_socket, limit=self.max_frame
+        )
+        self.monitor.info(
+            f"Asyncio server running with {self.max_workers} executor workers"
+            f" and {self.read_workers} read-only workers"
+        )
+        async with server:
+            await server.serve_forever()
+
     def stop(self) -> ManagerResult:
         """
         Detiene el motor y cierra el socket.
@@ -860,6 +1854,12 @@ class JuiceBoxEngineServer:
         """
         try:
             self.server_socket.close()
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__read_executor.shutdown(wait=False, cancel_futures=True)
+            if self.state_table is not None:
+                self.state_table.stop()
+            if self.prober is not None:
+                self.prober.stop()
             if os.path.exists(self.socket_path):
                 os.remove(self.socket_path)
             return ManagerResult.ok(message="Engine stopped and socket removed")
@@ -867,13 +1867,18 @@ class JuiceBoxEngineServer:
             return ManagerResult.failure(message="Error stopping server", error=str(e))
 
     def __handle_rtb_command(
-        self, command: str, args: dict[str, str | int]
+        self,
+        command: str,
+        args: dict[str, str | int],
+        progress: Callable[[int, str], None] | None = None,
     ) -> Response:
         """
         Ejecuta un comando específico para Root The Box.
 
         Args:
-        command (str): Comando recibido
+          command (str): Comando recibido
+          args (dict[str, str | int]): Argumentos adicionales
+          progress (Callable[[int, str], None] | None): Función para reportar el progreso
 
         Returns:
             Response: Respuesta serializada en formato JSON
@@ -883,9 +1888,9 @@ class JuiceBoxEngineServer:
             __manager: RootTheBoxManager = self.rtb_manager
         match command:
             case "__START__":
-                return self.__rtb_start(__manager)
+                return self.__rtb_start(__manager, progress)
             case "__RESTART__":
-                return self.__rtb_restart()
+                return self.__rtb_restart(progress)
             case "__STOP__":
                 return self.__rtb_stop(__manager)
             case "__STATUS__":
@@ -900,7 +1905,10 @@ class JuiceBoxEngineServer:
                 return Response.error(message=__message)
 
     def __handle_js_command(
-        self, command: str, args: dict[str, str | int | list[int]]
+        self,
+        command: str,
+        args: dict[str, str | int | list[int]],
+        progress: Callable[[int, str], None] | None = None,
     ) -> Response:
         """
         Ejecuta un comando específico para Juice Shop.
@@ -908,6 +1916,7 @@ class JuiceBoxEngineServer:
         Args:
           command (str): Comando recibido
           args (dict[str, str | int | list[int]]): Argumentos adicionales como puerto o nombre
+          progress (Callable[[int, str], None] | None): Función para reportar el progreso
 
         Returns:
             Response: Respuesta serializada en formato JSON
@@ -919,11 +1928,15 @@ class JuiceBoxEngineServer:
         __res: ManagerResult
         match command:
             case "__START__":
-                return self.__js_start_container(__manager)
+                return self.__js_start_container(__manager, args)
+            case "__START_N__":
+                return self.__js_start_n(__manager, args, progress)
             case "__RESTART__":
                 return self.__js_restart()
             case "__STOP_CONTAINER__":
                 return self.__js_stop_container(__manager, args)
+            case "__RESUME__":
+                return self.__js_resume_container(__manager, args)
             case "__STOP__":
                 return self.__js_stop(__manager)
             case "__CONTAINER_STATUS__":
@@ -931,7 +1944,11 @@ class JuiceBoxEngineServer:
             case "__CONFIG__":
                 return self.__js_config(__manager)
             case "__GENERATE_XML__":
-                return self.__js_generate_xml(__manager)
+                return self.__js_generate_xml(__manager, args, progress)
+            case "__XML_CACHE__":
+                return self.__js_xml_cache(__manager, args)
+            case "__REFRESH_COUNTRY_MAPPING__":
+                return self.__js_refresh_country_mapping(__manager, args)
             case "__STATUS__":
                 return self.__js_status(__manager)
             case "__SET_CONFIG__":
@@ -945,12 +1962,65 @@ class JuiceBoxEngineServer:
         # Retorno
         return __resp
 
-    def dispatch_command(self, raw_data: str) -> Response:
+    def __handle_engine_command(self, command: str, args: dict[str, Any]) -> Response:
+        """
+        Ejecuta un comando del propio motor (negociación del protocolo y trabajos de
+        larga duración).
+
+        Args:
+          command (str): Comando recibido
+          args (dict[str, Any]): Argumentos adicionales como el job_id
+
+        Returns:
+            Response: Respuesta serializada en formato JSON
+        """
+        job_id: str = str(args.get("job_id") or "")
+        match command:
+            case "__HELLO__":
+                return Response.ok(
+                    message="Hello",
+                    data={
+                        "version": PROTOCOL_VERSION,
+                        "max_frame": negotiate_max_frame(
+                            args.get("max_frame"), self.max_frame
+                        ),
+                    },
+                )
+            case "__JOB_STATUS__":
+                if not job_id:
+                    return Response.ok(
+                        message="Jobs retrieved",
+                        data={"jobs": [j.to_dict() for j in self.job_manager.jobs()]},
+                    )
+                job = self.job_manager.get(job_id)
+                if job is None:
+                    return Response.not_found(message=f"Job {job_id} not found")
+                return Response.ok(message="Job status retrieved", data=job.to_dict())
+            case "__JOB_CANCEL__":
+                if not job_id:
+                    return Response.error("Missing 'job_id' in args")
+                __res: ManagerResult = self.job_manager.cancel(job_id)
+                if __res.success:
+                    self.monitor.info(f"Job {job_id} cancellation requested")
+                    return Response.ok(message=__res.message, data=__res.data or {})
+                return Response.error(
+                    message=f"{__res.message}: {__res.error}", data=__res.data or {}
+                )
+            case _:
+                __message: str = "Juice Box Engine command error"
+                self.monitor.error(message=__message + f" -> {command}")
+                return Response.error(message=__message)
+
+    def dispatch_command(
+        self, raw_data: str, progress: Callable[[int, str], None] | None = None
+    ) -> Response:
         """
         Parsea el comando recibido y lo redirige al manager correspondiente.
 
         Args:
             raw_data (str): Cadena JSON enviada por el cliente
+            progress (Callable[[int, str], None] | None): Función para reportar el progreso
+                                                         de un trabajo de larga duración.
 
         Returns:
             Response: Respuesta serializada en formato JSON
@@ -969,10 +2039,16 @@ class JuiceBoxEngineServer:
             elif command not in COMMANDS[prog]:
                 __resp = Response.error(message="Command not recognized by program")
             elif prog == "RTB":
-                __resp = self.__handle_rtb_command(command=command, args=args)
+                __resp = self.__handle_rtb_command(
+                    command=command, args=args, progress=progress
+                )
+            elif prog == "ENGINE":
+                __resp = self.__handle_engine_command(command=command, args=args)
             else:
                 # prog == "JS"
-                __resp = self.__handle_js_command(command=command, args=args)
+                __resp = self.__handle_js_command(
+                    command=command, args=args, progress=progress
+                )
             # Se despachan las respuestas:
         except json.JSONDecodeError:
             __resp = Response.error(message="Invalid JSON format")
@@ -1069,14 +2145,43 @@ class JuiceBoxEngineServer:
         messages: list[str] = []
         errors: list[str] = []
 
+        # Los contenedores de cada manager se eliminan en paralelo (en modo
+        # persistente se dejan en marcha)
+        __action: str = "release" if self.persistent else "cleanup"
+        parallel_specs: list[tuple[str, object | None, str]] = [
+            ("JuiceShopManager", js, __action),
+            ("RootTheBoxManager", rtb, __action),
+            ("RedisManager", redis, __action),
+        ]
         specs: list[tuple[str, object | None, str]] = [
-            ("JuiceShopManager", js, "cleanup"),
-            ("RootTheBoxManager", rtb, "cleanup"),
-            ("RedisManager", redis, "cleanup"),
             ("Monitor", monitor, "stop_container_monitoring"),
             ("DockerClient", docker_client, "close"),
         ]
 
+        outcomes: dict[str, tuple[list[str], list[str]]] = {}
+
+        def __run(name: str, component: object, method: str) -> None:
+            outcomes[name] = self.__run_component_action(
+                name, component, method, monitor
+            )
+
+        # Hilos daemon: la limpieza también se ejecuta desde atexit
+        threads: list[threading.Thread] = [
+            threading.Thread(
+                target=__run, args=(name, component, method), daemon=True
+            )
+            for name, component, method in parallel_specs
+            if component is not None
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for name, _, _ in parallel_specs:
+            msg, err = outcomes.get(name, ([], []))
+            messages.extend(msg)
+            errors.extend(err)
+
         for name, component, method in specs:
             if component is None:
                 continue
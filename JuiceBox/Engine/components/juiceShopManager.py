@@ -1,8 +1,14 @@
-import os, atexit, shutil, time, requests, yaml
+import os, atexit, hashlib, io, json, queue, tarfile, threading, time, requests, yaml
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from docker import errors
-from ..utils import JuiceShopConfig
+from ..utils import JuiceShopConfig, COUNTRY_MAPPING_URL
 from ..utils import validate_container
-from Models import ManagerResult, BaseManager
+from .containerStateTable import ContainerStateTable, ContainerRecord, list_containers
+from .portAllocator import PortAllocator
+from .readinessProber import ReadinessProber
+from Models import ManagerResult, BaseManager, Status
 from docker import DockerClient
 from docker.models.containers import Container
 from docker.models.networks import Network
@@ -28,23 +34,48 @@ LOGO = """
 DEVELOPER = "Edgar Sabido"
 GITHUB_USER = "EdgarSabidoC"
 
+# Segundos máximos de espera a que una instancia responda por HTTP
+READY_TIMEOUT: int = 180
+
+# Número máximo de contenedores que se detienen a la vez
+STOP_WORKERS: int = 16
+
+# Segundos máximos de espera a que la Juice Shop temporal del XML responda
+XML_BOOT_TIMEOUT: int = 180
+
+# Número máximo de archivos missions.xml guardados en la caché
+XML_CACHE_MAX_ENTRIES: int = 20
+
 
 class JuiceShopManager(BaseManager):
     """
     Clase que administra instancias de OWASP Juice Shop en contenedores Docker.
 
     ## Operaciones
-    - **start:** Inicia un nuevo contenedor de Juice Shop en un puerto disponible.
+    - **start:** Inicia un nuevo contenedor de Juice Shop en un puerto disponible o
+      entrega una instancia precalentada del pool.
+    - **start_n:** Inicia varios contenedores de Juice Shop en paralelo.
+    - **wait_ready:** Espera a que un contenedor responda por HTTP.
+    - **refill_pool:** Rellena en segundo plano el pool de instancias precalentadas.
     - **stop:** Detiene y elimina todos los contenedores de Juice Shop.
     - **stop_container:** Detiene y elimina un contenedor específico de Juice Shop.
     - **status:** Obtiene el estado de un contenedor específico de Juice Shop.
     - **show_config:** Muestra la configuración actual de Juice Shop.
     - **generate_rtb_config:** Genera el archivo XML de configuración para Root The Box.
+    - **missions_xml:** Obtiene el último archivo XML de misiones generado.
+    - **xml_cache / evict_xml_cache:** Consulta y vacía la caché de archivos XML.
+    - **refresh_country_mapping:** Descarga la copia local del mapeo de países de fbctf.
+    - **adopt:** Recupera los contenedores que siguen en marcha tras reiniciar el motor.
+    - **release:** Libera los recursos del manager sin detener los contenedores.
     - **cleanup:** Detiene y elimina todos los contenedores de Juice Shop y libera los recursos.
     """
 
     def __init__(
-        self, config: JuiceShopConfig, docker_client: DockerClient | None = None
+        self,
+        config: JuiceShopConfig,
+        docker_client: DockerClient | None = None,
+        state_table: ContainerStateTable | None = None,
+        prober: ReadinessProber | None = None,
     ) -> None:
         """
         Inicializa el gestor de Juice Shop con la configuración dada.
@@ -52,6 +83,10 @@ class JuiceShopManager(BaseManager):
         Args:
             config (JuiceShopConfig): Configuración para Juice Shop.
             docker_client (DockerClient | None): Cliente Docker opcional.
+            state_table (ContainerStateTable | None): Tabla en memoria con el estado de
+                los contenedores. Si está lista, las consultas de estado no tocan Docker.
+            prober (ReadinessProber | None): Comprobador de las instancias que ya
+                responden por HTTP. Si no se indica, el manager usa uno propio.
         """
         if not isinstance(config, JuiceShopConfig):
             raise TypeError("Required: JuiceShopConfig instance.")
@@ -63,6 +98,39 @@ class JuiceShopManager(BaseManager):
         if docker_client:
             self.__docker_client: DockerClient = docker_client
 
+        # Tabla de estado de los contenedores (mantenida por eventos de Docker)
+        self.state_table: ContainerStateTable | None = state_table
+
+        # Comprobador de las instancias que ya responden por HTTP
+        self.__owns_prober: bool = prober is None
+        self.prober: ReadinessProber = prober or ReadinessProber()
+
+        # Índice de puertos libres (se crea y reconcilia con Docker en el primer uso)
+        self.__allocator: PortAllocator | None = None
+        self.__allocator_lock = threading.Lock()
+        if self.state_table is not None:
+            self.state_table.add_listener(self.__on_state_change)
+
+        # Pool de instancias precalentadas: (nombre, puerto) listas para entregar
+        self.__pool: deque[tuple[str, int]] = deque()
+        self.__pool_lock = threading.Lock()
+        self.__pool_warming: int = 0
+        self.__pool_generation: int = 0
+        self.__pool_hits: int = 0
+        self.__pool_misses: int = 0
+        self.__pool_executor: ThreadPoolExecutor | None = None
+
+        # Hibernación: instancias pausadas -> (momento de la pausa, núcleos de CPU que
+        # usaba antes de pausarla) y métricas acumuladas
+        self.__hibernated: dict[str, tuple[float, float]] = {}
+        self.__hibernation_lock = threading.Lock()
+        self.__hibernations: int = 0
+        self.__resumes: int = 0
+        self.__cpu_seconds_saved: float = 0.0
+        self.__resume_ms_total: float = 0.0
+        self.__resume_ms_max: float = 0.0
+        self.__resume_ms_last: float | None = None
+
         # Directorio donde está este script
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         # Directorio padre del script
@@ -76,9 +144,23 @@ class JuiceShopManager(BaseManager):
         # Ruta absoluta a configs/
         self.configs_dir = os.path.join(self.components_dir, "configs")
 
+        # Caché de archivos missions.xml generados
+        self.xml_cache_dir = os.path.join(self.components_dir, "cache", "missions")
+        # Momentos de entrega de las instancias del pool (modo persistente)
+        self.handouts_path = os.path.join(
+            self.components_dir, "cache", "state", "handouts.json"
+        )
+
+        # Modo persistente: al cerrar el motor los contenedores siguen en marcha
+        self.persistent: bool = False
+
+        # Último archivo missions.xml generado o cargado de la caché
+        self.__missions_xml: bytes | None = None
+
         self.image = "bkimminich/juice-shop:latest"
+        self.ctf_image = "bkimminich/juice-shop-ctf:v11.0.0"
 
-        atexit.register(self.cleanup)
+        atexit.register(self.__on_exit)
 
     @property
     def container_prefix(self) -> str:
@@ -134,6 +216,97 @@ class JuiceShopManager(BaseManager):
         """
         return self.config.detach_mode
 
+    @property
+    def pool_size(self) -> int:
+        """
+        Número de instancias precalentadas que se mantienen listas (0 = desactivado).
+        """
+        return self.config.pool_size
+
+    @property
+    def pool_refill_concurrency(self) -> int:
+        """
+        Número máximo de instancias del pool que arrancan a la vez.
+        """
+        return self.config.pool_refill_concurrency
+
+    @property
+    def pool_max(self) -> int:
+        """
+        Tamaño máximo permitido del pool.
+        """
+        return self.config.pool_max
+
+    @property
+    def start_concurrency(self) -> int:
+        """
+        Número máximo de contenedores que se crean a la vez en `start_n`.
+        """
+        return self.config.start_concurrency
+
+    @property
+    def keep_missions_file(self) -> bool:
+        """
+        Indica si se guarda una copia del XML de misiones en RootTheBox/missions/.
+        """
+        return self.config.keep_missions_file
+
+    @property
+    def stop_timeout(self) -> int:
+        """
+        Segundos de gracia que se esperan al detener un contenedor antes de SIGKILL.
+        """
+        return self.config.stop_timeout
+
+    @property
+    def kill_on_stop(self) -> bool:
+        """
+        Si es True los contenedores se eliminan directamente con SIGKILL.
+        """
+        return self.config.kill_on_stop
+
+    @property
+    def stop_deadline(self) -> int:
+        """
+        Segundos máximos para detener todos los contenedores.
+        """
+        return self.config.stop_deadline
+
+    @property
+    def idle_timeout(self) -> int:
+        """
+        Minutos sin actividad tras los que se reclama una instancia (0 = desactivado).
+        """
+        return self.config.idle_timeout
+
+    @property
+    def idle_grace(self) -> int:
+        """
+        Minutos de aviso antes de reclamar una instancia inactiva.
+        """
+        return self.config.idle_grace
+
+    @property
+    def hibernate_after(self) -> int:
+        """
+        Minutos sin actividad tras los que se pausa una instancia (0 = desactivado).
+        """
+        return self.config.hibernate_after
+
+    @property
+    def idle_sample_interval(self) -> int:
+        """
+        Segundos entre dos muestras de actividad de la misma instancia.
+        """
+        return self.config.idle_sample_interval
+
+    @property
+    def idle_sample_rate(self) -> int:
+        """
+        Consultas de estadísticas a Docker por segundo como máximo.
+        """
+        return self.config.idle_sample_rate
+
     def get_containers(self) -> list[str]:
         """
         Obtiene la lista de contenedores de la configuración actual de la Juice Shop.
@@ -147,19 +320,136 @@ class JuiceShopManager(BaseManager):
             __containers.append(__container)
         return __containers
 
-    def __get_available_port(self) -> tuple[int, str]:
+    def __port_allocator(self) -> PortAllocator:
         """
-        Obtiene un puerto disponible.
+        Obtiene el índice de puertos libres. Se crea (o se rehace si cambió el rango)
+        reconciliándolo con los contenedores que ya existen en Docker.
 
         Returns:
-            tuple[int, "available" | "not available"]: Puerto y disponibilidad.
+            PortAllocator: Índice de puertos del rango actual.
         """
-        for port in range(self.starting_port, self.ending_port + 1):
-            __container: str = self.container_prefix + str(port)
-            # Se verifica que no exista el contenedor
-            if not validate_container(self.__docker_client, __container):
-                return (port, "available")
-        return (1, "not available")
+        with self.__allocator_lock:
+            if self.__allocator is None or (
+                self.__allocator.starting_port,
+                self.__allocator.ending_port,
+            ) != (self.starting_port, self.ending_port):
+                self.__allocator = PortAllocator(
+                    self.starting_port, self.ending_port, self.__docker_used_ports()
+                )
+            return self.__allocator
+
+    def __docker_used_ports(self) -> list[int]:
+        """
+        Obtiene los puertos ocupados por contenedores de Juice Shop, desde la tabla de
+        estado si está lista o con un único listado de Docker.
+
+        Returns:
+            list[int]: Puertos ocupados.
+        """
+        return [
+            port
+            for port in map(self.__port_of, self.__snapshot())
+            if port is not None
+        ]
+
+    def __port_of(self, container_name: str) -> int | None:
+        """
+        Obtiene el puerto de un contenedor del rango a partir de su nombre.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+
+        Returns:
+            int | None: Puerto o None si el nombre no es de un contenedor del rango.
+        """
+        if not container_name.startswith(self.container_prefix):
+            return None
+        try:
+            port = self.__get_port_from_container(container_name)
+        except ValueError:
+            return None
+        return port if self.is_valid_port(port) else None
+
+    def __on_state_change(self, name: str, record: ContainerRecord | None) -> None:
+        """
+        Mantiene el índice de puertos y las sondas HTTP al día con los cambios de la
+        tabla de estado (contenedores creados, reiniciados o eliminados fuera del
+        manager).
+
+        Args:
+            name (str): Nombre del contenedor.
+            record (ContainerRecord | None): Registro o None si se eliminó.
+        """
+        port = self.__port_of(name)
+        if port is None:
+            return
+        if record is not None and record.status == "running":
+            self.__probe(name, record.port if record.port > 0 else port)
+        else:
+            self.prober.forget(name)
+        if record is None:
+            with self.__hibernation_lock:
+                entry = self.__hibernated.pop(name, None)
+            self.__close_hibernation(entry)
+        allocator = self.__allocator
+        if allocator is None:
+            return
+        if record is None:
+            allocator.forget(port)
+        else:
+            allocator.mark_used(port)
+
+    def __probe(self, container_name: str, port: int) -> None:
+        """
+        Empieza a comprobar si un contenedor responde por HTTP.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+            port (int): Puerto publicado en el host.
+        """
+        self.prober.probe(container_name, port, READY_TIMEOUT)
+
+    def wait_ready(self, container_name: str, timeout: float = READY_TIMEOUT) -> bool:
+        """
+        Espera a que un contenedor responda por HTTP.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+            timeout (float): Tiempo máximo de espera en segundos.
+
+        Returns:
+            bool: True si el contenedor ya atiende peticiones.
+        """
+        self.__reprobe(container_name)
+        return self.prober.wait(container_name, timeout)
+
+    async def wait_ready_async(
+        self, container_name: str, timeout: float = READY_TIMEOUT
+    ) -> bool:
+        """
+        Espera a que un contenedor responda por HTTP desde un event loop, sin ocupar
+        un hilo del executor.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+            timeout (float): Tiempo máximo de espera en segundos.
+
+        Returns:
+            bool: True si el contenedor ya atiende peticiones.
+        """
+        self.__reprobe(container_name)
+        return await self.prober.wait_async(container_name, timeout)
+
+    def __reprobe(self, container_name: str) -> None:
+        """
+        Vuelve a lanzar la sonda de un contenedor si terminó sin éxito.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+        """
+        port = self.__port_of(container_name)
+        if port is not None and not self.prober.is_ready(container_name):
+            self.__probe(container_name, port)
 
     def __get_port_from_container(self, container_name: str) -> int:
         """
@@ -174,6 +464,58 @@ class JuiceShopManager(BaseManager):
         """
         return int(container_name[len(self.container_prefix) :])
 
+    def __table(self) -> ContainerStateTable | None:
+        """
+        Devuelve la tabla de estado si está lista para responder consultas.
+
+        Returns:
+            ContainerStateTable | None: Tabla lista o None.
+        """
+        if self.state_table is not None and self.state_table.ready:
+            return self.state_table
+        return None
+
+    def used_ports(self) -> list[int]:
+        """
+        Obtiene los puertos del rango ocupados por contenedores de Juice Shop según la
+        tabla de estado.
+
+        Returns:
+            list[int]: Puertos ocupados o lista vacía si la tabla no está lista.
+        """
+        table = self.__table()
+        if table is None:
+            return []
+        ports: list[int] = []
+        for record in table.records():
+            if record.name.startswith(self.container_prefix):
+                try:
+                    port = self.__get_port_from_container(record.name)
+                except ValueError:
+                    continue
+                if self.is_valid_port(port):
+                    ports.append(port)
+        return sorted(ports)
+
+    def __snapshot(self) -> dict[str, ContainerRecord]:
+        """
+        Obtiene los contenedores de Juice Shop del rango que existen en Docker, desde la
+        tabla de estado si está lista o con un único listado filtrado por el label
+        `program=JS`. El coste depende de los contenedores existentes y no del tamaño
+        del rango.
+
+        Returns:
+            dict[str, ContainerRecord]: Registros por nombre de contenedor.
+        """
+        table = self.__table()
+        if table is not None:
+            records = table.records()
+        else:
+            records = list(
+                list_containers(self.__docker_client, label="program=JS").values()
+            )
+        return {r.name: r for r in records if self.__port_of(r.name) is not None}
+
     def is_valid_port(self, port: int) -> bool:
         """
         Valida si un puerto está dentro del rango de puertos del Juice Shop Manager.
@@ -183,37 +525,212 @@ class JuiceShopManager(BaseManager):
         """
         return port in range(self.starting_port, self.ending_port + 1)
 
-    def start(self) -> ManagerResult:
+    def start(
+        self, wait_ready: bool = False, timeout: float = READY_TIMEOUT
+    ) -> ManagerResult:
         """
-        Inicia un contenedor de Juice Shop.
+        Inicia un contenedor de Juice Shop. Si el pool tiene alguna instancia
+        precalentada se entrega al instante; en ambos casos el pool se rellena en
+        segundo plano.
+
+        Args:
+            wait_ready (bool): Si es True, no se devuelve el resultado hasta que el
+                contenedor responde por HTTP.
+            timeout (float): Segundos máximos de espera con `wait_ready`.
 
         Returns:
             ManagerResult: Resultado de la operación.
         """
+        __res: ManagerResult | None = None
+        if self.pool_size > 0:
+            __res = self.__take_from_pool()
+            if __res is None:
+                self.__record_pool_misses(1)
+        if __res is None:
+            __res = self.__start_container()
+        self.refill_pool()
+        if wait_ready:
+            return self.__await_ready(__res, timeout)
+        return __res
+
+    def __await_ready(self, result: ManagerResult, timeout: float) -> ManagerResult:
+        """
+        Espera a que el contenedor de un resultado de arranque responda por HTTP.
+
+        Args:
+            result (ManagerResult): Resultado del arranque.
+            timeout (float): Tiempo máximo de espera en segundos.
+
+        Returns:
+            ManagerResult: El mismo resultado con `ready` a True, o un error si el
+            contenedor no responde a tiempo (el contenedor sigue arrancando).
+        """
+        __data: dict = result.data or {}
+        __name: str | None = __data.get("container")
+        if not result.success or not __name:
+            return result
+        if self.wait_ready(__name, timeout):
+            __data["ready"] = True
+            return result
+        return ManagerResult.failure(
+            message="Container is running but not serving HTTP yet",
+            error=f"No HTTP response from the container in {timeout} seconds",
+            data={**__data, "ready": False},
+        )
+
+    def start_n(
+        self, n: int, on_started: Callable[[ManagerResult], None] | None = None
+    ) -> ManagerResult:
+        """
+        Inicia n contenedores de Juice Shop. Primero se entregan las instancias del
+        pool; para el resto se reservan los puertos en una sola operación y los
+        contenedores se crean en paralelo, con como mucho `start_concurrency` a la vez.
+
+        Args:
+            n (int): Número de contenedores a iniciar.
+            on_started (Callable[[ManagerResult], None] | None): Función que recibe el
+                resultado de cada contenedor en cuanto termina.
+
+        Returns:
+            ManagerResult: Resultado agregado con el resultado de cada contenedor.
+        """
+        __notify = on_started or (lambda _: None)
+        results: list[ManagerResult] = []
+
+        # Instancias precalentadas
+        while self.pool_size > 0 and len(results) < n:
+            __warm: ManagerResult | None = self.__take_from_pool()
+            if __warm is None:
+                break
+            results.append(__warm)
+            __notify(__warm)
+
+        # Arranques en frío en paralelo sobre puertos ya reservados
+        missing: int = n - len(results)
+        if self.pool_size > 0:
+            self.__record_pool_misses(missing)
+        ports: list[int] = []
+        if missing > 0:
+            try:
+                ports = self.__port_allocator().reserve_many(missing)
+            except Exception as e:
+                return ManagerResult.failure(
+                    message="Juice Shop containers could not be started",
+                    error=str(e),
+                    data={"containers": [r.to_dict() for r in results]},
+                )
+        if ports:
+            with ThreadPoolExecutor(
+                max_workers=min(self.start_concurrency, len(ports)),
+                thread_name_prefix="juice-shop-start",
+            ) as executor:
+                futures = [
+                    executor.submit(self.__start_container, port=port) for port in ports
+                ]
+                for future in as_completed(futures):
+                    result: ManagerResult = future.result()
+                    results.append(result)
+                    __notify(result)
+        self.refill_pool()
+
+        results.sort(key=lambda r: (r.data or {}).get("port") or 0)
+        # "No available ports" es un resultado correcto pero sin contenedor
+        started: int = sum(
+            1 for r in results if r.success and (r.data or {}).get("container")
+        )
+        __data: dict = {
+            "requested": n,
+            "started": started,
+            "containers": [r.to_dict() for r in results],
+        }
+        if started == n:
+            return ManagerResult.ok(
+                message=f"All {n} Juice Shop containers have been started",
+                data=__data,
+            )
+        return ManagerResult.failure(
+            message=f"{started} of {n} Juice Shop containers have been started",
+            error=(
+                "No available ports"
+                if len(ports) < missing
+                else "Some containers could not be started"
+            ),
+            data=__data,
+        )
+
+    def __start_container(
+        self, warm: bool = False, port: int | None = None
+    ) -> ManagerResult:
+        """
+        Crea y arranca un contenedor de Juice Shop en el menor puerto libre.
+
+        Args:
+            warm (bool): Si es True el contenedor se crea para el pool (label
+                `pool=warm`); su tiempo de vida empieza a contar al entregarlo.
+            port (int | None): Puerto ya reservado en el índice de puertos. Si su nombre
+                está ocupado se reserva otro.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        __labels: dict[str, str] = {"lifespan": str(self.lifespan), "program": "JS"}
+        if warm:
+            __labels["pool"] = "warm"
         __container_name: str = ""
         __port: int | None = None
         try:
-            __port, __port_status = self.__get_available_port()  # Se obtiene el puerto
-            if __port_status != "available":
-                return ManagerResult.ok(message="No available ports")
-            __container_name = self.container_prefix + str(__port)
-            __res: Container | bytes = self.__docker_client.containers.run(
-                image=self.image,
-                name=__container_name,
-                detach=self.detach_mode,
-                ports={"3000/tcp": __port},
-                environment=[
-                    f"CTF_KEY={self.ctf_key}",
-                    f"NODE_ENV={self.node_env}",
-                ],
-                labels={"lifespan": str(self.lifespan), "program": "JS"},
-            )
+            allocator: PortAllocator = self.__port_allocator()
+            __reserved: int | None = port
+            while True:
+                # Se usa el puerto ya reservado o se reserva uno
+                __port = __reserved if __reserved is not None else allocator.reserve()
+                __reserved = None
+                if __port is None:
+                    return ManagerResult.ok(message="No available ports")
+                __container_name = self.container_prefix + str(__port)
+                try:
+                    __res: Container | bytes = self.__docker_client.containers.run(
+                        image=self.image,
+                        name=__container_name,
+                        detach=self.detach_mode,
+                        ports={"3000/tcp": __port},
+                        environment=[
+                            f"CTF_KEY={self.ctf_key}",
+                            f"NODE_ENV={self.node_env}",
+                        ],
+                        labels=__labels,
+                    )
+                except errors.APIError as e:
+                    if e.status_code == 409:
+                        # El nombre ya existe fuera del índice: se marca y se prueba otro
+                        allocator.mark_used(__port)
+                        continue
+                    allocator.release(__port)
+                    raise
+                except Exception:
+                    allocator.release(__port)
+                    raise
+                allocator.commit(__port)
+                break
+            if self.state_table is not None and isinstance(__res, Container):
+                # Se registra sin esperar al evento de Docker
+                self.state_table.upsert(
+                    ContainerRecord(
+                        name=__container_name,
+                        id=__res.id,
+                        status="running",
+                        port=__port,
+                        labels=dict(__labels),
+                    )
+                )
+            self.__probe(__container_name, __port)
             return ManagerResult.ok(
                 message="Container has been created and now is running",
                 data={
                     "container": __container_name,
                     "status": __res.status if isinstance(__res, Container) else None,
                     "port": __port,
+                    "ready": self.prober.is_ready(__container_name),
                 },
             )
         except Exception as e:
@@ -224,6 +741,298 @@ class JuiceShopManager(BaseManager):
                 data={"container": __container_name, "status": "error", "port": __port},
             )
 
+    def __take_from_pool(self) -> ManagerResult | None:
+        """
+        Entrega una instancia precalentada del pool.
+
+        Returns:
+            ManagerResult | None: Resultado con el contenedor entregado o None si el
+            pool está vacío.
+        """
+        table = self.__table()
+        with self.__pool_lock:
+            while self.__pool:
+                name, port = self.__pool.popleft()
+                record = table.get(name) if table is not None else None
+                if table is not None and (record is None or record.status != "running"):
+                    # Se detuvo o eliminó mientras esperaba en el pool
+                    continue
+                self.__pool_hits += 1
+                break
+            else:
+                return None
+        if self.state_table is not None:
+            # El tiempo de vida empieza a contar desde la entrega
+            self.state_table.mark_handed_out(name)
+            if self.persistent:
+                self.__save_handouts()
+        return ManagerResult.ok(
+            message="Container has been handed out from the warm pool",
+            data={
+                "container": name,
+                "status": "running",
+                "port": port,
+                "ready": self.prober.is_ready(name),
+            },
+        )
+
+    def __record_pool_misses(self, count: int) -> None:
+        """
+        Suma los arranques en frío por no haber instancias en el pool.
+
+        Args:
+            count (int): Número de arranques en frío.
+        """
+        with self.__pool_lock:
+            self.__pool_misses += max(0, count)
+
+    def refill_pool(self) -> None:
+        """
+        Arranca en segundo plano las instancias que faltan para completar el pool. Una
+        instancia entra en el pool cuando responde por HTTP.
+        """
+        if self.pool_size <= 0:
+            return
+        with self.__pool_lock:
+            missing = self.pool_size - len(self.__pool) - self.__pool_warming
+            if missing <= 0:
+                return
+            self.__pool_warming += missing
+            generation = self.__pool_generation
+            if self.__pool_executor is None:
+                self.__pool_executor = ThreadPoolExecutor(
+                    max_workers=self.pool_refill_concurrency,
+                    thread_name_prefix="juice-shop-pool",
+                )
+            executor = self.__pool_executor
+        for _ in range(missing):
+            executor.submit(self.__warm_instance, generation)
+
+    def __warm_instance(self, generation: int) -> None:
+        """
+        Arranca una instancia para el pool y espera a que responda.
+
+        Args:
+            generation (int): Generación del pool al pedir la instancia. Si el pool se
+                vacía mientras arranca, la instancia se descarta.
+        """
+        __name: str | None = None
+        try:
+            __res: ManagerResult = self.__start_container(warm=True)
+            __data: dict = __res.data or {}
+            if not __res.success or not __data.get("container"):
+                return
+            __name = __data["container"]
+            __port: int = __data["port"]
+            if not self.wait_ready(__name, timeout=READY_TIMEOUT):
+                return
+            with self.__pool_lock:
+                if generation == self.__pool_generation:
+                    self.__pool.append((__name, __port))
+                    __name = None
+        except Exception:
+            pass
+        finally:
+            with self.__pool_lock:
+                self.__pool_warming -= 1
+            if __name is not None:
+                # No arrancó a tiempo o el pool se vació mientras arrancaba
+                self.stop_container(__name)
+
+    def pool_stats(self) -> dict[str, int]:
+        """
+        Obtiene el estado del pool de instancias precalentadas.
+
+        Returns:
+            dict[str, int]: Tamaño configurado, instancias listas y arrancando, y
+            número de entregas desde el pool (hits) y arranques en frío (misses).
+        """
+        with self.__pool_lock:
+            return {
+                "size": self.pool_size,
+                "ready": len(self.__pool),
+                "warming": self.__pool_warming,
+                "hits": self.__pool_hits,
+                "misses": self.__pool_misses,
+            }
+
+    def __drain_pool(self) -> None:
+        """
+        Vacía el pool. Las instancias que aún están arrancando se descartan al terminar.
+        """
+        with self.__pool_lock:
+            self.__pool.clear()
+            self.__pool_generation += 1
+
+    def hibernate(
+        self, containers: list[str], cpu_rates: dict[str, float] | None = None
+    ) -> ManagerResult:
+        """
+        Pausa (`docker pause`) varias instancias inactivas para liberar su CPU sin
+        perder el progreso del alumno. Se reanudan con `resume`.
+
+        Args:
+            containers (list[str]): Nombres de los contenedores.
+            cpu_rates (dict[str, float] | None): Núcleos de CPU que usaba cada
+                instancia antes de pausarla, para estimar la CPU ahorrada.
+
+        Returns:
+            ManagerResult: Resultado de la operación. `data.containers` contiene el
+            resultado de cada contenedor en el mismo orden.
+        """
+        cpu_rates = cpu_rates or {}
+        containers_results: list[dict] = []
+        overall_ok = True
+        for name in containers:
+            port = self.__port_of(name)
+            try:
+                self.__docker_client.api.pause(name)
+            except errors.NotFound:
+                containers_results.append(
+                    {"container": name, "status": "not_found", "port": port}
+                )
+                continue
+            except Exception as e:
+                overall_ok = False
+                containers_results.append(
+                    {
+                        "container": name,
+                        "status": "error",
+                        "port": port,
+                        "error": str(e),
+                    }
+                )
+                continue
+            with self.__hibernation_lock:
+                self.__hibernated[name] = (
+                    time.monotonic(),
+                    cpu_rates.get(name, 0.0),
+                )
+                self.__hibernations += 1
+            if self.state_table is not None:
+                self.state_table.set_status(name, "paused")
+            containers_results.append(
+                {"container": name, "status": "paused", "port": port}
+            )
+        if overall_ok:
+            return ManagerResult.ok(
+                message="Juice Shop containers hibernated",
+                data={"containers": containers_results},
+            )
+        return ManagerResult.failure(
+            message="Error at hibernating Juice Shop containers",
+            error="Some containers could not be paused",
+            data={"containers": containers_results},
+        )
+
+    def resume(self, container: str | int) -> ManagerResult:
+        """
+        Reanuda (`docker unpause`) una instancia hibernada. Si no está pausada no se
+        hace nada.
+
+        Args:
+            container (str | int): Nombre o puerto del contenedor de Docker.
+
+        Returns:
+            ManagerResult: Resultado de la operación. `data.resumed` indica si se ha
+            reanudado y `data.resume_ms` cuánto ha tardado.
+        """
+        container_name: str = (
+            self.container_prefix + str(container)
+            if isinstance(container, int)
+            else container
+        )
+        table = self.__table()
+        record = table.get(container_name) if table is not None else None
+        # Se reclama la entrada para que dos consultas a la vez no la reanuden dos veces
+        with self.__hibernation_lock:
+            entry = self.__hibernated.pop(container_name, None)
+        if entry is None and (record is None or record.status != "paused"):
+            return ManagerResult.ok(
+                message="Container is not hibernated",
+                data={"container": container_name, "resumed": False},
+            )
+        started = time.perf_counter()
+        try:
+            self.__docker_client.api.unpause(container_name)
+        except Exception as e:
+            if entry is not None:
+                with self.__hibernation_lock:
+                    self.__hibernated.setdefault(container_name, entry)
+            return ManagerResult.failure(
+                message="Container could not be resumed",
+                error=str(e),
+                data={"container": container_name, "status": "error"},
+            )
+        resume_ms = (time.perf_counter() - started) * 1000
+        self.__close_hibernation(entry, resume_ms)
+        if self.state_table is not None:
+            self.state_table.set_status(container_name, "running")
+        return ManagerResult.ok(
+            message="Container resumed",
+            data={
+                "container": container_name,
+                "status": "running",
+                "resumed": True,
+                "resume_ms": round(resume_ms, 1),
+            },
+        )
+
+    def __close_hibernation(
+        self, entry: tuple[float, float] | None, resume_ms: float | None = None
+    ) -> None:
+        """
+        Acumula la CPU ahorrada por una instancia que ha dejado de estar hibernada.
+
+        Args:
+            entry (tuple[float, float] | None): (momento de la pausa, núcleos de CPU)
+                o None si la pausó otro proceso.
+            resume_ms (float | None): Latencia de la reanudación o None si la instancia
+                se ha eliminado estando pausada.
+        """
+        with self.__hibernation_lock:
+            if entry is not None:
+                paused_at, cpu_rate = entry
+                self.__cpu_seconds_saved += cpu_rate * (time.monotonic() - paused_at)
+            if resume_ms is not None:
+                self.__resumes += 1
+                self.__resume_ms_total += resume_ms
+                self.__resume_ms_max = max(self.__resume_ms_max, resume_ms)
+                self.__resume_ms_last = resume_ms
+
+    def hibernation_stats(self) -> dict[str, int | float | None]:
+        """
+        Obtiene las métricas de la hibernación de instancias.
+
+        Returns:
+            dict[str, int | float | None]: Instancias pausadas, pausas y reanudaciones
+            totales, segundos de CPU ahorrados (estimados con el uso previo a la
+            pausa) y latencia de reanudación en milisegundos.
+        """
+        now = time.monotonic()
+        with self.__hibernation_lock:
+            saved = self.__cpu_seconds_saved + sum(
+                cpu_rate * (now - paused_at)
+                for paused_at, cpu_rate in self.__hibernated.values()
+            )
+            return {
+                "paused": len(self.__hibernated),
+                "hibernations": self.__hibernations,
+                "resumes": self.__resumes,
+                "cpu_seconds_saved": round(saved, 2),
+                "resume_ms_last": (
+                    round(self.__resume_ms_last, 1)
+                    if self.__resume_ms_last is not None
+                    else None
+                ),
+                "resume_ms_avg": (
+                    round(self.__resume_ms_total / self.__resumes, 1)
+                    if self.__resumes
+                    else None
+                ),
+                "resume_ms_max": round(self.__resume_ms_max, 1),
+            }
+
     def stop_container(self, container: str | int) -> ManagerResult:
         """
         Detiene y destruye un contenedor de la Juice Shop.
@@ -244,21 +1053,17 @@ class JuiceShopManager(BaseManager):
                 __container_name = container
                 __port = self.__get_port_from_container(container)
             # Se verifica que exista el contenedor
-            if validate_container(self.__docker_client, __container_name):
-                containers = self.__docker_client.containers
-                _container = containers.get(__container_name)
-                _container.stop()
-                _container.remove()
-                return ManagerResult.ok(
-                    message="Container has been stopped and removed from system",
-                    data={
-                        "container": __container_name,
-                        "status": "removed",
-                        "port": __port,
-                    },
-                )
+            table = self.__table()
+            __exists: bool = (
+                table.get(__container_name) is not None
+                if table is not None
+                else validate_container(self.__docker_client, __container_name)
+            )
+            if __exists:
+                return self.__remove_container(__container_name, __port)
             else:
                 # No existe el contenedor
+                self.__release_port(__port, forget=True)
                 return ManagerResult.ok(
                     message="Container could not be found",
                     data={
@@ -274,6 +1079,95 @@ class JuiceShopManager(BaseManager):
                 data={"container": __container_name, "status": "error", "port": __port},
             )
 
+    def stop_containers(self, containers: list[str]) -> ManagerResult:
+        """
+        Detiene y destruye varios contenedores de la Juice Shop a la vez (p.ej. los que
+        han expirado en el mismo lote).
+
+        Args:
+            containers (list[str]): Nombres de los contenedores de Docker.
+
+        Returns:
+            ManagerResult: Resultado de la operación. `data.containers` contiene el
+            resultado de cada contenedor en el mismo orden.
+        """
+        containers_results: list[dict] = []
+        overall_ok = True
+        for name, result in zip(containers, self.__remove_containers(containers)):
+            if result is None:
+                # Ya no existía: se libera el puerto igualmente
+                containers_results.append(
+                    {
+                        "container": name,
+                        "status": "not_found",
+                        "port": self.__port_of(name),
+                    }
+                )
+                continue
+            if not result.success:
+                overall_ok = False
+            containers_results.append(result.data)
+        if overall_ok:
+            return ManagerResult.ok(
+                message="Juice Shop containers stopped successfully",
+                data={"containers": containers_results},
+            )
+        return ManagerResult.failure(
+            message="Error at stopping Juice Shop containers",
+            error="Some containers could not be stopped",
+            data={"containers": containers_results},
+        )
+
+    def __remove_container(self, container_name: str, port: int | None) -> ManagerResult:
+        """
+        Detiene y elimina un contenedor que existe y libera su puerto.
+
+        Args:
+            container_name (str): Nombre del contenedor.
+            port (int | None): Puerto del contenedor.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        _container = self.__docker_client.containers.get(container_name)
+        if self.kill_on_stop:
+            # Instancias desechables: SIGKILL y borrado en una sola llamada
+            _container.remove(force=True)
+        else:
+            _container.stop(timeout=self.stop_timeout)
+            _container.remove()
+        with self.__hibernation_lock:
+            entry = self.__hibernated.pop(container_name, None)
+        self.__close_hibernation(entry)
+        if self.state_table is not None:
+            self.state_table.remove(container_name)
+        self.prober.forget(container_name)
+        self.__release_port(port)
+        return ManagerResult.ok(
+            message="Container has been stopped and removed from system",
+            data={
+                "container": container_name,
+                "status": "removed",
+                "port": port,
+            },
+        )
+
+    def __release_port(self, port: int | None, forget: bool = False) -> None:
+        """
+        Devuelve un puerto al índice de puertos libres si ya se ha creado.
+
+        Args:
+            port (int | None): Puerto del contenedor.
+            forget (bool): Si es True no se liberan las reservas en curso.
+        """
+        allocator = self.__allocator
+        if allocator is None or port is None:
+            return
+        if forget:
+            allocator.forget(port)
+        else:
+            allocator.release(port)
+
     def stop(self) -> ManagerResult:
         """
         Detiene y destruye todos los contenedores de la Juice Shop.
@@ -281,12 +1175,40 @@ class JuiceShopManager(BaseManager):
         Returns:
             ManagerResult: Resultado de la operación.
         """
-        # Destruye todos los contenedores de la JuiceShop
+        # Destruye todos los contenedores de la JuiceShop (también los del pool)
+        self.__drain_pool()
         containers_results: list[ManagerResult] = []
         overall_ok = True
-        for port in range(self.starting_port, self.ending_port + 1):
-            result = self.stop_container(self.container_prefix + str(port))
-
+        try:
+            # Solo se detienen los contenedores que existen (un único listado)
+            existing: list[str] = sorted(self.__snapshot(), key=self.__port_of)
+        except Exception as e:
+            return ManagerResult.failure(
+                message="Error at stopping Juice Shop containers",
+                error=str(e),
+                data={"containers": []},
+            )
+        removed: dict[str, ManagerResult | None] = dict(
+            zip(existing, self.__remove_containers(existing))
+        )
+        # Un resultado por puerto del rango (los vacíos como not_found, sin consultar
+        # Docker) más los contenedores de fuera del rango que se hayan detenido
+        names: list[str] = [
+            f"{self.container_prefix}{port}"
+            for port in range(self.starting_port, self.ending_port + 1)
+        ]
+        in_range: set[str] = set(names)
+        names += [name for name in existing if name not in in_range]
+        for name in names:
+            result = removed.get(name)
+            if result is None:
+                # No existía (o se eliminó entre el listado y la parada)
+                port = self.__port_of(name)
+                self.__release_port(port, forget=True)
+                result = ManagerResult.ok(
+                    message="Container could not be found",
+                    data={"container": name, "status": "not_found", "port": port},
+                )
             if not result.success:
                 overall_ok = False
             else:
@@ -318,6 +1240,69 @@ class JuiceShopManager(BaseManager):
             },
         )
 
+    def __remove_containers(self, names: list[str]) -> list[ManagerResult | None]:
+        """
+        Detiene y elimina varios contenedores a la vez con, como mucho, `STOP_WORKERS`
+        hilos y un plazo total de `stop_deadline` segundos. Se usan hilos daemon (y no
+        un executor) porque también se llama desde `atexit`, cuando ya no se aceptan
+        tareas nuevas en los executors.
+
+        Args:
+            names (list[str]): Nombres de los contenedores.
+
+        Returns:
+            list[ManagerResult | None]: Resultado de cada contenedor en el mismo orden.
+            None si el contenedor ya no existía.
+        """
+        pending: queue.SimpleQueue[int] = queue.SimpleQueue()
+        for index in range(len(names)):
+            pending.put(index)
+        results: list[ManagerResult | None] = [None] * len(names)
+        done: list[bool] = [False] * len(names)
+
+        def __worker() -> None:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    return
+                name = names[index]
+                port = self.__port_of(name)
+                try:
+                    results[index] = self.__remove_container(name, port)
+                except errors.NotFound:
+                    self.__release_port(port, forget=True)
+                except Exception as e:
+                    results[index] = ManagerResult.failure(
+                        message="Container could not be stopped or removed",
+                        error=str(e),
+                        data={"container": name, "status": "error", "port": port},
+                    )
+                done[index] = True
+
+        workers = [
+            threading.Thread(target=__worker, name="juice-shop-stop", daemon=True)
+            for _ in range(min(STOP_WORKERS, len(names)))
+        ]
+        for worker in workers:
+            worker.start()
+        deadline = time.monotonic() + self.stop_deadline
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+        for index, name in enumerate(names):
+            if not done[index]:
+                results[index] = ManagerResult.failure(
+                    message="Container could not be stopped or removed",
+                    error=f"Stop deadline of {self.stop_deadline} s exceeded",
+                    data={
+                        "container": name,
+                        "status": "error",
+                        "port": self.__port_of(name),
+                    },
+                )
+        return results
+
     def show_config(self) -> ManagerResult:
         """
         Muestra la configuración actual del manager de la Juice Shop.
@@ -335,6 +1320,18 @@ class JuiceShopManager(BaseManager):
                     "ctf_key": self.ctf_key,
                     "node_env": self.node_env,
                     "detach_mode": self.detach_mode,
+                    "pool_size": self.pool_size,
+                    "pool_refill_concurrency": self.pool_refill_concurrency,
+                    "pool_max": self.pool_max,
+                    "stop_timeout": self.stop_timeout,
+                    "kill_on_stop": self.kill_on_stop,
+                    "stop_deadline": self.stop_deadline,
+                    "start_concurrency": self.start_concurrency,
+                    "idle_timeout": self.idle_timeout,
+                    "idle_grace": self.idle_grace,
+                    "hibernate_after": self.hibernate_after,
+                    "idle_sample_interval": self.idle_sample_interval,
+                    "idle_sample_rate": self.idle_sample_rate,
                     "image": self.image,
                 },
             },
@@ -377,29 +1374,6 @@ class JuiceShopManager(BaseManager):
         except errors.NotFound:
             return "not_found"
 
-    def __get_port(self, container_name: str) -> int:
-        """
-        Obtiene el puerto mapeado de un contenedor de Juice Shop.
-
-        Args:
-            container_name (str): Nombre del contenedor.
-
-        Returns:
-            int: Puerto asignado o -1 si no tiene.
-        """
-        try:
-            container = self.__docker_client.containers.get(container_name)
-            ports = container.attrs["NetworkSettings"]["Ports"]
-            # ejemplo: {'3000/tcp': [{'HostIp': '0.0.0.0', 'HostPort': '3001'}]}
-            bindings = ports.get("3000/tcp")
-            if bindings and len(bindings) > 0:
-                return int(bindings[0]["HostPort"])
-            return -1
-        except errors.NotFound:
-            return -1
-        except Exception as e:
-            raise RuntimeError(f"Error getting port for {container_name}: {e}")
-
     def container_status(self, container: str | int) -> ManagerResult:
         """
         Obtiene el estado actual de un contenedor de la Juice Shop.
@@ -415,12 +1389,18 @@ class JuiceShopManager(BaseManager):
                 container_name = container
             elif isinstance(container, int):
                 container_name = self.container_prefix + str(container)
-            status: str = self.__get_status(container_name)
+            table = self.__table()
+            if table is not None:
+                record = table.get(container_name)
+                status: str = record.status if record is not None else "not_found"
+            else:
+                status = self.__get_status(container_name)
             return ManagerResult.ok(
                 message="Container status retrieved",
                 data={
                     "container": container_name,
                     "status": status,
+                    "ready": self.prober.is_ready(container_name),
                 },
             )
         except Exception as e:
@@ -441,51 +1421,50 @@ class JuiceShopManager(BaseManager):
             ManagerResult: Resultado de la operación.
         """
         containers_results: list[ManagerResult] = []
-        overall_ok = True
+        try:
+            # Una sola consulta (tabla en memoria o listado de Docker) para todo el rango
+            records: dict[str, ContainerRecord] = self.__snapshot()
+        except Exception as e:
+            return ManagerResult.failure(
+                message="Failure at retrieving some Juice Shop containers' statuses",
+                error=str(e),
+                data={"containers": []},
+            )
 
         for i in range(self.starting_port, self.ending_port + 1):
             container_name = f"{self.container_prefix}{i}"
-            try:
-                __status: str = self.__get_status(container_name)
-                __port: int = self.__get_port(container_name)
-                _data: dict[str, str | int] = {
-                    "container": container_name,
-                    "status": __status,
-                    "port": __port,
-                }
-                containers_results.append(
-                    ManagerResult.ok(
-                        message="Container status retrieved",
-                        data=_data,
-                    )
-                )
-            except Exception as e:
-                overall_ok = False
-                containers_results.append(
-                    ManagerResult.failure(
-                        message="Error getting container status",
-                        error=str(e),
-                        data={"container": container_name, "status": "error"},
-                    )
+            record = records.get(container_name)
+            _data: dict[str, str | int | bool] = {
+                "container": container_name,
+                "status": record.status if record else "not_found",
+                "port": record.port if record else -1,
+                "ready": self.prober.is_ready(container_name),
+            }
+            containers_results.append(
+                ManagerResult.ok(
+                    message="Container status retrieved",
+                    data=_data,
                 )
+            )
 
-        __data: dict[str, list[dict]] = {
-            "containers": [r.to_dict() for r in containers_results]
+        __data: dict[str, list[dict] | dict[str, int]] = {
+            "containers": [r.to_dict() for r in containers_results],
+            "pool": self.pool_stats(),
+            "hibernation": self.hibernation_stats(),
         }
 
-        if overall_ok:
-            return ManagerResult.ok(
-                message="Success at retrieving Juice Shop containers' statuses",
-                data=__data,
-            )
-        else:
-            return ManagerResult.failure(
-                message="Failure at retrieving some Juice Shop containers' statuses",
-                error="Some containers statuses could not be retrieved",
-                data=__data,
-            )
+        return ManagerResult.ok(
+            message="Success at retrieving Juice Shop containers' statuses",
+            data=__data,
+        )
 
-    def __wait_for_a_juice_shop(self, url: str, timeout=60):
+    def __wait_for_a_juice_shop(
+        self,
+        url: str,
+        timeout=60,
+        interval: float = 2,
+        on_wait: Callable[[float], None] | None = None,
+    ):
         """
             Espera a que una instancia de Juice Shop esté disponible en la URL especificada.
 
@@ -493,6 +1472,10 @@ class JuiceShopManager(BaseManager):
             url (str): URL de la instancia de Juice Shop a verificar.
             timeout (int, opcional): Tiempo máximo en segundos a esperar.
                                      Por defecto es 60.
+            interval (float, opcional): Segundos entre intentos. Por defecto es 2.
+            on_wait (Callable[[float], None] | None, opcional): Función que recibe los
+                segundos transcurridos tras cada intento fallido. Puede lanzar una
+                excepción para dejar de esperar.
 
         Returns:
             str: La URL válida de la instancia de Juice Shop que respondió correctamente.
@@ -504,14 +1487,19 @@ class JuiceShopManager(BaseManager):
                 if resp.status_code == 200:
                     return url
             except requests.exceptions.RequestException:
-                continue  # Si aún no responde
-            time.sleep(2)  # retry tras revisar todos
+                pass  # Si aún no responde
+            if on_wait is not None:
+                on_wait(time.time() - start)
+            time.sleep(interval)  # retry tras revisar todos
         raise TimeoutError(
             f"There was no response from the services in {timeout} seconds"
         )
 
     def __validate_js_container(
-        self, network_name: str, client: DockerClient
+        self,
+        network_name: str,
+        client: DockerClient,
+        progress: Callable[[int, str], None],
     ) -> tuple[str, str | None]:
         """
         Valida un contenedor de OWASP Juice Shop para obtener las misiones del CTF.
@@ -519,6 +1507,7 @@ class JuiceShopManager(BaseManager):
         Args:
             network_name (str): Nombre de la red.
             client (DockerClient): Cliente Docker.
+            progress (Callable[[int, str], None]): Función para reportar el progreso.
 
         Returns:
             (tuple[str, str | None]): URL válida del contenedor de la OWASP Juice Shop y el nombre del contenedor temporal (en caso de que exista o None).
@@ -543,15 +1532,89 @@ class JuiceShopManager(BaseManager):
                 ],
             )
             valid_url = "http://juice-shop-temp:3000"
-            time.sleep(75)
+            # El motor no resuelve el nombre del contenedor: se usa su IP en la red
+            js_container.reload()
+            ip: str = (
+                js_container.attrs.get("NetworkSettings", {})
+                .get("Networks", {})
+                .get(network_name, {})
+                .get("IPAddress", "")
+            )
+            if not ip:
+                raise RuntimeError(
+                    f"Temporary Juice Shop has no IP address in {network_name}"
+                )
+
+            def __on_wait(elapsed: float) -> None:
+                # El tiempo de arranque es desconocido: el progreso se acerca a 70
+                progress(
+                    20 + int(50 * elapsed / (elapsed + 30)),
+                    f"Waiting for temporary Juice Shop ({int(elapsed)} s)",
+                )
+                js_container.reload()
+                if js_container.status not in ("created", "running"):
+                    raise RuntimeError(
+                        f"Temporary Juice Shop stopped while booting ({js_container.status})"
+                    )
+
+            # Espera a que responda, lo que tarde realmente en arrancar
+            self.__wait_for_a_juice_shop(
+                f"http://{ip}:3000",
+                timeout=XML_BOOT_TIMEOUT,
+                interval=1,
+                on_wait=__on_wait,
+            )
         except Exception:
             if js_container is not None:
                 js_container.stop()
                 js_container.remove()
+                js_container = None
+            raise
         if js_container:
             return (valid_url, js_container.name)
         return (valid_url, None)
 
+    def __attach_running_js_container(self, docker_net: Network) -> Container | None:
+        """
+        Busca una instancia de Juice Shop que ya responda por HTTP, con la misma imagen,
+        `CTF_KEY` y `NODE_ENV`, y la conecta a la red del CLI de CTF. Se prefieren las
+        instancias del pool que aún no se han entregado.
+
+        Args:
+            docker_net (Network): Red de Docker del CLI de CTF.
+
+        Returns:
+            Container | None: Contenedor conectado a la red o None si no hay ninguno.
+        """
+        try:
+            records: list[ContainerRecord] = sorted(
+                self.__snapshot().values(),
+                key=lambda r: (r.labels.get("pool") != "warm", r.port),
+            )
+        except Exception:
+            return None
+        __env: set[str] = {f"CTF_KEY={self.ctf_key}", f"NODE_ENV={self.node_env}"}
+        for record in records:
+            if record.status != "running" or not self.prober.is_ready(record.name):
+                continue
+            try:
+                container: Container = self.__docker_client.containers.get(record.name)
+                config: dict = container.attrs.get("Config") or {}
+                if config.get("Image") != self.image or not __env <= set(
+                    config.get("Env") or []
+                ):
+                    continue
+                networks: dict = (
+                    container.attrs.get("NetworkSettings") or {}
+                ).get("Networks") or {}
+                if docker_net.name not in networks:
+                    docker_net.connect(container)
+                return container
+            except errors.APIError:
+                # Eliminado mientras se buscaba
+                continue
+        return None
+
     def __write_url_in_yaml(self, url: str, full_config_path: str) -> None:
         """
         Escribe una URL en un archivo YAML con el campo `juiceShopUrl`.
@@ -573,9 +1636,10 @@ class JuiceShopManager(BaseManager):
         network_name: str,
         docker_net: Network,
         client: DockerClient,
-    ) -> str:
+    ) -> tuple[bytes | None, str]:
         """
         Corre un contenedor de Docker con las herramientas CLI de OWASP Juice Shop CTF para generar las misiones.
+        El archivo generado se lee del contenedor con `get_archive`, sin pasar por disco.
 
         Args:
             output_filename (str): Nombre del archivo de salida.
@@ -583,25 +1647,18 @@ class JuiceShopManager(BaseManager):
             network_name (str): Nombre de la red de contenedores de Docker.
             docker_net (Network): Red de Docker.
             client (DockerClient): Cliente Docker.
+
+        Returns:
+            tuple[bytes | None, str]: Contenido del archivo XML (None si no se generó) y
+            logs del CLI.
         """
         exit_code: str = "Couldn't reach CTF CLI container"
+        container: Container | None = None
+        xml: bytes | None = None
         try:
-            # Archivo temporal:
-            tmp_dir = "/tmp/juicebox/RootTheBox/missions"
-            os.makedirs(tmp_dir, exist_ok=True)
-            os.chmod(tmp_dir, 0o777)
-
-            # Borra todos los archivos existentes en tmp_dir
-            for f in os.listdir(tmp_dir):
-                f_path = os.path.join(tmp_dir, f)
-                if os.path.isfile(f_path):
-                    os.remove(f_path)
-                elif os.path.isdir(f_path):
-                    shutil.rmtree(f_path)
-
-            # Genera el archivo missions.xml
-            logs = client.containers.run(
-                image="bkimminich/juice-shop-ctf:v11.0.0",
+            # Genera el archivo missions.xml dentro del contenedor
+            container = client.containers.run(
+                image=self.ctf_image,
                 command=[
                     "--config",
                     os.path.join("/configs", os.path.basename(full_config_path)),
@@ -613,18 +1670,33 @@ class JuiceShopManager(BaseManager):
                         "bind": "/configs",
                         "mode": "ro",
                     },  # solo lectura
-                    tmp_dir: {"bind": "/data", "mode": "rw"},  # escritura
                 },
                 working_dir="/data",
                 network=network_name,
-                # tty=True,
-                # stdin_open=True,
-                remove=True,
+                detach=True,
             )
-            exit_code = logs.decode()
+            container.wait()
+            exit_code = container.logs().decode()
+
+            # Lee el archivo generado (tar con un único archivo)
+            try:
+                stream, _ = container.get_archive(
+                    os.path.join("/data", output_filename)
+                )
+            except errors.NotFound:
+                return None, exit_code  # El CLI no generó el archivo
+            with tarfile.open(fileobj=io.BytesIO(b"".join(stream))) as tar:
+                member = tar.extractfile(tar.getmembers()[0])
+                if member is not None:
+                    xml = member.read()
         except Exception as e:
             exit_code = f"Error on CTF CLI: {exit_code} -> {e}"
         finally:
+            if container is not None:
+                try:
+                    container.remove(force=True)
+                except Exception:
+                    pass
             # Elimina la red si no tiene contenedores
             if docker_net is not None:
                 try:
@@ -633,52 +1705,102 @@ class JuiceShopManager(BaseManager):
                         docker_net.remove()
                 except Exception:
                     pass
-        return exit_code
+        return xml, exit_code
 
-    def __move_XML_file(
-        self, output_filename: str, cli_logs: str = ""
+    def __keep_XML_file(
+        self, xml: bytes | None, output_filename: str, cli_logs: str = ""
     ) -> ManagerResult:
         """
-        Mueve el archivo XML generado a RootTheBox/missions/.
+        Guarda en memoria el archivo XML generado y, si `KEEP_MISSIONS_FILE` está
+        activado, una copia en RootTheBox/missions/.
 
         Args:
+            xml (bytes | None): Contenido del archivo XML.
             output_filename (str): Nombre del archivo de salida.
+            cli_logs (str): Logs del CLI, para el mensaje de error.
 
         Returns:
             ManagerResult: Resultado de la operación.
         """
-        tmp_dir = "/tmp/juicebox/RootTheBox/missions"
-        output_path = os.path.join(tmp_dir, output_filename)
-        if os.path.isfile(output_path):
-            dest_path = os.path.join(self.missions_dir, output_filename)
-            if os.path.isfile(dest_path):
-                os.remove(dest_path)
-            shutil.move(output_path, dest_path)
-            return ManagerResult.ok(
-                message=f"{output_filename} file saved in {self.missions_dir}",
-                data={"path": self.missions_dir},
-            )
-        else:
+        if not xml:
             return ManagerResult.failure(
                 message=f"{output_filename} couldn't be generated",
                 error="Non-existent file -> " + cli_logs,
             )
+        self.__missions_xml = xml
+        path: str | None = None
+        if self.keep_missions_file:
+            os.makedirs(self.missions_dir, exist_ok=True)
+            dest_path = os.path.join(self.missions_dir, output_filename)
+            tmp_path = f"{dest_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(xml)
+            os.replace(tmp_path, dest_path)
+            path = self.missions_dir
+        return ManagerResult.ok(
+            message=(
+                f"{output_filename} file saved in {self.missions_dir}"
+                if path
+                else f"{output_filename} file kept in memory"
+            ),
+            data={"path": path, "size": len(xml)},
+        )
+
+    def missions_xml(self, output_filename: str = "missions.xml") -> bytes | None:
+        """
+        Obtiene el último archivo XML de misiones generado. Si no hay ninguno en
+        memoria (p.ej. tras reiniciar el motor), se lee la copia de RootTheBox/missions/.
+
+        Args:
+            output_filename (str): Nombre del archivo de misiones.
+
+        Returns:
+            bytes | None: Contenido del archivo o None si no existe.
+        """
+        if self.__missions_xml is not None:
+            return self.__missions_xml
+        try:
+            with open(os.path.join(self.missions_dir, output_filename), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
 
     def generate_rtb_config(
-        self, input_filename="juiceShopRTBConfig.yml", output_filename="missions.xml"
+        self,
+        input_filename="juiceShopRTBConfig.yml",
+        output_filename="missions.xml",
+        progress: Callable[[int, str], None] | None = None,
+        force: bool = False,
     ) -> ManagerResult:
         """
-        Genera un archvivo de misiones de OWASP Juice Shop para un CTF.
+        Genera un archvivo de misiones de OWASP Juice Shop para un CTF. Si ya se generó
+        con las mismas imágenes de Docker y la misma configuración, se copia de la caché.
 
         Args:
             input_filename (str, optional): Nombre del archivo de entrada. Predeterminado: "juiceShopRTBConfig.yml".
             output_filename (str, optional): Nombre del archivo de salida. Predeterminado: "missions.xml".
+            progress (Callable[[int, str], None] | None, optional): Función para reportar el progreso.
+            force (bool, optional): Si es True se ignora la caché y se vuelve a generar.
 
         Returns:
             ManagerResult: Resultado de la operación.
         """
+        __report = progress or (lambda *_: None)
         js_container: str | None = None
+        # Instancia en marcha conectada temporalmente a la red (en lugar de la temporal)
+        reused: Container | None = None
+        __net: Network | None = None
         logs: str = "Couldn't reach CTF CLI container"
+        # Duración (segundos) de cada etapa
+        timings: dict[str, float] = {}
+        __started: float = time.monotonic()
+        __mark: list[float] = [__started]
+
+        def __lap(stage: str) -> None:
+            now = time.monotonic()
+            timings[stage] = round(now - __mark[0], 2)
+            __mark[0] = now
+
         try:
             full_config_path = os.path.join(self.configs_dir, input_filename)
             if not os.path.isfile(full_config_path):
@@ -689,38 +1811,88 @@ class JuiceShopManager(BaseManager):
             client: DockerClient = self.__docker_client
             network_name: str = "juice-net"
 
+            # Caché por imágenes y configuración
+            __report(2, "Checking missions cache")
+            cache_key: str | None = self.__xml_cache_key(full_config_path)
+            if cache_key is not None and not force:
+                __cached: ManagerResult | None = self.__load_from_xml_cache(
+                    cache_key, output_filename
+                )
+                if __cached is not None:
+                    __lap("cache")
+                    timings["total"] = round(time.monotonic() - __started, 2)
+                    __cached.data = {**(__cached.data or {}), "timings": timings}
+                    return __cached
+            __lap("cache")
+
             # Crea la red Docker si no existe
-            __net: Network
+            __report(5, "Preparing Docker network")
             try:
                 __net = client.networks.get(network_name)
             except errors.NotFound:
                 __net = client.networks.create(network_name)
+            __lap("network")
 
-            # Prueba un contenedor de la Juice Shop remoto o uno temporal
-            valid_url, js_container = self.__validate_js_container(
-                network_name=network_name, client=client
-            )
+            # Usa una instancia que ya responde o arranca una temporal
+            reused = self.__attach_running_js_container(__net)
+            if reused is not None:
+                __report(70, f"Using running Juice Shop {reused.name}")
+                valid_url = f"http://{reused.name}:3000"
+            else:
+                __report(10, "Starting temporary Juice Shop")
+                valid_url, js_container = self.__validate_js_container(
+                    network_name=network_name, client=client, progress=__report
+                )
+            __lap("juice_shop_boot")
 
             # Reescribe el YAML con la URL válida
             self.__write_url_in_yaml(url=valid_url, full_config_path=full_config_path)
 
             # Ejecuta el CLI juice-shop-ctf
-            logs = self.__run_js_cli_container(
+            __report(75, "Running Juice Shop CTF CLI")
+            xml, logs = self.__run_js_cli_container(
                 output_filename=output_filename,
                 full_config_path=full_config_path,
                 network_name=network_name,
                 docker_net=__net,
                 client=client,
             )
+            __lap("ctf_cli")
 
-            # Mueve el archivo XML generado a missions/
-            return self.__move_XML_file(output_filename=output_filename, cli_logs=logs)
+            # Guarda el archivo XML generado
+            __report(95, "Saving missions file")
+            __res: ManagerResult = self.__keep_XML_file(
+                xml=xml, output_filename=output_filename, cli_logs=logs
+            )
+            if __res.success and xml is not None:
+                # Las imágenes ya existen aunque no estuvieran al empezar
+                cache_key = cache_key or self.__xml_cache_key(full_config_path)
+                self.__store_in_xml_cache(cache_key, xml)
+                __res.data = {
+                    **(__res.data or {}),
+                    "cached": False,
+                    "key": cache_key,
+                    "juice_shop": reused.name if reused is not None else js_container,
+                }
+            __lap("save")
+            timings["total"] = round(time.monotonic() - __started, 2)
+            __res.data = {**(__res.data or {}), "timings": timings}
+            return __res
 
         except Exception as e:
+            timings["total"] = round(time.monotonic() - __started, 2)
             return ManagerResult.failure(
-                message="Error while generating XML file", error=str(e) + f"\n{logs}"
+                message="Error while generating XML file",
+                error=str(e) + f"\n{logs}",
+                data={"timings": timings},
             )
         finally:
+            # Desconecta de la red la instancia reutilizada
+            if reused is not None and __net is not None:
+                try:
+                    __net.disconnect(reused)
+                except Exception:
+                    pass
             # Limpia el contenedor temporal siempre
             if js_container is not None:
                 try:
@@ -732,6 +1904,352 @@ class JuiceShopManager(BaseManager):
                 except Exception:
                     pass
 
+    def __xml_cache_key(self, full_config_path: str) -> str | None:
+        """
+        Calcula la clave de la caché de missions.xml: sha256 de los identificadores de
+        las imágenes de Juice Shop y del CLI de CTF y de la configuración YAML (sin la
+        URL de la instancia temporal, que cambia en cada generación).
+
+        Args:
+            full_config_path (str): Ruta absoluta al archivo YAML de configuración.
+
+        Returns:
+            str | None: Clave o None si alguna imagen aún no se ha descargado.
+        """
+        try:
+            js_image: str = self.__docker_client.images.get(self.image).id
+            ctf_image: str = self.__docker_client.images.get(self.ctf_image).id
+        except errors.APIError:
+            return None
+        with open(full_config_path, "r") as f:
+            cfg = yaml.safe_load(f) or {}
+        cfg.pop("juiceShopUrl", None)
+        __mapping = self.config.country_mapping_path
+        __source: dict = {
+            "js_image": js_image,
+            "ctf_image": ctf_image,
+            "config": cfg,
+            "country_mapping": (
+                hashlib.sha256(__mapping.read_bytes()).hexdigest()
+                if __mapping.is_file()
+                else None
+            ),
+            "ctf_key": self.ctf_key,
+            "node_env": self.node_env,
+        }
+        return hashlib.sha256(
+            json.dumps(__source, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def __load_from_xml_cache(
+        self, key: str, output_filename: str
+    ) -> ManagerResult | None:
+        """
+        Carga un archivo XML de la caché como último archivo de misiones generado.
+
+        Args:
+            key (str): Clave de la caché.
+            output_filename (str): Nombre del archivo de salida.
+
+        Returns:
+            ManagerResult | None: Resultado de la operación o None si no está en caché.
+        """
+        cached_path = os.path.join(self.xml_cache_dir, f"{key}.xml")
+        try:
+            with open(cached_path, "rb") as f:
+                xml: bytes = f.read()
+        except OSError:
+            return None
+        __res: ManagerResult = self.__keep_XML_file(xml, output_filename)
+        if __res.success:
+            __res.message = f"{output_filename} file loaded from cache"
+            __res.data = {**(__res.data or {}), "cached": True, "key": key}
+        return __res
+
+    def __store_in_xml_cache(self, key: str | None, xml: bytes) -> None:
+        """
+        Guarda un archivo XML generado en la caché y elimina las entradas más antiguas
+        si se supera `XML_CACHE_MAX_ENTRIES`. Los errores se ignoran: la caché es opcional.
+
+        Args:
+            key (str | None): Clave de la caché (None si no se pudo calcular).
+            xml (bytes): Contenido del archivo XML generado.
+        """
+        if key is None:
+            return
+        try:
+            os.makedirs(self.xml_cache_dir, exist_ok=True)
+            tmp_path = os.path.join(self.xml_cache_dir, f"{key}.xml.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(xml)
+            os.replace(tmp_path, os.path.join(self.xml_cache_dir, f"{key}.xml"))
+            __meta: dict = {
+                "key": key,
+                "created": time.time(),
+                "image": self.image,
+                "ctf_image": self.ctf_image,
+                "size": len(xml),
+            }
+            with open(os.path.join(self.xml_cache_dir, f"{key}.json"), "w") as f:
+                json.dump(__meta, f)
+            for entry in self.__xml_cache_entries()[XML_CACHE_MAX_ENTRIES:]:
+                self.__remove_xml_cache_entry(entry["key"])
+        except OSError:
+            pass
+
+    def __xml_cache_entries(self) -> list[dict]:
+        """
+        Obtiene las entradas de la caché de archivos XML, de la más reciente a la más
+        antigua.
+
+        Returns:
+            list[dict]: Metadatos de cada entrada.
+        """
+        if not os.path.isdir(self.xml_cache_dir):
+            return []
+        entries: list[dict] = []
+        for filename in os.listdir(self.xml_cache_dir):
+            key, ext = os.path.splitext(filename)
+            if ext != ".xml":
+                continue
+            xml_path = os.path.join(self.xml_cache_dir, filename)
+            try:
+                with open(os.path.join(self.xml_cache_dir, f"{key}.json")) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {
+                    "key": key,
+                    "created": os.path.getmtime(xml_path),
+                    "size": os.path.getsize(xml_path),
+                }
+            entries.append(meta)
+        return sorted(entries, key=lambda e: e.get("created", 0), reverse=True)
+
+    def __remove_xml_cache_entry(self, key: str) -> None:
+        """
+        Elimina una entrada de la caché de archivos XML.
+
+        Args:
+            key (str): Clave de la caché.
+        """
+        for ext in (".xml", ".json"):
+            try:
+                os.remove(os.path.join(self.xml_cache_dir, f"{key}{ext}"))
+            except FileNotFoundError:
+                pass
+
+    def xml_cache(self) -> ManagerResult:
+        """
+        Obtiene las entradas de la caché de archivos missions.xml.
+
+        Returns:
+            ManagerResult: Resultado con la ruta de la caché y sus entradas.
+        """
+        try:
+            return ManagerResult.ok(
+                message="Missions cache retrieved",
+                data={"path": self.xml_cache_dir, "entries": self.__xml_cache_entries()},
+            )
+        except OSError as e:
+            return ManagerResult.failure(
+                message="Missions cache couldn't be read", error=str(e)
+            )
+
+    def evict_xml_cache(self, key: str | None = None) -> ManagerResult:
+        """
+        Elimina una entrada de la caché de archivos missions.xml o la caché completa.
+
+        Args:
+            key (str | None): Clave de la entrada. Si es None se vacía la caché.
+
+        Returns:
+            ManagerResult: Resultado con las claves eliminadas.
+        """
+        try:
+            keys: list[str] = [e["key"] for e in self.__xml_cache_entries()]
+            if key is not None:
+                if key not in keys:
+                    return ManagerResult.failure(
+                        message="Missions cache entry not found", error=key
+                    )
+                keys = [key]
+            for __key in keys:
+                self.__remove_xml_cache_entry(__key)
+            return ManagerResult.ok(
+                message=f"{len(keys)} missions cache entries evicted",
+                data={"evicted": keys},
+            )
+        except OSError as e:
+            return ManagerResult.failure(
+                message="Missions cache couldn't be evicted", error=str(e)
+            )
+
+    def refresh_country_mapping(self, url: str | None = None) -> ManagerResult:
+        """
+        Actualiza la copia del mapeo de países de fbctf incluida en Engine/configs con
+        la versión publicada (o la de un espejo) y regenera el YAML del CLI de CTF.
+
+        Args:
+            url (str | None): URL de descarga. Por defecto, la del repositorio de Juice Shop.
+
+        Returns:
+            ManagerResult: Resultado con la ruta, el tamaño y el sha256 del archivo.
+        """
+        __url: str = url or COUNTRY_MAPPING_URL
+        try:
+            resp = requests.get(__url, timeout=30)
+            resp.raise_for_status()
+            if not isinstance(yaml.safe_load(resp.content), dict):
+                return ManagerResult.failure(
+                    message="Country mapping couldn't be refreshed",
+                    error=f"{__url} is not a YAML mapping",
+                )
+            path = self.config.country_mapping_path
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(resp.content)
+            os.replace(tmp_path, path)
+            __yaml: dict = self.config.generate_yaml()
+            if __yaml["status"] == Status.ERROR:
+                return ManagerResult.failure(
+                    message="Country mapping saved but YAML couldn't be regenerated",
+                    error=__yaml["message"],
+                )
+            return ManagerResult.ok(
+                message="Country mapping refreshed",
+                data={
+                    "path": str(path),
+                    "url": __url,
+                    "size": len(resp.content),
+                    "sha256": hashlib.sha256(resp.content).hexdigest(),
+                },
+            )
+        except (requests.exceptions.RequestException, yaml.YAMLError, OSError) as e:
+            return ManagerResult.failure(
+                message="Country mapping couldn't be refreshed", error=str(e)
+            )
+
+    def __save_handouts(self) -> None:
+        """
+        Guarda en disco los momentos de entrega de las instancias del pool, que no se
+        guardan en Docker. Los errores se ignoran.
+        """
+        if self.state_table is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.handouts_path), exist_ok=True)
+            tmp_path = f"{self.handouts_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.state_table.handouts(), f)
+            os.replace(tmp_path, self.handouts_path)
+        except OSError:
+            pass
+
+    def __load_handouts(self) -> dict[str, float]:
+        """
+        Lee los momentos de entrega guardados con `__save_handouts`.
+
+        Returns:
+            dict[str, float]: Nombre del contenedor -> momento de la entrega (epoch).
+        """
+        try:
+            with open(self.handouts_path, "r") as f:
+                handouts = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return handouts if isinstance(handouts, dict) else {}
+
+    def adopt(self) -> ManagerResult:
+        """
+        Recupera los contenedores de Juice Shop que siguen en marcha tras reiniciar el
+        motor en modo persistente, a partir de un único listado de Docker (o de la
+        tabla de estado). El índice de puertos y la expiración salen de ese listado;
+        las instancias del pool que no se habían entregado vuelven al pool.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        try:
+            records: dict[str, ContainerRecord] = self.__snapshot()
+            if self.state_table is not None:
+                self.state_table.restore_handouts(self.__load_handouts())
+                handed_out = set(self.state_table.handouts())
+            else:
+                handed_out = set()
+            with self.__allocator_lock:
+                self.__allocator = None
+            self.__port_allocator()
+
+            __running: list[ContainerRecord] = sorted(
+                (
+                    r
+                    for r in records.values()
+                    if r.status == "running"
+                ),
+                key=lambda r: r.name,
+            )
+            __warm: list[tuple[str, int]] = [
+                (r.name, r.port if r.port > 0 else self.__port_of(r.name))
+                for r in __running
+                if r.labels.get("pool") == "warm" and r.name not in handed_out
+            ]
+            for name, port in __warm:
+                self.__probe(name, port)
+            with self.__pool_lock:
+                __known = {name for name, _ in self.__pool}
+                __free = max(0, self.pool_size - len(self.__pool))
+                __adopted = [w for w in __warm if w[0] not in __known][:__free]
+                self.__pool.extend(__adopted)
+            # Las instancias del pool que sobran se eliminan
+            __pooled = __known | {name for name, _ in __adopted}
+            __extra = [name for name, _ in __warm if name not in __pooled]
+            if __extra:
+                self.__remove_containers(__extra)
+            return ManagerResult.ok(
+                message="Juice Shop containers adopted",
+                data={
+                    "containers": len(__running) - len(__extra),
+                    "pool": len(__adopted),
+                    "handed_out": len(handed_out),
+                },
+            )
+        except Exception as e:
+            return ManagerResult.failure(
+                message="Juice Shop containers couldn't be adopted", error=str(e)
+            )
+
+    def release(self) -> ManagerResult:
+        """
+        Libera los recursos del manager sin detener los contenedores, que se recuperan
+        con `adopt` al volver a arrancar el motor.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        try:
+            if self.state_table is not None:
+                self.state_table.remove_listener(self.__on_state_change)
+            self.__save_handouts()
+            # Las instancias que aún arrancan se quedan con el label del pool y se
+            # recuperan con `adopt`
+            if self.__pool_executor is not None:
+                self.__pool_executor.shutdown(wait=False, cancel_futures=True)
+            if self.__owns_prober:
+                self.prober.stop()
+            return ManagerResult.ok(message="Juice Shop containers left running")
+        except Exception as e:
+            return ManagerResult.failure(
+                message="Juice Shop could not be released", error=str(e)
+            )
+
+    def __on_exit(self) -> None:
+        """
+        Cierre del proceso: en modo persistente los contenedores siguen en marcha.
+        """
+        if self.persistent:
+            self.release()
+        else:
+            self.cleanup()
+
     def cleanup(self) -> ManagerResult:
         """
         Detiene y elimina todos los contenedores Juice Shop y libera los recursos.
@@ -740,7 +2258,14 @@ class JuiceShopManager(BaseManager):
             ManagerResult: Resultado de la operación.
         """
         try:
+            if self.state_table is not None:
+                self.state_table.remove_listener(self.__on_state_change)
+            self.__drain_pool()
+            if self.__pool_executor is not None:
+                self.__pool_executor.shutdown(wait=False, cancel_futures=True)
             __res: ManagerResult = self.stop()
+            if self.__owns_prober:
+                self.prober.stop()
             if not __res.success:
                 return __res
             return ManagerResult.ok(message="Juice Shop cleanup successful!")
@@ -1,11 +1,17 @@
-import logging, time, asyncio, threading, docker, docker.errors
+import logging, time, asyncio, threading, docker
+from collections.abc import Callable
 from ..utils import Logger
 from .redisManager import RedisManager
+from .containerStateTable import ContainerStateTable, ContainerRecord, list_containers
+from .expiryScheduler import ExpiryScheduler
+from .idleDetector import IdleDetector
 from Models import ManagerResult, ManagerResult, RedisPayload
-from docker.models.containers import Container
 from docker import DockerClient
 from ..api import JuiceBoxAPI
-from datetime import datetime, timezone, timedelta
+
+
+# Segundos hasta reintentar la expiración de un contenedor que no se pudo detener
+EXPIRY_RETRY_DELAY: float = 30.0
 
 
 class Monitor:
@@ -14,7 +20,15 @@ class Monitor:
 
     ## Características
     - Gestión de logs mediante un logger personalizado.
-    - Monitorización de contenedores Docker en segundo plano.
+    - Monitorización de contenedores Docker en segundo plano, por eventos de Docker
+      (backend "events") o por consultas periódicas (backend "polling").
+    - Con el backend "events", la expiración de los contenedores de Juice Shop la
+      lleva un `ExpiryScheduler` que se alimenta de la tabla de estado.
+    - Con el backend "events", un `IdleDetector` reclama las instancias entregadas que
+      llevan demasiado tiempo sin actividad de red ni CPU, tras avisar al cliente. Antes
+      puede hibernarlas (pausarlas) con el `hibernate_handler` del motor.
+    - Si el motor registra un `expire_handler`, los contenedores vencidos se detienen
+      en el propio proceso y en lote; si no, se usa la API de JuiceBox Engine.
     - Publicación de eventos a través de Redis en dos canales:
       uno para administradores y otro para clientes.
 
@@ -39,6 +53,10 @@ class Monitor:
         js_containers: list[str] | None = None,
         # Redis:
         redis_manager: RedisManager | None = None,
+        # Eventos de Docker:
+        state_table: ContainerStateTable | None = None,
+        backend: str = "events",
+        reconcile_interval: float = 300.0,
     ):
         """
         Inicializa el monitor del sistema Juice Box.
@@ -52,6 +70,12 @@ class Monitor:
             rtb_containers (list[str]): Nombres de contenedores de RootTheBox.
             js_containers (list[str]): Nombres de contenedores de JuiceShop.
             redis_manager (RedisManager | None): Gestor Redis opcional.
+            state_table (ContainerStateTable | None): Tabla de estado mantenida por los
+                eventos de Docker. Necesaria para el backend "events".
+            backend (str): "events" para publicar los cambios al recibir los eventos de
+                Docker o "polling" para consultar Docker cada `container_poll_interval`.
+            reconcile_interval (float): Segundos entre barridos de reconciliación con
+                Docker en el backend "events", por si se pierde algún evento.
         """
         # Logger base
         self.logger = Logger(
@@ -74,6 +98,42 @@ class Monitor:
 
         # Diccionario: nombre_de_contenedor → último estado
         self.__last_statuses: dict[str, str] = {}
+        self.__status_lock = threading.Lock()
+
+        # Backend de eventos de Docker
+        self.__state_table: ContainerStateTable | None = state_table
+        self.backend: str = (
+            "events" if backend == "events" and state_table is not None else "polling"
+        )
+        self._reconcile_interval = reconcile_interval
+        self.__listening: bool = False
+        # Contenedores de Juice Shop con una expiración en curso
+        self.__expiring: set[str] = set()
+        # Protege `__expiring` entre el planificador, el detector de inactividad y el loop
+        self.__expiring_lock = threading.Lock()
+        # Planificador de vencimientos (solo con el backend "events")
+        self.__expiry: ExpiryScheduler | None = (
+            ExpiryScheduler(self.__expire_batch) if self.backend == "events" else None
+        )
+        # Función del motor que detiene en lote los contenedores vencidos
+        self.__expire_handler: Callable[[list[str]], ManagerResult] | None = None
+        # Función del motor que pausa en lote las instancias inactivas
+        self.__hibernate_handler: (
+            Callable[[dict[str, float]], ManagerResult] | None
+        ) = None
+        # Detector de instancias inactivas (solo con el backend "events")
+        self.__idle: IdleDetector | None = (
+            IdleDetector(
+                self.__docker_client,
+                state_table,
+                on_warn=self.__warn_idle,
+                on_idle=self.__reclaim_idle,
+                on_hibernate=self.__hibernate_idle,
+                on_error=self.error,
+            )
+            if self.backend == "events"
+            else None
+        )
 
         # Contenedores
         self.set_containers(rtb_containers, js_containers)
@@ -161,6 +221,9 @@ class Monitor:
         """
         self.rtb_containers = rtb if rtb else []
         self.js_containers = js if js else []
+        if self.__state_table is not None:
+            # Los contenedores de Root The Box no tienen label, se siguen por nombre
+            self.__state_table.track_names(self.rtb_containers + self.js_containers)
 
     def __container_monitor_loop(self) -> None:
         """
@@ -200,100 +263,396 @@ class Monitor:
 
         loop.close()
 
-    def __process_all_containers(self, loop: asyncio.AbstractEventLoop) -> None:
+    def __container_event_loop(self) -> None:
         """
-        Procesa todos los contenedores conocidos:
-          - Actualiza su estado.
-          - Expira automáticamente los contenedores JS que superen su lifespan.
-          - Guarda las tareas de expiración en self.__expiration_tasks.
+        Bucle del backend "events", ejecutado en un hilo de fondo.
+
+        Funciones principales:
+          - Los cambios de estado se publican al instante desde los eventos de Docker
+            (ver `__on_state_change`), por lo que aquí no se consulta Docker.
+          - La expiración la lleva el `ExpiryScheduler` (ver `__schedule_expiry`).
+          - Cada `reconcile_interval` segundos recarga la tabla con una única llamada a
+            Docker por si se perdió algún evento.
+          - Si la tabla no está lista (stream de eventos cortado), consulta Docker
+            como el backend "polling" hasta que se recupere.
+        """
+        table: ContainerStateTable = self.__state_table
+        last_reconcile: float = time.monotonic()
+        self.__publish_from_table()
+
+        while self._monitoring:
+            try:
+                if not table.ready:
+                    self.__process_all_containers(None)
+                elif time.monotonic() - last_reconcile >= self._reconcile_interval:
+                    table.seed()
+                    self.__publish_from_table()
+                    last_reconcile = time.monotonic()
+            except Exception as e:
+                self.error(f"Monitor containers error: {e}")
+
+            time.sleep(self._interval)
+
+    def __on_state_change(self, container_name: str, record: ContainerRecord | None) -> None:
+        """
+        Recibe los cambios de la tabla de estado (hilo de eventos de Docker) y los
+        publica si el contenedor está monitorizado.
 
         Args:
-            loop: Loop de asyncio para crear tareas.
+            container_name (str): Nombre del contenedor.
+            record (ContainerRecord | None): Nuevo estado o None si se eliminó.
         """
-        containers = self.rtb_containers + self.js_containers
-        for container_name in containers:
-            container = self.__get_container(container_name)
-            if not container:
-                # Si el contenedor no existe
-                if self.__last_statuses.get(container_name) != "not_found":
-                    self.change_status(container_name, "not_found")
-                    self.warning(f"Container '{container_name}' does not exist.")
-                continue
+        if container_name not in self.rtb_containers and container_name not in self.js_containers:
+            return
+        self.change_status(container_name, record.status if record else "not_found")
 
-            labels = container.labels or {}
+    def __publish_from_table(self) -> None:
+        """
+        Publica el estado de todos los contenedores monitorizados según la tabla,
+        incluidos los que no existen.
+        """
+        table: ContainerStateTable = self.__state_table
+        for container_name in self.rtb_containers + self.js_containers:
+            record = table.get(container_name)
+            self.change_status(container_name, record.status if record else "not_found")
 
-            # Solo contenedores JuiceShop con label program=JS se procesan para expirar
-            if labels.get("program") == "JS" and self.__is_container_expired(container):
-                # Se crea una tarea asyncio para expirar
-                task = loop.create_task(self.__expire_container(container))
-                self.__expiration_tasks.append(task)
-                continue
+    def set_expire_handler(
+        self, handler: Callable[[list[str]], ManagerResult] | None
+    ) -> None:
+        """
+        Registra la función con la que el motor detiene los contenedores vencidos sin
+        pasar por su socket.
 
-            # Procesar estado normal (para RTB o JS que no expiran)
-            self.__process_single_container(container)
+        Args:
+            handler (Callable[[list[str]], ManagerResult] | None): Recibe los nombres
+                de los contenedores y devuelve el resultado del manager, con el de cada
+                contenedor en `data.containers`. None para volver a usar la API.
+        """
+        self.__expire_handler = handler
+
+    def set_hibernate_handler(
+        self, handler: Callable[[dict[str, float]], ManagerResult] | None
+    ) -> None:
+        """
+        Registra la función con la que el motor pausa las instancias inactivas.
+
+        Args:
+            handler (Callable[[dict[str, float]], ManagerResult] | None): Recibe los
+                nombres de los contenedores y los núcleos de CPU que usaban, y devuelve
+                el resultado del manager. None desactiva la hibernación.
+        """
+        self.__hibernate_handler = handler
 
-    def __get_container(self, container_name: str) -> Container | None:
+    def set_idle_policy(
+        self,
+        idle_timeout: int,
+        grace: int,
+        sample_interval: int,
+        sample_rate: int,
+        hibernate_after: int = 0,
+    ) -> None:
         """
-        Obtiene un objeto `Container` de Docker por nombre.
+        Configura la hibernación y la reclamación de instancias inactivas. Solo tiene
+        efecto con el backend "events".
+
+        Args:
+            idle_timeout (int): Minutos sin actividad para reclamar (0 = desactivado).
+            grace (int): Minutos de aviso antes de reclamar.
+            sample_interval (int): Segundos entre dos muestras de la misma instancia.
+            sample_rate (int): Consultas de estadísticas a Docker por segundo.
+            hibernate_after (int): Minutos sin actividad para pausar (0 = desactivado).
+        """
+        if self.__idle is None:
+            return
+        self.__idle.configure(
+            idle_timeout=idle_timeout * 60,
+            grace=grace * 60,
+            interval=sample_interval,
+            rate=sample_rate,
+            hibernate_after=hibernate_after * 60,
+        )
+
+    def __hibernate_idle(self, cpu_rates: dict[str, float]) -> None:
+        """
+        Pausa un lote de instancias inactivas con el `hibernate_handler` del motor
+        (hilo del `IdleDetector`).
+
+        Args:
+            cpu_rates (dict[str, float]): Núcleos de CPU que usaba cada contenedor.
+        """
+        if self.__hibernate_handler is None:
+            return
+        self.info(f"Hibernating {len(cpu_rates)} idle container(s)")
+        try:
+            result: ManagerResult = self.__hibernate_handler(cpu_rates)
+        except Exception as e:
+            self.error(f"Failed to hibernate containers {list(cpu_rates)}: {e}")
+            return
+        for container in (result.data or {}).get("containers", []):
+            if container.get("status") == "error":
+                self.error(
+                    f"Failed to hibernate container {container.get('container')}: "
+                    f"{container.get('error')}"
+                )
+
+    def __warn_idle(self, container_name: str, remaining: float) -> None:
+        """
+        Avisa por los canales de Redis de que una instancia se va a reclamar por
+        inactividad (hilo del `IdleDetector`).
 
         Args:
             container_name (str): Nombre del contenedor.
+            remaining (float): Segundos que quedan para reclamarlo.
+        """
+        self.warning(
+            f"Container {container_name} is idle, reclaiming in {round(remaining)} s"
+        )
+        payload = RedisPayload.from_dict(
+            {
+                "container": container_name,
+                "status": "running",
+                "event": "idle_warning",
+                "data": {"reclaim_in": round(remaining)},
+            }
+        )
+        self.__redis.publish_to_admin(payload)
+        self.__redis.publish_to_client(payload)
+
+    def __reclaim_idle(self, names: list[str]) -> None:
+        """
+        Reclama un lote de instancias inactivas igual que si hubieran vencido (hilo del
+        `IdleDetector`).
+
+        Args:
+            names (list[str]): Nombres de los contenedores.
+        """
+        self.info(f"Reclaiming {len(names)} idle container(s)")
+        self.__expire_batch(names)
+
+    def __run_expire_handler(self, names: list[str]) -> set[str]:
+        """
+        Detiene un lote de contenedores vencidos con el `expire_handler` del motor.
+
+        Args:
+            names (list[str]): Nombres de los contenedores.
 
         Returns:
-            docker.models.containers.Container | None
+            set[str]: Nombres de los contenedores que no se pudieron detener.
         """
         try:
-            return self.__docker_client.containers.get(container_name)
-        except docker.errors.NotFound:
+            result: ManagerResult = self.__expire_handler(names)
+        except Exception as e:
+            self.error(f"Failed to expire containers {names}: {e}")
+            return set(names)
+        failed: set[str] = set()
+        for container in (result.data or {}).get("containers", []):
+            name = container.get("container")
+            if container.get("status") == "error":
+                failed.add(name)
+                self.error(f"Failed to expire container {name}: {result.error}")
+            else:
+                self.info(f"Expired container {name} on port {container.get('port')}")
+        return failed
+
+    def __expiry_deadline(self, record: ContainerRecord) -> float | None:
+        """
+        Calcula cuándo vence un contenedor de Juice Shop según su lifespan.
+
+        Args:
+            record (ContainerRecord): Registro del contenedor.
+
+        Returns:
+            float | None: Momento (epoch) o None si el contenedor no expira (no es de
+            Juice Shop o es una instancia del pool que aún no se ha entregado).
+        """
+        if record.labels.get("program") != "JS":
             return None
+        started: float | None = record.created
+        if record.labels.get("pool") == "warm":
+            # Las instancias del pool no expiran hasta que se entregan
+            started = (
+                self.__state_table.handed_out_at(record.name)
+                if self.__state_table is not None
+                else None
+            )
+            if started is None:
+                return None
+        lifespan_minutes = int(record.labels.get("lifespan", 180))
+        return started + lifespan_minutes * 60
 
-    def __is_container_expired(self, container: Container) -> bool:
+    def __schedule_expiry(
+        self, container_name: str, record: ContainerRecord | None
+    ) -> None:
         """
-        Verifica si el contenedor ha superado su tiempo de vida.
+        Mantiene el vencimiento de un contenedor al día con los cambios de la tabla de
+        estado (creación, entrega del pool, recuperación tras reiniciar o eliminación).
 
         Args:
-            container (Container): Contenedor Docker.
+            container_name (str): Nombre del contenedor.
+            record (ContainerRecord | None): Nuevo estado o None si se eliminó.
+        """
+        if self.__expiry is None:
+            return
+        with self.__expiring_lock:
+            if container_name in self.__expiring:
+                return
+        deadline = self.__expiry_deadline(record) if record is not None else None
+        if deadline is None:
+            self.__expiry.cancel(container_name)
+        else:
+            self.__expiry.schedule(container_name, deadline)
 
-        Returns:
-            bool: True si ha expirado, False si aún es válido.
+    def __expire_batch(self, names: list[str]) -> None:
         """
-        created_at_str = container.attrs.get("Created")
-        if not created_at_str:
-            return False  # No se puede calcular, se considera activo
+        Expira un lote de contenedores vencidos o inactivos (hilo del `ExpiryScheduler`
+        o del `IdleDetector`).
 
-        created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-        lifespan_minutes = int(
-            container.labels.get("lifespan", 180)
-        )  # predeterminado 180 min
-        expire_at = created_at + timedelta(minutes=lifespan_minutes)
+        Args:
+            names (list[str]): Nombres de los contenedores.
+        """
+        targets: list[tuple[str, int]] = []
+        for name in names:
+            record = self.__state_table.get(name) if self.__state_table else None
+            if record is None:
+                continue  # Ya se eliminó
+            port = record.port if record.port > 0 else self.__port_from_name(name)
+            if port is None:
+                self.error(f"Failed to expire container {name}: unknown port")
+                continue
+            with self.__expiring_lock:
+                if name in self.__expiring:
+                    continue  # Ya se está deteniendo
+                self.__expiring.add(name)
+            targets.append((name, port))
+        if not targets:
+            return
+        self.info(f"Expiring {len(targets)} container(s)")
 
-        return datetime.now(timezone.utc) > expire_at
+        if self.__expire_handler is not None:
+            # Una sola llamada al motor para todo el lote
+            failed: set[str] = set()
+            try:
+                failed = self.__run_expire_handler([name for name, _ in targets])
+            finally:
+                with self.__expiring_lock:
+                    for name, _ in targets:
+                        self.__expiring.discard(name)
+            expired: list[bool] = [name not in failed for name, _ in targets]
+        else:
+
+            async def __expire_all() -> list[bool]:
+                return await asyncio.gather(
+                    *(self.__expire_port(name, port) for name, port in targets)
+                )
 
-    async def __expire_container(self, container: Container) -> None:
+            expired = asyncio.run(__expire_all())
+
+        for (name, _), ok in zip(targets, expired):
+            if not ok and self.__expiry is not None:
+                self.__expiry.schedule(name, time.time() + EXPIRY_RETRY_DELAY)
+
+    def __expire_record(
+        self, record: ContainerRecord, now: float, loop: asyncio.AbstractEventLoop
+    ) -> bool:
         """
-        Expira un contenedor de Juice Shop usando la API de JuiceBox Engine y registra el evento.
+        Crea la tarea de expiración de un contenedor de Juice Shop si ha superado su
+        lifespan (backend "polling").
+
+        Args:
+            record (ContainerRecord): Registro del contenedor.
+            now (float): Momento actual (epoch).
+            loop: Loop de asyncio para crear tareas.
+
+        Returns:
+            bool: True si el contenedor ha expirado.
+        """
+        with self.__expiring_lock:
+            if record.name in self.__expiring:
+                return True
+        deadline = self.__expiry_deadline(record)
+        if deadline is None or now <= deadline:
+            return False
+        port = record.port if record.port > 0 else self.__port_from_name(record.name)
+        if port is None:
+            self.error(f"Failed to expire container {record.name}: unknown port")
+            return False
+        with self.__expiring_lock:
+            if record.name in self.__expiring:
+                return True
+            self.__expiring.add(record.name)
+        task = loop.create_task(self.__expire_port(record.name, port))
+        self.__expiration_tasks.append(task)
+        return True
+
+    def __port_from_name(self, container_name: str) -> int | None:
+        """
+        Obtiene el puerto de un contenedor de Juice Shop a partir de su nombre.
+        Ejemplo: "owasp-juice-shop-3000" -> 3000
+        """
+        digits = container_name[len(container_name.rstrip("0123456789")) :]
+        return int(digits) if digits else None
+
+    async def __expire_port(self, container_name: str, port: int) -> bool:
+        """
+        Expira un contenedor de Juice Shop con el `expire_handler` del motor o, si no
+        hay, por su puerto usando la API de JuiceBox Engine.
 
         Args:
-            container (Container): Contenedor Docker.
+            container_name (str): Nombre del contenedor.
+            port (int): Puerto del host del contenedor.
+
+        Returns:
+            bool: True si el contenedor se ha detenido.
         """
         try:
-            ports_info = container.attrs["NetworkSettings"]["Ports"]
-            host_port = None
-            for _, mappings in ports_info.items():
-                if mappings and isinstance(mappings, list):
-                    host_port = mappings[0]["HostPort"]
-                    break
-
-            if not host_port:
-                raise ValueError(
-                    f"No se pudo obtener el puerto del contenedor {container.name}"
+            if self.__expire_handler is not None:
+                failed = await asyncio.to_thread(
+                    self.__run_expire_handler, [container_name]
                 )
+                return not failed
+            await JuiceBoxAPI.stop_js_container(port)
+            self.info(f"Expired container {container_name} on port {port}")
+            return True
+        except Exception as e:
+            self.error(f"Failed to expire container {container_name}: {e}")
+            return False
+        finally:
+            with self.__expiring_lock:
+                self.__expiring.discard(container_name)
+
+    def __process_all_containers(
+        self, loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        """
+        Procesa todos los contenedores conocidos con un único listado de Docker (más
+        otro para los contenedores de Root The Box, que no tienen label):
+          - Actualiza su estado.
+          - Expira automáticamente los contenedores JS que superen su lifespan.
+          - Guarda las tareas de expiración en self.__expiration_tasks.
 
-            await JuiceBoxAPI.stop_js_container(int(host_port))
-            self.info(f"Expired container {container.name} on port {host_port}")
+        Args:
+            loop: Loop de asyncio para crear tareas. Si es None no se expira nada (el
+                backend "events" expira con el `ExpiryScheduler`).
+        """
+        records: dict[str, ContainerRecord] = list_containers(
+            self.__docker_client, label="program=JS", names=self.rtb_containers
+        )
+        now = time.time()
+        for container_name in self.rtb_containers + self.js_containers:
+            record = records.get(container_name)
+            if record is None:
+                # Si el contenedor no existe
+                if self.__last_statuses.get(container_name) != "not_found":
+                    self.change_status(container_name, "not_found")
+                    self.warning(f"Container '{container_name}' does not exist.")
+                continue
 
-        except Exception as e:
-            self.error(f"Failed to expire container {container.name}: {e}")
+            # Solo contenedores JuiceShop con label program=JS se procesan para expirar
+            if loop is not None and self.__expire_record(record, now, loop):
+                continue
+
+            # Procesar estado normal (para RTB o JS que no expiran)
+            self.change_status(container_name, record.status)
 
     def __cleanup_finished_tasks(self) -> None:
         """
@@ -301,17 +660,6 @@ class Monitor:
         """
         self.__expiration_tasks = [t for t in self.__expiration_tasks if not t.done()]
 
-    def __process_single_container(self, container: Container) -> None:
-        """
-        Procesa un único contenedor: detecta cambios de estado y publica eventos.
-
-        Args:
-            container: Objeto del contenedor Docker.
-        """
-        current_status = container.status
-        container_name = container.name or ""
-        self.change_status(container_name, current_status)
-
     def change_status(self, container_name: str, current_status: str) -> None:
         """
         Cambia el estado/status de un único contenedor.
@@ -320,13 +668,14 @@ class Monitor:
             container_name: Nombre del contenedor Docker.
             current_status: Nuevo estado del contenedor.
         """
-        last_status = self.__last_statuses.get(container_name)
-        # Si el estado no ha cambiado, no se hace nada
-        if last_status == current_status:
-            return
+        with self.__status_lock:
+            last_status = self.__last_statuses.get(container_name)
+            # Si el estado no ha cambiado, no se hace nada
+            if last_status == current_status:
+                return
 
-        # Se actualiza el último estado registrado
-        self.__last_statuses[container_name] = current_status
+            # Se actualiza el último estado registrado
+            self.__last_statuses[container_name] = current_status
 
         self.info(
             f"--> Container '{container_name}' status changed: {current_status} <--"
@@ -353,11 +702,21 @@ class Monitor:
         if self._monitoring:
             return
         self._monitoring = True
-        self._monitor_thread = threading.Thread(
-            target=self.__container_monitor_loop, daemon=True
-        )
+        target = self.__container_monitor_loop
+        if self.backend == "events":
+            if not self.__listening:
+                self.__state_table.add_listener(self.__on_state_change)
+                self.__state_table.add_listener(self.__schedule_expiry)
+                self.__listening = True
+            # Vencimientos de los contenedores que ya existen (creados o recuperados)
+            for record in self.__state_table.records():
+                self.__schedule_expiry(record.name, record)
+            self.__expiry.start()
+            self.__idle.start()
+            target = self.__container_event_loop
+        self._monitor_thread = threading.Thread(target=target, daemon=True)
         self._monitor_thread.start()
-        self.info("Docker container monitoring started...")
+        self.info(f"Docker container monitoring started ({self.backend})...")
 
     def stop_container_monitoring(self) -> ManagerResult:
         """
@@ -370,6 +729,10 @@ class Monitor:
             if not self._monitoring:
                 return ManagerResult.ok(message="Monitor is not running")
             self._monitoring = False
+            if self.__expiry is not None:
+                self.__expiry.stop()
+            if self.__idle is not None:
+                self.__idle.stop()
             if self._monitor_thread:
                 self._monitor_thread.join(timeout=self._interval + 1)
             self.info("Docker container monitoring stopped.")
@@ -0,0 +1,163 @@
+import heapq, threading
+from collections.abc import Iterable
+
+
+class PortAllocator:
+    """
+    Índice de puertos libres y ocupados de un rango.
+
+    ## Operaciones
+    - **reserve:** Aparta el menor puerto libre para un arranque en curso. O(log n).
+    - **reserve_many:** Aparta varios puertos libres en una sola operación atómica.
+    - **commit:** Confirma un puerto reservado como ocupado.
+    - **release:** Devuelve un puerto reservado u ocupado a la lista de libres.
+    - **mark_used:** Marca un puerto como ocupado (p.ej. por un evento de Docker).
+    - **forget:** Libera un puerto ocupado sin afectar a las reservas en curso.
+    - **reconcile:** Reconstruye el índice a partir de los puertos ocupados en Docker.
+
+    Las operaciones son atómicas, por lo que dos arranques simultáneos nunca reciben el
+    mismo puerto. Los puertos libres se entregan de menor a mayor.
+    """
+
+    def __init__(
+        self, starting_port: int, ending_port: int, used: Iterable[int] = ()
+    ) -> None:
+        """
+        Inicializa el índice con todos los puertos del rango libres salvo `used`.
+
+        Args:
+            starting_port (int): Puerto inicial del rango.
+            ending_port (int): Puerto final del rango (incluido).
+            used (Iterable[int]): Puertos ya ocupados.
+        """
+        self.starting_port: int = starting_port
+        self.ending_port: int = ending_port
+        self.__lock = threading.Lock()
+        # Montículo de puertos libres; `__free_set` indica cuáles siguen siéndolo
+        self.__free: list[int] = []
+        self.__free_set: set[int] = set()
+        self.__reserved: set[int] = set()
+        self.__used: set[int] = set()
+        self.reconcile(used)
+
+    def __in_range(self, port: int) -> bool:
+        """
+        Indica si un puerto pertenece al rango.
+        """
+        return self.starting_port <= port <= self.ending_port
+
+    def __free_port(self, port: int) -> None:
+        """
+        Marca un puerto como libre. Se llama con el candado adquirido.
+        """
+        self.__used.discard(port)
+        if self.__in_range(port) and port not in self.__free_set:
+            self.__free_set.add(port)
+            heapq.heappush(self.__free, port)
+
+    def reconcile(self, used: Iterable[int]) -> None:
+        """
+        Reconstruye el índice a partir de los puertos ocupados. Las reservas en curso
+        se conservan.
+
+        Args:
+            used (Iterable[int]): Puertos ocupados según Docker.
+        """
+        with self.__lock:
+            self.__used = {p for p in used if self.__in_range(p)}
+            taken = self.__used | self.__reserved
+            # El rango ya está ordenado, por lo que es un montículo válido
+            self.__free = [
+                p for p in range(self.starting_port, self.ending_port + 1) if p not in taken
+            ]
+            self.__free_set = set(self.__free)
+
+    def reserve(self) -> int | None:
+        """
+        Aparta el menor puerto libre disponible.
+
+        Returns:
+            int | None: Puerto reservado o None si no quedan puertos libres.
+        """
+        ports = self.reserve_many(1)
+        return ports[0] if ports else None
+
+    def reserve_many(self, count: int) -> list[int]:
+        """
+        Aparta hasta `count` puertos libres en una sola operación atómica.
+
+        Args:
+            count (int): Número de puertos a reservar.
+
+        Returns:
+            list[int]: Puertos reservados (menos de `count` si no quedan suficientes).
+        """
+        with self.__lock:
+            ports: list[int] = []
+            while self.__free and len(ports) < count:
+                port = heapq.heappop(self.__free)
+                # El montículo puede tener entradas obsoletas (borrado perezoso)
+                if port in self.__free_set:
+                    self.__free_set.discard(port)
+                    self.__reserved.add(port)
+                    ports.append(port)
+            return ports
+
+    def commit(self, port: int) -> None:
+        """
+        Confirma un puerto como ocupado.
+
+        Args:
+            port (int): Puerto reservado.
+        """
+        with self.__lock:
+            self.__reserved.discard(port)
+            self.__free_set.discard(port)
+            if self.__in_range(port):
+                self.__used.add(port)
+
+    def mark_used(self, port: int) -> None:
+        """
+        Marca un puerto como ocupado aunque no se haya reservado.
+
+        Args:
+            port (int): Puerto ocupado.
+        """
+        self.commit(port)
+
+    def release(self, port: int) -> None:
+        """
+        Devuelve un puerto a la lista de libres.
+
+        Args:
+            port (int): Puerto reservado u ocupado.
+        """
+        with self.__lock:
+            self.__reserved.discard(port)
+            self.__free_port(port)
+
+    def forget(self, port: int) -> None:
+        """
+        Libera un puerto ocupado cuyo contenedor ha desaparecido de Docker. A diferencia
+        de `release`, no toca las reservas en curso.
+
+        Args:
+            port (int): Puerto ocupado.
+        """
+        with self.__lock:
+            if port not in self.__reserved:
+                self.__free_port(port)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Obtiene el número de puertos libres, reservados y ocupados.
+
+        Returns:
+            dict[str, int]: Contadores del índice.
+        """
+        with self.__lock:
+            return {
+                "free": len(self.__free_set),
+                "reserved": len(self.__reserved),
+                "used": len(self.__used),
+            }
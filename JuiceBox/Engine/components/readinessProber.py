@@ -0,0 +1,323 @@
+import asyncio, itertools, threading, time
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future
+
+
+# Espera entre intentos: empieza en INITIAL_BACKOFF y se multiplica por BACKOFF_FACTOR
+# hasta MAX_BACKOFF (segundos)
+INITIAL_BACKOFF: float = 0.25
+BACKOFF_FACTOR: float = 2.0
+MAX_BACKOFF: float = 5.0
+
+# Segundos máximos de un intento (conexión y línea de estado HTTP)
+ATTEMPT_TIMEOUT: float = 2.0
+
+
+class ReadinessProber:
+    """
+    Comprueba si las instancias de Juice Shop ya responden por HTTP. Docker marca un
+    contenedor como `running` mucho antes de que la aplicación de Node atienda
+    peticiones.
+
+    ## Características
+    - Las sondas se ejecutan concurrentemente en un bucle de asyncio propio, en un hilo
+      en segundo plano, con esperas crecientes entre intentos.
+    - Usa una petición `GET /` sobre `asyncio.open_connection`, sin dependencias extra.
+    - Solo hay una sonda por contenedor; pedirla de nuevo devuelve la misma.
+    - Cuando una instancia responde con 200 queda marcada como lista y se llama a las
+      funciones registradas con `add_listener`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1") -> None:
+        """
+        Inicializa el comprobador sin arrancar su bucle de eventos.
+
+        Args:
+            host (str): Host donde se publican los puertos de las instancias.
+        """
+        self.host: str = host
+        self.__lock = threading.Lock()
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__thread: threading.Thread | None = None
+        self.__tokens = itertools.count()
+        # Sondas en curso: nombre -> (token, puerto, futuro)
+        self.__probes: dict[str, tuple[int, int, Future]] = {}
+        # Instancias listas: nombre -> momento (epoch) en que respondieron
+        self.__ready: dict[str, float] = {}
+        self.__listeners: list[Callable[[str, int, float], None]] = []
+
+    # ─── Consultas ──────────────────────────────────────────────────────────────
+
+    def is_ready(self, name: str) -> bool:
+        """
+        Indica si una instancia ya responde por HTTP.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            bool: True si la instancia está lista.
+        """
+        with self.__lock:
+            return name in self.__ready
+
+    def ready_since(self, name: str) -> float | None:
+        """
+        Obtiene el momento en que una instancia empezó a responder.
+
+        Args:
+            name (str): Nombre del contenedor.
+
+        Returns:
+            float | None: Momento (epoch) o None si no está lista.
+        """
+        with self.__lock:
+            return self.__ready.get(name)
+
+    def wait(self, name: str, timeout: float | None = None) -> bool:
+        """
+        Espera a que termine la sonda de una instancia.
+
+        Args:
+            name (str): Nombre del contenedor.
+            timeout (float | None): Tiempo máximo de espera en segundos.
+
+        Returns:
+            bool: True si la instancia está lista; False si no hay sonda en curso, si
+            la sonda ha fallado o se ha cancelado, o si se agota el tiempo.
+        """
+        with self.__lock:
+            if name in self.__ready:
+                return True
+            entry = self.__probes.get(name)
+        if entry is None:
+            return False
+        try:
+            return bool(entry[2].result(timeout))
+        except (TimeoutError, CancelledError):
+            return self.is_ready(name)
+
+    async def wait_async(self, name: str, timeout: float | None = None) -> bool:
+        """
+        Igual que `wait`, pero espera en el event loop que lo llama sin ocupar un hilo.
+
+        Args:
+            name (str): Nombre del contenedor.
+            timeout (float | None): Tiempo máximo de espera en segundos.
+
+        Returns:
+            bool: True si la instancia está lista.
+        """
+        with self.__lock:
+            if name in self.__ready:
+                return True
+            entry = self.__probes.get(name)
+        if entry is None:
+            return False
+        try:
+            # shield: agotar el tiempo no debe cancelar la sonda compartida
+            return bool(
+                await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(entry[2])), timeout
+                )
+            )
+        except TimeoutError:
+            return self.is_ready(name)
+        except asyncio.CancelledError:
+            if not entry[2].cancelled():
+                raise  # Se canceló quien espera, no la sonda
+            return self.is_ready(name)
+
+    # ─── Sondas ─────────────────────────────────────────────────────────────────
+
+    def add_listener(self, listener: Callable[[str, int, float], None]) -> None:
+        """
+        Registra una función que se llama con (nombre, puerto, segundos de espera)
+        cuando una instancia empieza a responder.
+
+        Args:
+            listener (Callable[[str, int, float], None]): Función a registrar.
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, int, float], None]) -> None:
+        """
+        Elimina una función registrada con `add_listener`.
+
+        Args:
+            listener (Callable[[str, int, float], None]): Función registrada.
+        """
+        with self.__lock:
+            if listener in self.__listeners:
+                self.__listeners.remove(listener)
+
+    def probe(self, name: str, port: int, timeout: float) -> Future:
+        """
+        Empieza a comprobar una instancia si no se está comprobando ya.
+
+        Args:
+            name (str): Nombre del contenedor.
+            port (int): Puerto publicado en el host.
+            timeout (float): Segundos máximos hasta que la instancia responda.
+
+        Returns:
+            Future: Futuro que se resuelve con True cuando la instancia responde o con
+            False si se agota el tiempo.
+        """
+        with self.__lock:
+            if name in self.__ready:
+                done: Future = Future()
+                done.set_result(True)
+                return done
+            entry = self.__probes.get(name)
+            if entry is not None and entry[1] == port and not entry[2].done():
+                return entry[2]
+            if entry is not None:
+                entry[2].cancel()
+            token = next(self.__tokens)
+            future = asyncio.run_coroutine_threadsafe(
+                self.__probe(name, port, timeout, token), self.__event_loop()
+            )
+            self.__probes[name] = (token, port, future)
+            return future
+
+    def forget(self, name: str) -> None:
+        """
+        Olvida una instancia (se ha detenido o eliminado) y cancela su sonda.
+
+        Args:
+            name (str): Nombre del contenedor.
+        """
+        with self.__lock:
+            self.__ready.pop(name, None)
+            entry = self.__probes.pop(name, None)
+        if entry is not None:
+            entry[2].cancel()
+
+    def stop(self) -> None:
+        """
+        Cancela las sondas en curso y detiene el bucle de eventos. El bucle se vuelve a
+        crear si se pide otra sonda.
+        """
+        with self.__lock:
+            probes = list(self.__probes.values())
+            self.__probes.clear()
+            self.__ready.clear()
+            loop, thread = self.__loop, self.__thread
+            self.__loop = self.__thread = None
+        for _, _, future in probes:
+            future.cancel()
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), loop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def __event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Obtiene el bucle de eventos de las sondas y lo arranca en un hilo si hace
+        falta. Se llama con el candado adquirido.
+        """
+        if self.__loop is None:
+            loop = asyncio.new_event_loop()
+            self.__thread = threading.Thread(
+                target=self.__run_loop,
+                args=(loop,),
+                name="juice-shop-readiness",
+                daemon=True,
+            )
+            self.__loop = loop
+            self.__thread.start()
+        return self.__loop
+
+    @staticmethod
+    async def __shutdown() -> None:
+        """
+        Espera a que terminen las sondas canceladas y detiene el bucle de eventos.
+        """
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        asyncio.get_running_loop().stop()
+
+    @staticmethod
+    def __run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Hilo que ejecuta el bucle de eventos hasta que se detiene.
+        """
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def __probe(self, name: str, port: int, timeout: float, token: int) -> bool:
+        """
+        Comprueba una instancia hasta que responde o se agota el tiempo.
+
+        Args:
+            name (str): Nombre del contenedor.
+            port (int): Puerto publicado en el host.
+            timeout (float): Segundos máximos de espera.
+            token (int): Identificador de la sonda; si se ha sustituido por otra, su
+                resultado no se registra.
+
+        Returns:
+            bool: True si la instancia responde.
+        """
+        started = time.monotonic()
+        delay = INITIAL_BACKOFF
+        while not await self.__responds(port):
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                with self.__lock:
+                    entry = self.__probes.get(name)
+                    if entry is not None and entry[0] == token:
+                        self.__probes.pop(name)
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * BACKOFF_FACTOR, MAX_BACKOFF)
+
+        elapsed = time.monotonic() - started
+        with self.__lock:
+            entry = self.__probes.get(name)
+            if entry is None or entry[0] != token:
+                return False
+            self.__probes.pop(name)
+            self.__ready[name] = time.time()
+            listeners = list(self.__listeners)
+        for listener in listeners:
+            try:
+                listener(name, port, elapsed)
+            except Exception:
+                pass
+        return True
+
+    async def __responds(self, port: int) -> bool:
+        """
+        Hace un intento de `GET /` contra una instancia.
+
+        Args:
+            port (int): Puerto publicado en el host.
+
+        Returns:
+            bool: True si la instancia responde con el código 200.
+        """
+        writer: asyncio.StreamWriter | None = None
+        try:
+            async with asyncio.timeout(ATTEMPT_TIMEOUT):
+                reader, writer = await asyncio.open_connection(self.host, port)
+                writer.write(
+                    f"GET / HTTP/1.0\r\nHost: {self.host}:{port}\r\n\r\n".encode()
+                )
+                await writer.drain()
+                status_line: bytes = await reader.readline()
+        except (OSError, TimeoutError):
+            return False
+        finally:
+            if writer is not None:
+                writer.close()
+        # "HTTP/1.1 200 OK"
+        parts = status_line.split()
+        return len(parts) >= 2 and parts[1] == b"200"
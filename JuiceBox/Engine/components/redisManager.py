@@ -1,15 +1,23 @@
-import redis, subprocess, os
+import redis, os, re
 from importlib.resources import path
 from ..utils import validate_container
 from Models import BaseManager, RedisPayload, ManagerResult
 from docker.models.containers import Container
 from docker.client import DockerClient
-from docker.errors import APIError
+from docker.errors import APIError, NotFound
 from importlib.resources import files
 from ..utils import validate_container
 from pathlib import Path
 
 
+# Imagen y volumen de datos (clave en el docker-compose) del contenedor Redis
+REDIS_IMAGE: str = "redis:7-alpine"
+REDIS_VOLUME: str = "redis-data"
+
+# Nanosegundos por segundo (unidad de los intervalos del healthcheck de Docker)
+NANOSECONDS: int = 1_000_000_000
+
+
 class JuiceBoxChannels:
     ADMIN = "admin_channel"
     CLIENT = "client_channel"
@@ -17,8 +25,9 @@ class JuiceBoxChannels:
 
 class RedisManager(BaseManager):
     """
-    Clase para gestionar un servidor Redis mediante Docker. Utiliza un archivo
-    docker-compose para crear, iniciar y detener el contenedor de Redis.
+    Clase para gestionar un servidor Redis mediante Docker. Crea, inicia y detiene el
+    contenedor de Redis con el SDK de Docker; el archivo docker-compose de Redis
+    describe el mismo contenedor y ambos comparten el volumen de datos.
     Además, permite publicar mensajes en canales Redis.
 
     ## Características
@@ -35,6 +44,7 @@ class RedisManager(BaseManager):
     - **publish_to_admin(payload):** Publica un mensaje en el canal ADMIN.
     - **publish_to_client(payload):** Publica un mensaje en el canal CLIENT.
     - **close():** Cierra la conexión al cliente Redis.
+    - **release():** Cierra la conexión y deja el contenedor Redis en marcha.
     - **cleanup():** Detiene y elimina el contenedor Redis y cierra la conexión.
     """
 
@@ -80,6 +90,7 @@ class RedisManager(BaseManager):
 
         # Cliente Redis
         redis_password: str | None = self.__get_password("Engine.configs", "redis.conf")
+        self.__password: str | None = redis_password
         self.__set_password(redis_password)
         self.__redis = redis.Redis(
             host=redis_host,
@@ -148,9 +159,48 @@ class RedisManager(BaseManager):
         with env_path.open("w", encoding="utf-8") as f:
             f.writelines(lines)
 
+    def __volume_name(self) -> str:
+        """
+        Obtiene el nombre real del volumen de datos tal y como lo crea docker compose
+        (`<proyecto>_redis-data`), para seguir usando los datos de las instalaciones
+        que arrancaron Redis con el docker-compose. El proyecto es `COMPOSE_PROJECT_NAME`
+        o el nombre de la carpeta del docker-compose normalizado.
+
+        Returns:
+            str: Nombre del volumen de Docker.
+        """
+        project: str = os.environ.get("COMPOSE_PROJECT_NAME") or os.path.basename(
+            os.path.dirname(os.path.abspath(self.__compose_file))
+        )
+        project = re.sub(r"[^a-z0-9_-]", "", project.lower()).lstrip("_-")
+        return f"{project}_{REDIS_VOLUME}"
+
+    def __ensure_volume(self) -> str:
+        """
+        Crea el volumen de datos con los labels de docker compose si no existe, para que
+        el docker-compose lo reconozca como suyo.
+
+        Returns:
+            str: Nombre del volumen de Docker.
+        """
+        name: str = self.__volume_name()
+        try:
+            self.__docker_client.volumes.get(name)
+        except NotFound:
+            self.__docker_client.volumes.create(
+                name=name,
+                driver="local",
+                labels={
+                    "com.docker.compose.project": name[: -len(REDIS_VOLUME) - 1],
+                    "com.docker.compose.volume": REDIS_VOLUME,
+                },
+            )
+        return name
+
     def __create(self) -> ManagerResult:
         """
-        Crea el contenedor Redis usando docker-compose.
+        Crea el contenedor Redis con el SDK de Docker, con la misma definición que el
+        docker-compose de Redis.
 
         Returns:
             ManagerResult: Resultado de la operación.
@@ -158,13 +208,27 @@ class RedisManager(BaseManager):
         try:
             # Si no existe el contenedor, se crea:
             base_dir = os.path.dirname(self.__compose_file)
-            cmd = ["docker", "compose", "-f", self.__compose_file, "up", "-d"]
-            subprocess.run(
-                cmd,
-                cwd=base_dir,
-                check=True,
-                capture_output=True,
-                text=True,
+            volume: str = self.__ensure_volume()
+            self.__docker_client.containers.run(
+                image=REDIS_IMAGE,
+                name=self.container_name,
+                command=["redis-server", "/usr/local/etc/redis/redis.conf"],
+                detach=True,
+                restart_policy={"Name": "unless-stopped"},
+                ports={"6379/tcp": ("127.0.0.1", 6379)},
+                volumes={
+                    volume: {"bind": "/data", "mode": "rw"},
+                    os.path.join(base_dir, "redis.conf"): {
+                        "bind": "/usr/local/etc/redis/redis.conf",
+                        "mode": "ro",
+                    },
+                },
+                healthcheck={
+                    "test": ["CMD", "redis-cli", "-a", self.__password or "", "ping"],
+                    "interval": 10 * NANOSECONDS,
+                    "timeout": 5 * NANOSECONDS,
+                    "retries": 5,
+                },
             )
             if validate_container(self.__docker_client, self.container_name):
                 return ManagerResult.ok(
@@ -174,11 +238,11 @@ class RedisManager(BaseManager):
                 return ManagerResult.failure(
                     message="Redis container couldn't be created."
                 )
-        except subprocess.CalledProcessError as e:
+        except APIError as e:
             return ManagerResult(
                 success=False,
                 message="Error creating Redis container",
-                error=str(e.stdout) + ". " + str(e.stderr),
+                error=str(e),
             )
 
     def start(self) -> ManagerResult:
@@ -326,6 +390,18 @@ class RedisManager(BaseManager):
             return ManagerResult.failure(message="Redis client could not be closed!")
         return ManagerResult.ok(message="Redis client closed successfully!")
 
+    def release(self) -> ManagerResult:
+        """
+        Cierra la conexión con Redis sin detener el contenedor (modo persistente).
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        __res: ManagerResult = self.close()
+        if not __res.success:
+            return __res
+        return ManagerResult.ok(message="Redis container left running")
+
     def cleanup(self) -> ManagerResult:
         """
         Destruye el contenedor y libera los recursos.
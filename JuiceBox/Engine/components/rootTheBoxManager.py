@@ -1,11 +1,13 @@
-import os, subprocess, atexit
+import os, atexit, hashlib, json, shutil
 import yaml
 from docker import errors
 from ..utils import RTBConfig
 from ..utils import validate_container
 from Models import ManagerResult, BaseManager
 from docker import DockerClient
-from docker.models.containers import ContainerCollection
+from concurrent.futures import ThreadPoolExecutor
+from docker.models.containers import Container, ContainerCollection
+from docker.models.images import Image
 
 
 LOGO = """
@@ -33,16 +35,30 @@ LOGO = """
 DEVELOPER = "Edgar Sabido"
 GITHUB_USER = "EdgarSabidoC"
 
+# Número máximo de copias de la base de datos sembrada que se guardan
+DB_SNAPSHOT_MAX_ENTRIES: int = 5
+
+# Imágenes de los contenedores (la de webapp se etiqueta con el hash de su contexto)
+WEBAPP_IMAGE: str = "juicebox/rootthebox-webapp"
+MEMCACHED_IMAGE: str = "memcached:latest"
+
+# Directorios de RootTheBox/ que no forman parte del contexto de construcción
+WEBAPP_CONTEXT_EXCLUDE: frozenset[str] = frozenset({".git", "files", "missions"})
+
 
 class RootTheBoxManager(BaseManager):
     """
     Clase que administra la instancia de Root The Box en contenedores Docker.
 
     ## Operaciones
-    - **start:** Inicia los contenedores de Root The Box.
+    - **start:** Inicia los contenedores de Root The Box con el SDK de Docker (con la
+      base de datos sembrada si hay una copia para las misiones actuales). Si ya están
+      en marcha con la configuración actual, no hace nada.
+    - **save_db_snapshot:** Guarda una copia de la base de datos con las misiones cargadas.
     - **stop:** Detiene y elimina los contenedores de Root The Box.
     - **status:** Obtiene el estado de los contenedores.
     - **show_config:** Muestra la configuración actual.
+    - **release:** Deja los contenedores en marcha al cerrar el motor (modo persistente).
     - **cleanup:** Detiene y elimina los contenedores y libera recursos.
     """
 
@@ -78,8 +94,13 @@ class RootTheBoxManager(BaseManager):
         self.rtb_dir = os.path.abspath(os.path.join(self.project_root, "RootTheBox/"))
         # Ruta absoluta a configs/
         self.configs_dir = os.path.join(self.components_dir, "configs")
+        # Copias de la base de datos sembrada, una por missions.xml
+        self.snapshots_dir = os.path.join(self.components_dir, "cache", "rtb")
+
+        # Modo persistente: al cerrar el motor los contenedores siguen en marcha
+        self.persistent: bool = False
 
-        atexit.register(self.cleanup)
+        atexit.register(self.__on_exit)
 
     @property
     def web_app_port(self) -> int:
@@ -148,7 +169,7 @@ class RootTheBoxManager(BaseManager):
         compose_dict = {
             "services": {
                 "memcached": {
-                    "image": "memcached:latest",
+                    "image": MEMCACHED_IMAGE,
                     "ports": [f"{self.config.memcached_port}:11211"],
                 },
                 "webapp": {
@@ -175,60 +196,339 @@ class RootTheBoxManager(BaseManager):
                 error=str(e),
             )
 
-    def __create(self) -> ManagerResult:
+    def __build_context_hash(self) -> str:
+        """
+        Calcula el hash del contexto de construcción de la imagen webapp (RootTheBox/)
+        a partir de la ruta, el tamaño y la fecha de modificación de cada archivo. Se
+        excluyen los directorios montados como volúmenes y el docker-compose exportado.
+
+        Returns:
+            str: sha256 del contexto.
+        """
+        __digest = hashlib.sha256()
+        for root, dirs, filenames in os.walk(self.rtb_dir):
+            if root == self.rtb_dir:
+                dirs[:] = [d for d in dirs if d not in WEBAPP_CONTEXT_EXCLUDE]
+            dirs.sort()
+            for filename in sorted(filenames):
+                full_path = os.path.join(root, filename)
+                rel_path = os.path.relpath(full_path, self.rtb_dir)
+                if rel_path == self.__rtb_yaml:
+                    continue
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+                __digest.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        return __digest.hexdigest()
+
+    def __webapp_image(self) -> Image:
+        """
+        Obtiene la imagen webapp etiquetada con el hash de su contexto de construcción y
+        solo la construye si no existe.
+
+        Returns:
+            Image: Imagen de la aplicación web de Root The Box.
+        """
+        tag = f"{WEBAPP_IMAGE}:{self.__build_context_hash()[:12]}"
+        try:
+            return self.__docker_client.images.get(tag)
+        except errors.ImageNotFound:
+            image, _ = self.__docker_client.images.build(
+                path=self.rtb_dir, tag=tag, rm=True
+            )
+            return image
+
+    def __stack_hash(self, image: Image, snapshot_key: str | None) -> str:
+        """
+        Calcula el hash de la configuración de los contenedores de Root The Box. Se
+        guarda en el label `config` de cada contenedor.
+
+        Args:
+            image (Image): Imagen webapp.
+            snapshot_key (str | None): Clave del archivo de misiones actual.
+
+        Returns:
+            str: sha256 de la configuración.
+        """
+        __source: dict = {
+            "webapp_image": image.id,
+            "memcached_image": MEMCACHED_IMAGE,
+            "webapp_port": self.web_app_port,
+            "memcached_port": self.memcached_port,
+            "network": self.network_name,
+            "containers": self.get_containers(),
+            "rtb_dir": self.rtb_dir,
+            "missions": snapshot_key,
+        }
+        return hashlib.sha256(
+            json.dumps(__source, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def __stack_matches(self, stack_hash: str) -> bool:
+        """
+        Indica si los contenedores de Root The Box ya están en marcha con la
+        configuración actual.
+
+        Args:
+            stack_hash (str): Hash de la configuración actual.
+
+        Returns:
+            bool: True si ambos contenedores están en marcha con ese hash.
+        """
+        for name in self.get_containers():
+            try:
+                container: Container = self.__docker_client.containers.get(name)
+            except errors.NotFound:
+                return False
+            if (
+                container.status != "running"
+                or container.labels.get("config") != stack_hash
+            ):
+                return False
+        return True
+
+    def __run_service(
+        self, name: str, alias: str, labels: dict[str, str], **kwargs
+    ) -> Container:
+        """
+        Crea y arranca un contenedor de Root The Box en la red de Root The Box con el
+        alias de su servicio (p.ej. `memcached`, el host que usa rootthebox.cfg).
+
+        Args:
+            name (str): Nombre del contenedor.
+            alias (str): Alias del contenedor en la red.
+            labels (dict[str, str]): Labels del contenedor.
+            **kwargs: Argumentos de `containers.run` (imagen, puertos, volúmenes...).
+
+        Returns:
+            Container: Contenedor creado.
+        """
+        return self.__docker_client.containers.run(
+            name=name,
+            detach=True,
+            labels=labels,
+            network=self.network_name,
+            networking_config={
+                self.network_name: self.__docker_client.api.create_endpoint_config(
+                    aliases=[alias]
+                )
+            },
+            **kwargs,
+        )
+
+    def __create(self, image: Image, stack_hash: str) -> ManagerResult:
         """
-        Crea e inicia los contenedores de Root The Box usando Docker Compose.
+        Crea e inicia los contenedores de Root The Box con el SDK de Docker. La caché y
+        la aplicación web se crean en paralelo.
+
+        Args:
+            image (Image): Imagen webapp.
+            stack_hash (str): Hash de la configuración actual.
 
         Returns:
             ManagerResult: Resultado de la operación.
         """
+        __labels: dict[str, str] = {"program": "RTB", "config": stack_hash}
         try:
-            subprocess.run(
-                ["docker", "compose", "-f", self.compose_file_path, "up", "-d"],
-                cwd=self.project_root,
-                check=True,
-                capture_output=True,
-                text=True,
+            try:
+                self.__docker_client.networks.get(self.network_name)
+            except errors.NotFound:
+                self.__docker_client.networks.create(
+                    self.network_name, labels={"program": "RTB"}
+                )
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                __futures = [
+                    executor.submit(
+                        self.__run_service,
+                        self.cache_container_name,
+                        "memcached",
+                        __labels,
+                        image=MEMCACHED_IMAGE,
+                        ports={"11211/tcp": self.memcached_port},
+                    ),
+                    executor.submit(
+                        self.__run_service,
+                        self.webapp_container_name,
+                        "webapp",
+                        __labels,
+                        image=image.id,
+                        ports={"8888/tcp": self.web_app_port},
+                        volumes={
+                            self.files_dir: {"bind": "/opt/rtb/files", "mode": "rw"},
+                            os.path.join(self.rtb_dir, "missions"): {
+                                "bind": "/opt/rtb/missions",
+                                "mode": "rw",
+                            },
+                        },
+                        environment=["COMPOSE_CONVERT_WINDOWS_PATHS=1"],
+                    ),
+                ]
+                __errors: list[str] = []
+                for future in __futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        __errors.append(str(e))
+            if __errors:
+                # No se deja la mitad del stack en marcha
+                self.stop()
+                return ManagerResult.failure(
+                    message="Error creating Root The Box containers",
+                    error="; ".join(__errors),
+                )
+            return ManagerResult.ok(message="Root The Box containers created")
+        except errors.APIError as e:
+            return ManagerResult.failure(
+                message="Error creating Root The Box containers", error=str(e)
             )
-            return ManagerResult.ok(message="Docker compose subprocess successful")
-        except subprocess.CalledProcessError as e:
-            err: str = ""
-            if e.stdout:
-                err += str(e.stdout)
-            if e.stderr:
-                err += ". " + str(e.stderr)
-            if not err and e:
-                err = str(e)
+
+    @property
+    def files_dir(self) -> str:
+        """
+        Directorio RootTheBox/files/, montado en /opt/rtb/files/ dentro del contenedor webapp.
+        """
+        return os.path.join(self.rtb_dir, "files")
+
+    @staticmethod
+    def missions_key(xml: bytes) -> str:
+        """
+        Calcula la clave de la copia de la base de datos para un archivo de misiones.
+
+        Args:
+            xml (bytes): Contenido de missions.xml.
+
+        Returns:
+            str: sha256 del archivo.
+        """
+        return hashlib.sha256(xml).hexdigest()
+
+    def __snapshot_path(self, key: str) -> str:
+        """
+        Ruta de la copia de la base de datos para una clave.
+        """
+        return os.path.join(self.snapshots_dir, f"{key}.db")
+
+    def has_db_snapshot(self, key: str) -> bool:
+        """
+        Indica si hay una copia de la base de datos sembrada con unas misiones.
+
+        Args:
+            key (str): Clave del archivo de misiones.
+
+        Returns:
+            bool: True si existe la copia.
+        """
+        return os.path.isfile(self.__snapshot_path(key))
+
+    def __restore_db_snapshot(self, key: str) -> ManagerResult:
+        """
+        Coloca la copia de la base de datos en RootTheBox/files/ con los contenedores
+        detenidos. Borra botnet.db y crea rootthebox.cfg si no existe, como el reseteo.
+
+        Args:
+            key (str): Clave del archivo de misiones.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        try:
+            os.makedirs(self.files_dir, exist_ok=True)
+            dest_path = os.path.join(self.files_dir, "rootthebox.db")
+            tmp_path = f"{dest_path}.tmp"
+            shutil.copyfile(self.__snapshot_path(key), tmp_path)
+            os.replace(tmp_path, dest_path)
+            botnet_path = os.path.join(self.files_dir, "botnet.db")
+            if os.path.isfile(botnet_path):
+                os.remove(botnet_path)
+        except OSError as e:
             return ManagerResult.failure(
-                message="Error found during subprocess execution",
-                error=err,
+                message="RTB DB snapshot couldn't be restored", error=str(e)
             )
+        return self.create_rtb_cfg()
 
-    def start(self) -> ManagerResult:
+    def save_db_snapshot(self, key: str) -> ManagerResult:
         """
-        Inicia los contenedores de Root The Box.
+        Guarda una copia de la base de datos recién sembrada con unas misiones y elimina
+        las copias más antiguas si se supera `DB_SNAPSHOT_MAX_ENTRIES`.
+
+        Args:
+            key (str): Clave del archivo de misiones.
 
         Returns:
             ManagerResult: Resultado de la operación.
         """
+        db_path = os.path.join(self.files_dir, "rootthebox.db")
+        try:
+            os.makedirs(self.snapshots_dir, exist_ok=True)
+            tmp_path = f"{self.__snapshot_path(key)}.tmp"
+            shutil.copyfile(db_path, tmp_path)
+            os.replace(tmp_path, self.__snapshot_path(key))
+            snapshots = sorted(
+                (
+                    os.path.join(self.snapshots_dir, f)
+                    for f in os.listdir(self.snapshots_dir)
+                    if f.endswith(".db")
+                ),
+                key=os.path.getmtime,
+                reverse=True,
+            )
+            for path in snapshots[DB_SNAPSHOT_MAX_ENTRIES:]:
+                os.remove(path)
+        except OSError as e:
+            return ManagerResult.failure(
+                message="RTB DB snapshot couldn't be saved", error=str(e)
+            )
+        return ManagerResult.ok(
+            message="RTB DB snapshot saved",
+            data={"key": key, "size": os.path.getsize(self.__snapshot_path(key))},
+        )
+
+    def start(self, snapshot_key: str | None = None) -> ManagerResult:
+        """
+        Inicia los contenedores de Root The Box. Si hay una copia de la base de datos
+        sembrada para `snapshot_key`, se coloca antes de arrancar y no hace falta volver
+        a importar las misiones. Si los contenedores ya están en marcha con la misma
+        imagen, configuración y misiones, se dejan como están.
+
+        Args:
+            snapshot_key (str | None): Clave del archivo de misiones actual.
+
+        Returns:
+            ManagerResult: Resultado de la operación. `data.snapshot` indica si las
+            misiones ya están en la base de datos y `data.reused` si se han conservado
+            los contenedores en marcha.
+        """
         try:
             __result: ManagerResult
-            # Se eliminan los contenedores en caso de existir:
-            self.stop()
+            # El docker-compose solo se exporta; los contenedores se crean con el SDK
             __result = self.__generate_docker_compose(self.compose_file_path)
             if not __result.success:
                 return __result
-            if not os.path.isfile(self.compose_file_path):
-                return ManagerResult(
-                    success=False,
-                    message="Docker Compose file not found!",
-                    error="The manager could not find the docker-compose file.",
+            __image: Image = self.__webapp_image()
+            __stack_hash: str = self.__stack_hash(__image, snapshot_key)
+            if self.__stack_matches(__stack_hash):
+                return ManagerResult.ok(
+                    message="Containers are already running with the current config",
+                    data={
+                        "snapshot": snapshot_key is not None
+                        and self.has_db_snapshot(snapshot_key),
+                        "reused": True,
+                    },
                 )
 
-            __result: ManagerResult = self.__create()
+            # Se eliminan los contenedores en caso de existir:
+            self.stop()
+            __snapshot: bool = False
+            if snapshot_key is not None and self.has_db_snapshot(snapshot_key):
+                __result = self.__restore_db_snapshot(snapshot_key)
+                __snapshot = __result.success
+
+            __result = self.__create(__image, __stack_hash)
             if __result.success:
                 return ManagerResult.ok(
                     message="Containers started and now are running",
+                    data={"snapshot": __snapshot, "reused": False},
                 )
             else:
                 return ManagerResult.failure(
@@ -618,3 +918,22 @@ class RootTheBoxManager(BaseManager):
             return ManagerResult.failure(
                 message="RTB could not be cleaned up", error=str(e)
             )
+
+    def release(self) -> ManagerResult:
+        """
+        Deja los contenedores de Root The Box en marcha. Al volver a arrancar el motor,
+        `start` los conserva si su configuración no ha cambiado.
+
+        Returns:
+            ManagerResult: Resultado de la operación.
+        """
+        return ManagerResult.ok(message="RTB containers left running")
+
+    def __on_exit(self) -> None:
+        """
+        Cierre del proceso: en modo persistente los contenedores siguen en marcha.
+        """
+        if self.persistent:
+            self.release()
+        else:
+            self.cleanup()
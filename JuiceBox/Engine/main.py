@@ -7,6 +7,8 @@ from .components import JuiceBoxEngineServer
 from .components import JuiceShopManager
 from .components import RootTheBoxManager
 from .components import RedisManager
+from .components import ContainerStateTable
+from .components import ReadinessProber
 from .utils import JuiceShopConfig, RTBConfig
 from .components import Monitor
 from docker import DockerClient
@@ -21,7 +23,16 @@ def main():
 
     # Se instancian los managers
     rtb = RootTheBoxManager(RTBConfig(), docker_client=docker_client)  # Root the Box
-    js = JuiceShopManager(JuiceShopConfig(), docker_client=docker_client)  # Juice Shop
+    # Tabla de estado de los contenedores de Juice Shop (mantenida por eventos de Docker)
+    js_state = ContainerStateTable(docker_client, label="program=JS")
+    # Comprobador de las instancias de Juice Shop que ya responden por HTTP
+    js_prober = ReadinessProber()
+    js = JuiceShopManager(
+        JuiceShopConfig(),
+        docker_client=docker_client,
+        state_table=js_state,
+        prober=js_prober,
+    )  # Juice Shop
     redis = RedisManager(docker_client=docker_client)  # Redis
 
     # Se instancia el monitor
@@ -29,6 +40,7 @@ def main():
         name="juiceboxengine",
         use_journal=True,
         redis_manager=redis,
+        state_table=js_state,
     )
 
     # Se instancia el motor
@@ -1,5 +1,17 @@
-from .config import JuiceShopConfig, RTBConfig
+from .config import JuiceShopConfig, RTBConfig, COUNTRY_MAPPING_URL
 from .logger import Logger
+from .protocol import (
+    ConnectionInfo,
+    FrameError,
+    DEFAULT_MAX_FRAME,
+    PROTOCOL_VERSION,
+    encode_frame,
+    is_frame_start,
+    negotiate_max_frame,
+    read_frame,
+    recv_frame,
+    recv_line,
+)
 from .validator import (
     validate_bool,
     validate_container,
@@ -11,10 +23,21 @@ from .validator import (
 __all__ = [
     "JuiceShopConfig",
     "RTBConfig",
+    "COUNTRY_MAPPING_URL",
     "Logger",
     "validate_bool",
     "validate_container",
     "validate_port",
     "validate_str",
     "InvalidConfiguration",
+    "ConnectionInfo",
+    "FrameError",
+    "DEFAULT_MAX_FRAME",
+    "PROTOCOL_VERSION",
+    "encode_frame",
+    "is_frame_start",
+    "negotiate_max_frame",
+    "read_frame",
+    "recv_frame",
+    "recv_line",
 ]
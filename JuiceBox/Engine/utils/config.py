@@ -1,10 +1,12 @@
 import json, yaml
+from functools import partial
 from .validator import (
     validate_str,
     validate_port,
     validate_bool,
     validate_ports_range,
     validate_int,
+    InvalidConfiguration,
 )
 from Models import Status, ManagerResult
 from importlib.resources import files
@@ -18,6 +20,14 @@ RTB_SCHEMA = {
     "cache_container_name": ("MEMCACHED_CONTAINER_NAME", validate_str),
 }
 
+# Mapeo de retos a países de fbctf. Se usa siempre la copia incluida en Engine/configs
+# (montada en /configs en el contenedor del CLI de CTF); la URL solo sirve para
+# actualizarla con JS __REFRESH_COUNTRY_MAPPING__.
+COUNTRY_MAPPING_URL = (
+    "https://raw.githubusercontent.com/juice-shop/juice-shop/master/config/fbctf.yml"
+)
+COUNTRY_MAPPING_FILE = "fbctf.yml"
+
 JS_SCHEMA = {
     "containers_name": ("CONTAINERS_NAME", validate_str),
     "ports_range": ("PORTS_RANGE", validate_ports_range),
@@ -25,6 +35,25 @@ JS_SCHEMA = {
     "ctf_key": ("CTF_KEY", validate_str),
     "node_env": ("NODE_ENV", validate_str),
     "detach_mode": ("DETACH_MODE", validate_bool),
+    "pool_size": ("POOL_SIZE", validate_int),
+    "pool_refill_concurrency": (
+        "POOL_REFILL_CONCURRENCY",
+        partial(validate_int, min_value=1),
+    ),
+    "pool_max": ("POOL_MAX", validate_int),
+    "stop_timeout": ("STOP_TIMEOUT", validate_int),
+    "kill_on_stop": ("KILL_ON_STOP", validate_bool),
+    "stop_deadline": ("STOP_DEADLINE", partial(validate_int, min_value=1)),
+    "start_concurrency": ("START_CONCURRENCY", partial(validate_int, min_value=1)),
+    "keep_missions_file": ("KEEP_MISSIONS_FILE", validate_bool),
+    "idle_timeout": ("IDLE_TIMEOUT", validate_int),
+    "idle_grace": ("IDLE_GRACE", validate_int),
+    "hibernate_after": ("HIBERNATE_AFTER", validate_int),
+    "idle_sample_interval": (
+        "IDLE_SAMPLE_INTERVAL",
+        partial(validate_int, min_value=5),
+    ),
+    "idle_sample_rate": ("IDLE_SAMPLE_RATE", partial(validate_int, min_value=1)),
 }
 
 
@@ -180,9 +209,36 @@ class JuiceShopConfig:
         self.node_env: str = "ctf"
         self.lifespan: int = 180
         self.detach_mode: bool = True
+        # Pool de instancias precalentadas (0 = desactivado)
+        self.pool_size: int = 0
+        self.pool_refill_concurrency: int = 1
+        self.pool_max: int = 5
+        # Parada: segundos de gracia, parada inmediata (SIGKILL) y plazo total
+        self.stop_timeout: int = 10
+        self.kill_on_stop: bool = False
+        self.stop_deadline: int = 60
+        # Contenedores que se crean a la vez en un arranque por lotes
+        self.start_concurrency: int = 4
+        # Copia en disco de missions.xml (RootTheBox/missions/) para auditoría
+        self.keep_missions_file: bool = True
+        # Reclamación de instancias inactivas: minutos sin actividad (0 = desactivado),
+        # minutos de aviso, segundos entre muestras y consultas a Docker por segundo
+        self.idle_timeout: int = 0
+        self.idle_grace: int = 5
+        # Minutos sin actividad tras los que se pausa una instancia (0 = desactivado)
+        self.hibernate_after: int = 0
+        self.idle_sample_interval: int = 60
+        self.idle_sample_rate: int = 10
         self.loaded: bool = False
         self.error = None
 
+    @property
+    def country_mapping_path(self) -> Path:
+        """
+        Ruta de la copia local del mapeo de países de fbctf.
+        """
+        return self.configs_dir / COUNTRY_MAPPING_FILE
+
     @property
     def starting_port(self) -> int:
         """
@@ -215,6 +271,15 @@ class JuiceShopConfig:
         if json_key in config:
             setattr(self, key, validator(config[json_key], json_key))
 
+    def __validate_pool(self) -> None:
+        """
+        Comprueba que el tamaño del pool no supere su máximo.
+        """
+        if self.pool_size > self.pool_max:
+            raise InvalidConfiguration(
+                f"POOL_SIZE must be <= POOL_MAX ({self.pool_max})"
+            )
+
     def __restart_state(self) -> None:
         """
         Reinicia el estado de carga y error de JuiceShop.
@@ -249,6 +314,7 @@ class JuiceShopConfig:
             # Aplica configuración desde JSON
             for key in JS_SCHEMA:
                 self.__update_if_present(config_data, key)
+            self.__validate_pool()
 
             # Escribe JSON actualizado
             updated_data = {
@@ -259,7 +325,7 @@ class JuiceShopConfig:
             )
 
             # Genera YAML
-            yaml_result = self.__generate_yaml()
+            yaml_result = self.generate_yaml()
             if yaml_result["status"] == Status.ERROR:
                 return ManagerResult.failure(
                     f"YAML generation failed: {yaml_result['message']}"
@@ -298,6 +364,7 @@ class JuiceShopConfig:
                     setattr(self, key, validator(config[key], json_key))
                 elif json_key in existing_data:
                     setattr(self, key, existing_data[json_key])
+            self.__validate_pool()
 
             # Escribe JSON actualizado
             updated_data = {
@@ -311,9 +378,11 @@ class JuiceShopConfig:
         except Exception as e:
             return ManagerResult.failure("Error updating JS config", error=str(e))
 
-    def __generate_yaml(self, output_filename: str = "juiceShopRTBConfig.yml") -> dict:
+    def generate_yaml(self, output_filename: str = "juiceShopRTBConfig.yml") -> dict:
         """
-        Genera el archivo YAML para JuiceShop a partir de la configuración actual.
+        Genera el archivo YAML para JuiceShop a partir de la configuración actual. El
+        mapeo de países es siempre la copia incluida en Engine/configs, referenciada por
+        su ruta en el contenedor del CLI de CTF, para no depender de la red.
 
         Args:
             output_filename (str): Nombre del archivo YAML a generar. Default es "juiceShopRTBConfig.yml".
@@ -324,7 +393,7 @@ class JuiceShopConfig:
         data = {
             "ctfFramework": "RootTheBox",
             "ctfKey": self.ctf_key,
-            "countryMapping": "https://raw.githubusercontent.com/juice-shop/juice-shop/master/config/fbctf.yml",
+            "countryMapping": f"/configs/{COUNTRY_MAPPING_FILE}",
             "insertHints": "free",
             "insertHintUrls": "free",
             "insertHintSnippets": "free",
@@ -360,4 +429,17 @@ class JuiceShopConfig:
             "ctf_key": self.ctf_key,
             "node_env": self.node_env,
             "detach_mode": self.detach_mode,
+            "pool_size": self.pool_size,
+            "pool_refill_concurrency": self.pool_refill_concurrency,
+            "pool_max": self.pool_max,
+            "stop_timeout": self.stop_timeout,
+            "kill_on_stop": self.kill_on_stop,
+            "stop_deadline": self.stop_deadline,
+            "start_concurrency": self.start_concurrency,
+            "keep_missions_file": self.keep_missions_file,
+            "idle_timeout": self.idle_timeout,
+            "idle_grace": self.idle_grace,
+            "hibernate_after": self.hibernate_after,
+            "idle_sample_interval": self.idle_sample_interval,
+            "idle_sample_rate": self.idle_sample_rate,
         }
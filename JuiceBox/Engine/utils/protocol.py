@@ -0,0 +1,206 @@
+import asyncio, socket, struct
+from dataclasses import dataclass
+
+
+# Cabecera de una trama: magic (2 bytes) + versión (1 byte) + longitud del payload (4 bytes)
+FRAME_MAGIC: bytes = b"JB"
+PROTOCOL_VERSION: int = 1
+FRAME_HEADER = struct.Struct(">2sBI")
+
+# Tamaño máximo por defecto (bytes) de una trama o línea JSON
+DEFAULT_MAX_FRAME: int = 16 * 1024 * 1024
+
+# Tamaño máximo absoluto que se acepta en la negociación
+HARD_MAX_FRAME: int = 256 * 1024 * 1024
+
+
+class FrameError(Exception):
+    """
+    Excepción que se lanza cuando una trama o línea recibida no es válida
+    (magic o versión desconocidos, o tamaño superior al máximo negociado).
+    """
+
+    pass
+
+
+@dataclass
+class ConnectionInfo:
+    """
+    Estado del protocolo de una conexión con el motor.
+
+    ## Atributos
+      - **framed (bool):** True si la conexión usa tramas con cabecera de longitud,
+        False si usa el protocolo antiguo de JSON delimitado por saltos de línea.
+      - **max_frame (int):** Tamaño máximo negociado de una trama.
+    """
+
+    framed: bool = False
+    max_frame: int = DEFAULT_MAX_FRAME
+
+    def encode(self, payload: str) -> bytes:
+        """
+        Codifica un mensaje según el protocolo de la conexión.
+
+        Args:
+            payload (str): Mensaje JSON.
+
+        Returns:
+            bytes: Trama o línea lista para enviar.
+        """
+        data = payload.encode("utf-8")
+        return encode_frame(data) if self.framed else data + b"\n"
+
+
+def is_frame_start(first: bytes) -> bool:
+    """
+    Indica si el primer byte recibido en una conexión corresponde a una trama.
+    Los clientes antiguos envían JSON, que siempre empieza por `{`.
+
+    Args:
+        first (bytes): Primer byte recibido.
+
+    Returns:
+        bool: True si la conexión usa tramas.
+    """
+    return first == FRAME_MAGIC[:1]
+
+
+def negotiate_max_frame(requested: object, server_max: int) -> int:
+    """
+    Calcula el tamaño máximo de trama acordado con un cliente.
+
+    Args:
+        requested (object): Tamaño máximo propuesto por el cliente.
+        server_max (int): Tamaño máximo del servidor.
+
+    Returns:
+        int: El menor de ambos, o el del servidor si la propuesta no es válida.
+    """
+    if isinstance(requested, int) and not isinstance(requested, bool) and requested > 0:
+        return min(requested, server_max, HARD_MAX_FRAME)
+    return min(server_max, HARD_MAX_FRAME)
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """
+    Antepone la cabecera de trama a un payload.
+
+    Args:
+        payload (bytes): Contenido de la trama.
+
+    Returns:
+        bytes: Trama completa.
+    """
+    return FRAME_HEADER.pack(FRAME_MAGIC, PROTOCOL_VERSION, len(payload)) + payload
+
+
+def _parse_header(header: bytes, max_size: int) -> int:
+    """
+    Valida una cabecera de trama y devuelve la longitud del payload.
+
+    Raises:
+        FrameError: Si la cabecera no es válida o la trama supera el máximo.
+    """
+    magic, version, length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC:
+        raise FrameError(f"Invalid frame magic: {magic!r}")
+    if version != PROTOCOL_VERSION:
+        raise FrameError(f"Unsupported protocol version: {version}")
+    if length > max_size:
+        raise FrameError(f"Frame of {length} bytes exceeds the maximum of {max_size}")
+    return length
+
+
+async def read_frame(
+    reader: asyncio.StreamReader, max_size: int, prefix: bytes = b""
+) -> bytes | None:
+    """
+    Lee una trama completa de un flujo de asyncio.
+
+    Args:
+        reader (asyncio.StreamReader): Flujo de lectura.
+        max_size (int): Tamaño máximo aceptado del payload.
+        prefix (bytes): Bytes de la cabecera ya leídos (p.ej. al detectar el protocolo).
+
+    Returns:
+        bytes | None: Payload de la trama, o None si la conexión se cerró entre tramas.
+
+    Raises:
+        FrameError: Si la trama no es válida o supera el máximo.
+        asyncio.IncompleteReadError: Si la conexión se cierra a mitad de una trama.
+    """
+    try:
+        header = prefix + await reader.readexactly(FRAME_HEADER.size - len(prefix))
+    except asyncio.IncompleteReadError as e:
+        if not e.partial and not prefix:
+            return None
+        raise
+    length = _parse_header(header, max_size)
+    return await reader.readexactly(length)
+
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    """
+    Lee exactamente `size` bytes de un socket.
+
+    Raises:
+        ConnectionError: Si la conexión se cierra antes de recibirlos.
+    """
+    chunks: list[bytes] = []
+    while size > 0:
+        chunk = conn.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("Connection closed in the middle of a message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(conn: socket.socket, max_size: int, prefix: bytes = b"") -> bytes:
+    """
+    Lee una trama completa de un socket bloqueante.
+
+    Args:
+        conn (socket.socket): Socket del cliente.
+        max_size (int): Tamaño máximo aceptado del payload.
+        prefix (bytes): Bytes de la cabecera ya leídos.
+
+    Returns:
+        bytes: Payload de la trama.
+
+    Raises:
+        FrameError: Si la trama no es válida o supera el máximo.
+        ConnectionError: Si la conexión se cierra a mitad de la trama.
+    """
+    header = prefix + _recv_exactly(conn, FRAME_HEADER.size - len(prefix))
+    return _recv_exactly(conn, _parse_header(header, max_size))
+
+
+def recv_line(conn: socket.socket, max_size: int, prefix: bytes = b"") -> bytes:
+    """
+    Lee una línea JSON (protocolo antiguo) de un socket bloqueante hasta el salto de
+    línea o hasta que el cliente deje de enviar.
+
+    Args:
+        conn (socket.socket): Socket del cliente.
+        max_size (int): Tamaño máximo aceptado de la línea.
+        prefix (bytes): Bytes ya leídos.
+
+    Returns:
+        bytes: Línea recibida, sin el salto de línea.
+
+    Raises:
+        FrameError: Si la línea supera el máximo.
+    """
+    buffer = bytearray(prefix)
+    while b"\n" not in buffer:
+        if len(buffer) > max_size:
+            raise FrameError(f"Message exceeds the maximum of {max_size} bytes")
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+    line = bytes(buffer).split(b"\n", 1)[0]
+    if len(line) > max_size:
+        raise FrameError(f"Message exceeds the maximum of {max_size} bytes")
+    return line
@@ -212,11 +212,15 @@ class RedisPayload:
       - **container (str):** Nombre del contenedor.
       - **status (str):** Estado/status del contenedor.
       - **timestamp (str):** Timestamp.
+      - **event (str, None):** Tipo de evento (p.ej. "job"). Opcional.
+      - **data (dict[str, Any], None):** Datos extra del evento. Opcional.
     """
 
     container: str | None
     status: str
     timestamp: str
+    event: str | None = None
+    data: dict[str, Any] | None = None
 
     @classmethod
     def from_container(cls, container: Container) -> RedisPayload:
@@ -241,7 +245,8 @@ class RedisPayload:
         Construye un RedisPayload a partir de un dict.
 
         Args:
-          container (dict): Diccionario con datos del contenedor de Docker [container, status].
+          container (dict): Diccionario con datos del contenedor de Docker [container, status]
+                            y, opcionalmente, [event, data].
 
         Returns:
           RedisPayload: Payload formateado para Redis.
@@ -250,16 +255,24 @@ class RedisPayload:
             container=container["container"],
             status=container["status"],
             timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+            event=container.get("event"),
+            data=container.get("data"),
         )
 
     def to_dict(self) -> dict[str, Any]:
         """
         Convierte la RedisPayload a un diccionario.
+        Los campos opcionales solo se incluyen si tienen valor.
 
         Returns:
-            dict[str, Any]: Estructura con las claves "status", "message" y "data".
+            dict[str, Any]: Estructura con las claves "container", "status", "timestamp"
+            y, si existen, "event" y "data".
         """
-        return asdict(self)
+        payload = asdict(self)
+        for key in ("event", "data"):
+            if payload[key] is None:
+                payload.pop(key)
+        return payload
 
     def to_json(self) -> str:
         """
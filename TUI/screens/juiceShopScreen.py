@@ -9,6 +9,7 @@ from textual.containers import Vertical, Horizontal, ScrollableContainer, Vertic
 from textual.widgets import Label, Static, OptionList
 from textual.binding import Binding
 from ..widgets import ReactiveMarkdown
+from ..widgets import progress_notifier
 from JuiceBox.Models import Status, Response
 from JuiceBox.Engine.api import JuiceBoxAPI, REDIS_PASSWORD
 from ..widgets.confirmModal import ConfirmModal
@@ -391,7 +392,8 @@ class JuiceShopScreen(Screen):
 
                 # Se llama al motor para arrancar n contenedores de la JS:
                 responses: list[Response] = await JuiceBoxAPI.start_n_js_containers(
-                    dismissed_options["number"]
+                    dismissed_options["number"],
+                    on_progress=progress_notifier(self, PATIENCE_VIRTUE),
                 )
 
                 for resp in responses:
@@ -502,9 +504,10 @@ class JuiceShopScreen(Screen):
 
         if result == "yes":
             try:
+                __is_job: bool = option == GENERATE_MISSIONS.upper()
                 __tmp_str, __tmp_timeout = (
-                    ("while the RTB missions file loads", 60)
-                    if option == GENERATE_MISSIONS
+                    ("while the RTB missions file loads", 10)
+                    if __is_job
                     else (f"for the {option} operation to finish", 5)
                 )
                 self.notify(
@@ -514,7 +517,11 @@ class JuiceShopScreen(Screen):
                     timeout=__tmp_timeout,
                 )
 
-                if asyncio.iscoroutinefunction(action):
+                if __is_job:
+                    resp = await action(
+                        on_progress=progress_notifier(self, PATIENCE_VIRTUE)
+                    )
+                elif asyncio.iscoroutinefunction(action):
                     resp = await action()
                 else:
                     resp = await asyncio.to_thread(action)
@@ -9,6 +9,7 @@ from textual.containers import Vertical, Horizontal, ScrollableContainer, Vertic
 from textual.widgets import Label, Static, OptionList
 from textual.binding import Binding
 from ..widgets import ReactiveMarkdown
+from ..widgets import progress_notifier
 from JuiceBox.Models import Status, Response
 from JuiceBox.Engine.api import JuiceBoxAPI, REDIS_PASSWORD
 from ..widgets.confirmModal import ConfirmModal
@@ -25,6 +26,8 @@ AVAILABLE: str = "[green]Active and running ✔[/green]"
 GENERATE_MISSIONS: str = "Generate missions"
 OP_STATUS: str = "Operation Status:"
 PATIENCE_VIRTUE: str = "Patience is a virtue:"
+# Opciones que el motor ejecuta como trabajos con progreso
+JOB_OPTIONS: tuple[str, ...] = ("START", "RESTART MANAGER")
 
 
 class RootTheBoxScreen(Screen):
@@ -313,7 +316,11 @@ class RootTheBoxScreen(Screen):
                     timeout=__tmp_timeout,
                 )
 
-                if asyncio.iscoroutinefunction(action):
+                if option in JOB_OPTIONS:
+                    resp = await action(
+                        on_progress=progress_notifier(self, PATIENCE_VIRTUE)
+                    )
+                elif asyncio.iscoroutinefunction(action):
                     resp = await action()
                 else:
                     resp = await asyncio.to_thread(action)
@@ -1,6 +1,7 @@
 from .customSwitch import CustomSwitch
 from .footer import get_footer
 from .header import get_header
+from .progressNotifier import progress_notifier
 from .reactiveLabel import ReactiveLabel
 from .reactiveMarkdown import ReactiveMarkdown
 
@@ -9,6 +10,7 @@ __all__ = [
     "CustomSwitch",
     "get_footer",
     "get_header",
+    "progress_notifier",
     "ReactiveLabel",
     "ReactiveMarkdown",
 ]
@@ -0,0 +1,27 @@
+from collections.abc import Callable
+from textual.screen import Screen
+
+
+def progress_notifier(screen: Screen, title: str) -> Callable[[dict], None]:
+    """
+    Crea la función que muestra el progreso de un trabajo de larga duración del motor
+    como notificación de una pantalla.
+
+    Args:
+        screen (Screen): Pantalla que muestra las notificaciones.
+        title (str): Título de las notificaciones.
+
+    Returns:
+        Callable[[dict], None]: Función que recibe el estado del trabajo devuelto por
+        el motor.
+    """
+
+    def notify_progress(job: dict) -> None:
+        screen.notify(
+            f"[b]{job.get('progress', 0)}%[/b] - {job.get('stage', '')}",
+            title=title,
+            severity="information",
+            timeout=3,
+        )
+
+    return notify_progress
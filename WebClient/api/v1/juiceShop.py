@@ -1,13 +1,20 @@
 from fastapi import APIRouter
-from WebClient.models.juiceShop import Response
+from WebClient.models.juiceShop import BatchRequest, Response
 from JuiceBox.Engine.api import JuiceBoxAPI
+from Models import Status
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Response)
-async def create():
-    resp = await JuiceBoxAPI.start_js_container()
+async def create(wait_ready: bool = False):
+    resp = await JuiceBoxAPI.start_js_container(wait_ready=wait_ready)
+    return Response(message=resp.message, status=resp.status, data=resp.data)
+
+
+@router.post("/batch", response_model=Response)
+async def create_batch(request: BatchRequest):
+    resp = await JuiceBoxAPI.start_js_batch(request.n, stream=request.stream)
     return Response(message=resp.message, status=resp.status, data=resp.data)
 
 
@@ -15,3 +22,24 @@ async def create():
 async def list_js_containers():
     resp = await JuiceBoxAPI.get_js_status()
     return Response(message=resp.message, status=resp.status, data=resp.data)
+
+
+@router.get("/{port}", response_model=Response)
+async def get_js_container(port: int):
+    # Consultar una instancia hibernada la reanuda (__RESUME__ reserva el puerto)
+    resumed = await JuiceBoxAPI.resume_js_container(port)
+    if resumed.status != Status.OK:
+        return Response(
+            message=resumed.message, status=resumed.status, data=resumed.data
+        )
+    resp = await JuiceBoxAPI.get_js_container_status_by_port(port)
+    data = dict(resp.data)
+    if resumed.data.get("resumed"):
+        data.update(resumed=True, resume_ms=resumed.data["resume_ms"])
+    return Response(message=resp.message, status=resp.status, data=data)
+
+
+@router.post("/{port}/resume", response_model=Response)
+async def resume_js_container(port: int):
+    resp = await JuiceBoxAPI.resume_js_container(port)
+    return Response(message=resp.message, status=resp.status, data=resp.data)
@@ -1,5 +1,5 @@
 from typing import Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Response(BaseModel):
@@ -14,3 +14,8 @@ class Response(BaseModel):
     @classmethod
     def error(cls, message="Something went wrong", data=None):
         return cls(status="ERROR", message=message, data=data or {})
+
+
+class BatchRequest(BaseModel):
+    n: int = Field(gt=0)
+    stream: bool = False